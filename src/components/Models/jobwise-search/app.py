@@ -1,12 +1,21 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import re
-import requests
-from bs4 import BeautifulSoup
-import json
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from catalog_store import CATALOG_PATH, INDEX_DIR, build_engine, fit_index, load_engine, load_index, load_resource_frame
+from filters import ALL_DURATIONS, ResourceFilters
+from live_index import CHANGE_LOG_PATH, LiveIndex, start_following
+from semantic import SEMANTIC_DIR, load_semantic_engine
+from recommender import Recommender
+from result_cache import ResultCache
+from service_client import SERVICE_URL, ServiceClient
+from shared_index import SHARED_INDEX, SharedIndex, shared_index_version
+from sharded_index import SHARDS, ShardedEngine
+from skill_graph import SKILL_GRAPH_PATH, SkillGraph, load_skill_graph
+
+# Optional: text area that reports edits while typing (custom components, Streamlit >= 1.51)
+try:
+    import streamlit.components.v2
+    LIVE_INPUT_AVAILABLE = True
+except ImportError:
+    LIVE_INPUT_AVAILABLE = False
 
 # Set page configuration
 st.set_page_config(
@@ -85,344 +94,257 @@ st.markdown("""
 st.markdown("<h1 class='main-header'>Job Skill Resource Finder</h1>", unsafe_allow_html=True)
 st.markdown("Find free open-source learning resources tailored to your job requirements")
 
-# Create a database of free educational resources
-@st.cache_data
+# Load the database of free educational resources
+@st.cache_resource
 def load_resources():
-    resources = [
-        {
-            "title": "JavaScript Algorithms and Data Structures",
-            "description": "Learn JavaScript fundamentals, ES6, regular expressions, debugging, data structures, OOP, functional programming, and algorithmic thinking",
-            "skills": "javascript, data structures, algorithms, programming, es6, functional programming, oop",
-            "duration": "300 hours",
-            "source": "freeCodeCamp",
-            "url": "https://www.freecodecamp.org/learn/javascript-algorithms-and-data-structures/"
-        },
-        {
-            "title": "Responsive Web Design Certification",
-            "description": "Learn HTML, CSS, visual design, accessibility, and responsive web design principles",
-            "skills": "html, css, responsive design, web development, frontend, accessibility",
-            "duration": "300 hours",
-            "source": "freeCodeCamp",
-            "url": "https://www.freecodecamp.org/learn/responsive-web-design/"
-        },
-        {
-            "title": "Scientific Computing with Python",
-            "description": "Python fundamentals, Python for data science, and completing scientific computing projects",
-            "skills": "python, data science, scientific computing, programming",
-            "duration": "300 hours",
-            "source": "freeCodeCamp",
-            "url": "https://www.freecodecamp.org/learn/scientific-computing-with-python/"
-        },
-        {
-            "title": "Data Analysis with Python",
-            "description": "Learn data analysis techniques using NumPy, Pandas, Matplotlib, and Seaborn",
-            "skills": "python, data analysis, pandas, numpy, matplotlib, visualization",
-            "duration": "300 hours",
-            "source": "freeCodeCamp",
-            "url": "https://www.freecodecamp.org/learn/data-analysis-with-python/"
-        },
-        {
-            "title": "Information Security",
-            "description": "Learn information security with HelmetJS, Python for penetration testing, and security concepts",
-            "skills": "security, information security, python, penetration testing, cybersecurity",
-            "duration": "300 hours",
-            "source": "freeCodeCamp",
-            "url": "https://www.freecodecamp.org/learn/information-security/"
-        },
-        {
-            "title": "Machine Learning with Python",
-            "description": "Learn TensorFlow and various machine learning algorithms and techniques",
-            "skills": "machine learning, python, tensorflow, deep learning, neural networks, ai",
-            "duration": "300 hours",
-            "source": "freeCodeCamp",
-            "url": "https://www.freecodecamp.org/learn/machine-learning-with-python/"
-        },
-        {
-            "title": "Learn Python - Full Course for Beginners",
-            "description": "A complete Python tutorial covering all the basics for beginners",
-            "skills": "python, programming, beginners, fundamentals",
-            "duration": "4 hours",
-            "source": "freeCodeCamp YouTube",
-            "url": "https://www.youtube.com/watch?v=rfscVS0vtbw"
-        },
-        {
-            "title": "Learn SQL - Full Database Course for Beginners",
-            "description": "A comprehensive introduction to SQL and database concepts",
-            "skills": "sql, database, data engineering, postgresql, mysql",
-            "duration": "4 hours",
-            "source": "freeCodeCamp YouTube",
-            "url": "https://www.youtube.com/watch?v=HXV3zeQKqGY"
-        },
-        {
-            "title": "React Tutorial for Beginners",
-            "description": "Learn the React JavaScript library from the ground up",
-            "skills": "react, javascript, frontend, web development",
-            "duration": "10 hours",
-            "source": "freeCodeCamp YouTube",
-            "url": "https://www.youtube.com/watch?v=bMknfKXIFA8"
-        },
-        {
-            "title": "Git and GitHub for Beginners - Crash Course",
-            "description": "Learn the basics of Git version control and GitHub",
-            "skills": "git, github, version control, collaboration",
-            "duration": "1 hour",
-            "source": "freeCodeCamp YouTube",
-            "url": "https://www.youtube.com/watch?v=RGOj5yH7evk"
-        },
-        {
-            "title": "Docker Tutorial for Beginners",
-            "description": "Full Docker course teaching containerization from scratch",
-            "skills": "docker, devops, containerization, deployment",
-            "duration": "3 hours",
-            "source": "freeCodeCamp YouTube",
-            "url": "https://www.youtube.com/watch?v=fqMOX6JJhGo"
-        },
-        {
-            "title": "The Rust Programming Language Tutorial",
-            "description": "Learn systems programming with Rust",
-            "skills": "rust, systems programming, low-level, performance",
-            "duration": "3 hours",
-            "source": "freeCodeCamp YouTube",
-            "url": "https://www.youtube.com/watch?v=MsocPEZBd-M"
-        },
-        {
-            "title": "Object Oriented Programming in Python",
-            "description": "Master OOP concepts using Python",
-            "skills": "python, oop, object oriented programming, classes, inheritance",
-            "duration": "1.5 hours",
-            "source": "Programiz",
-            "url": "https://www.programiz.com/python-programming/object-oriented-programming"
-        },
-        {
-            "title": "Learn Node.js",
-            "description": "Comprehensive guide to server-side JavaScript with Node.js",
-            "skills": "nodejs, javascript, backend, server, express, api",
-            "duration": "Various",
-            "source": "MDN Web Docs",
-            "url": "https://developer.mozilla.org/en-US/docs/Learn/Server-side/Node_server_without_framework"
-        },
-        {
-            "title": "React Hooks Tutorial",
-            "description": "Modern React development using functional components and hooks",
-            "skills": "react, javascript, hooks, frontend, web development",
-            "duration": "Various",
-            "source": "React Docs",
-            "url": "https://reactjs.org/docs/hooks-intro.html"
-        },
-        {
-            "title": "Data Visualization with D3.js",
-            "description": "Learn to create interactive data visualizations for the web",
-            "skills": "d3js, data visualization, javascript, svg, web development",
-            "duration": "Various",
-            "source": "Observable",
-            "url": "https://observablehq.com/@d3/learn-d3"
-        },
-        {
-            "title": "Learn AWS Serverless",
-            "description": "Build serverless applications on AWS",
-            "skills": "aws, serverless, lambda, cloud computing, backend",
-            "duration": "Various",
-            "source": "AWS Workshops",
-            "url": "https://aws.amazon.com/getting-started/hands-on/build-serverless-web-app-lambda-apigateway-s3-dynamodb-cognito/"
-        },
-        {
-            "title": "Django Web Framework",
-            "description": "Build web applications quickly with Django",
-            "skills": "python, django, web development, backend, mvc, databases",
-            "duration": "Various",
-            "source": "Django Project",
-            "url": "https://docs.djangoproject.com/en/stable/intro/tutorial01/"
-        },
-        {
-            "title": "Flutter Mobile App Development",
-            "description": "Build cross-platform mobile apps with Flutter",
-            "skills": "flutter, dart, mobile development, ui design, cross-platform",
-            "duration": "Various",
-            "source": "Flutter Dev",
-            "url": "https://flutter.dev/docs/get-started/codelab"
-        },
-        {
-            "title": "CSS Grid and Flexbox",
-            "description": "Master modern CSS layout techniques",
-            "skills": "css, web development, frontend, responsive design, layout",
-            "duration": "Various",
-            "source": "CSS-Tricks",
-            "url": "https://css-tricks.com/snippets/css/complete-guide-grid/"
-        },
-        {
-            "title": "Kubernetes for Beginners",
-            "description": "Learn container orchestration with Kubernetes",
-            "skills": "kubernetes, docker, devops, orchestration, cloud computing",
-            "duration": "4 hours",
-            "source": "freeCodeCamp YouTube",
-            "url": "https://www.youtube.com/watch?v=d6WC5n9G_sM"
-        },
-        {
-            "title": "MongoDB Tutorial for Beginners",
-            "description": "Learn NoSQL database concepts with MongoDB",
-            "skills": "mongodb, nosql, database, json, backend",
-            "duration": "2 hours",
-            "source": "Programming with Mosh",
-            "url": "https://www.youtube.com/watch?v=pWbMrx5rVBE"
-        },
-        {
-            "title": "Linux Command Line Basics",
-            "description": "Master the Linux terminal and command line interface",
-            "skills": "linux, command line, bash, shell scripting, system administration",
-            "duration": "3 hours",
-            "source": "freeCodeCamp YouTube",
-            "url": "https://www.youtube.com/watch?v=ZtqBQ68cfJc"
-        },
-        {
-            "title": "Vue.js Complete Guide",
-            "description": "Learn Vue.js framework for building user interfaces",
-            "skills": "vuejs, javascript, frontend, web development, spa",
-            "duration": "8 hours",
-            "source": "Vue Mastery",
-            "url": "https://www.vuemastery.com/courses/intro-to-vue-3/intro-to-vue3"
-        },
-        {
-            "title": "Angular Tutorial for Beginners",
-            "description": "Complete guide to Angular framework",
-            "skills": "angular, typescript, javascript, frontend, web development",
-            "duration": "6 hours",
-            "source": "Programming with Mosh",
-            "url": "https://www.youtube.com/watch?v=k5E2AVpwsko"
-        }
-    ]
-    
-    return pd.DataFrame(resources)
+    # Prefer the on-disk columnar catalog, memory-mapped and shared read-only
+    return load_resource_frame(CATALOG_PATH)
 
 # Initialize TF-IDF vectorizer and compute similarity matrix
 @st.cache_resource
 def setup_similarity_search(_df):
-    # Create TF-IDF vectorizer
-    tfidf = TfidfVectorizer(
-        stop_words='english',
-        ngram_range=(1, 2),  # Include bigrams for better matching
-        max_features=5000    # Limit features for performance
-    )
-    
-    # Create corpus by combining skills and descriptions
-    corpus = _df['skills'] + " " + _df['description']
+    # Load the persisted vectorizer and matrix instead of refitting when available
+    index = load_index(INDEX_DIR, CATALOG_PATH)
+    if index is not None:
+        return index
     
-    # Fit and transform corpus to TF-IDF matrix
-    tfidf_matrix = tfidf.fit_transform(corpus)
-    
-    return tfidf, tfidf_matrix
+    # Fit and transform corpus of skills and descriptions to TF-IDF matrix
+    return fit_index(_df)
 
-# Function to extract skills from job description
-def extract_skills(job_description):
-    common_skills = [
-        "python", "javascript", "java", "c++", "ruby", "php", "html", "css",
-        "react", "angular", "vue", "node", "express", "django", "flask",
-        "aws", "azure", "gcp", "docker", "kubernetes", "terraform",
-        "sql", "mysql", "postgresql", "mongodb", "nosql", "database",
-        "machine learning", "ai", "data science", "nlp", "computer vision",
-        "git", "devops", "ci/cd", "jenkins", "github actions", "gitlab",
-        "agile", "scrum", "kanban", "project management", "jira",
-        "rest api", "graphql", "microservices", "serverless",
-        "linux", "unix", "bash", "shell scripting",
-        "frontend", "backend", "fullstack", "web development",
-        "mobile development", "ios", "android", "flutter", "react native",
-        "testing", "qa", "selenium", "cypress", "junit", "pytest",
-        "security", "cybersecurity", "penetration testing",
-        "data analysis", "data visualization", "tableau", "power bi",
-        "blockchain", "ethereum", "smart contracts",
-        "ux", "ui", "design", "figma", "adobe xd", "sketch",
-        "typescript", "golang", "kotlin", "swift", "dart", "rust",
-        "pandas", "numpy", "matplotlib", "seaborn", "scikit-learn",
-        "tensorflow", "pytorch", "keras", "opencv"
-    ]
-    
-    job_description = job_description.lower()
-    found_skills = []
-    
-    for skill in common_skills:
-        if re.search(r'\b' + re.escape(skill) + r'\b', job_description):
-            found_skills.append(skill)
+# Build the inverted index used to rank resources
+@st.cache_resource
+def setup_retrieval_engine(_df, _tfidf, _tfidf_matrix):
+    # TF-IDF cosine or BM25F, as chosen by JOBWISE_RANKING
+    engine = load_engine(INDEX_DIR, CATALOG_PATH) or build_engine(_df, _tfidf, _tfidf_matrix)
     
-    return found_skills
+    # Split large catalogs across worker processes when configured, keeping the ranking and storage
+    if SHARDS > 1:
+        return ShardedEngine(engine, SHARDS)
+    return engine
 
-# Function to search for relevant resources using cosine similarity
-def search_resources(job_description, tfidf, tfidf_matrix, df, k=10):
-    # Extract key skills
-    extracted_skills = extract_skills(job_description)
-    skills_text = " ".join(extracted_skills)
-    
-    # Combine skills with job description for better matching
-    search_text = job_description.lower() + " " + skills_text
-    
-    # Transform search text using the same TF-IDF vectorizer
-    search_vector = tfidf.transform([search_text])
-    
-    # Calculate cosine similarity between search vector and all resources
-    similarities = cosine_similarity(search_vector, tfidf_matrix).flatten()
-    
-    # Get indices of top k most similar resources
-    top_indices = similarities.argsort()[-k:][::-1]
-    
-    # Filter out results with very low similarity (threshold = 0.1)
-    filtered_indices = [idx for idx in top_indices if similarities[idx] > 0.1]
-    
-    if not filtered_indices:
-        # If no resources meet the threshold, return top 3 anyway
-        filtered_indices = top_indices[:3]
-    
-    # Get the matching resources
-    results = df.iloc[filtered_indices].copy()
-    results['score'] = [similarities[idx] * 100 for idx in filtered_indices]
-    
-    return results, extracted_skills
+# Keep a live index in sync with the catalog change log, when one is configured
+@st.cache_resource
+def setup_live_index(_df):
+    live_index = LiveIndex.from_frame(_df)
+    start_following(live_index, CHANGE_LOG_PATH)
+    return live_index
 
-# Function to get personalized learning path
-def get_learning_path(extracted_skills, df):
-    """Generate a suggested learning path based on extracted skills"""
-    
-    # Define skill progression paths
-    skill_paths = {
-        'beginner_python': ['python', 'programming', 'fundamentals'],
-        'data_science': ['python', 'data analysis', 'machine learning', 'data visualization'],
-        'web_dev_frontend': ['html', 'css', 'javascript', 'react'],
-        'web_dev_backend': ['node', 'python', 'django', 'database', 'api'],
-        'devops': ['linux', 'docker', 'kubernetes', 'aws', 'ci/cd'],
-        'mobile_dev': ['java', 'kotlin', 'swift', 'flutter', 'react native']
-    }
+# Load the dense-embedding index, if one has been built for this catalog
+@st.cache_resource
+def setup_semantic_engine():
+    return load_semantic_engine(SEMANTIC_DIR, CATALOG_PATH)
+
+# Precompute the source and duration filter masks
+@st.cache_resource
+def setup_filters(_df):
+    return ResourceFilters(_df)
+
+# One result cache shared by every session of this server process
+@st.cache_resource
+def setup_result_cache():
+    return ResultCache()
+
+# Load the precomputed skill graph, building it from the catalog if none is stored
+@st.cache_resource
+def setup_skill_graph(_df):
+    skill_graph = load_skill_graph(SKILL_GRAPH_PATH, CATALOG_PATH)
+    if skill_graph is not None:
+        return skill_graph
     
-    # Determine which path(s) match the extracted skills
-    matching_paths = []
-    for path_name, path_skills in skill_paths.items():
-        overlap = set(extracted_skills) & set(path_skills)
-        if overlap:
-            matching_paths.append((path_name, len(overlap), path_skills))
+    return SkillGraph.build(_df)
+
+# Connect to the recommender service when one is configured
+@st.cache_resource
+def setup_service_client():
+    return ServiceClient(SERVICE_URL)
+
+# Attach to the catalog and term index published in shared memory; a new version replaces the one cached here
+@st.cache_resource(max_entries=1)
+def setup_shared_recommender(version):
+    shared = SharedIndex.attach(SHARED_INDEX)
+    if shared is None:
+        return None
+    return Recommender.from_shared_index(shared, cache=setup_result_cache())
+
+# Recommender used by the page: a thin client of service.py, the shared-memory index, or loaded in-process
+def setup_recommender():
+    if SERVICE_URL:
+        return setup_service_client()
     
-    # Sort by overlap size
-    matching_paths.sort(key=lambda x: x[1], reverse=True)
+    # Every server process on the host maps the same published copy
+    if SHARED_INDEX:
+        recommender = setup_shared_recommender(shared_index_version(SHARED_INDEX))
+        if recommender is not None:
+            return recommender
     
-    return matching_paths[:2] if matching_paths else []
-
-# Main app
-def main():
     # Load resources
     df = load_resources()
     
     # Setup TF-IDF and similarity search
     tfidf, tfidf_matrix = setup_similarity_search(df)
-    
-    # Sidebar for input
-    st.sidebar.markdown("## Input Job Details")
-    
-    # Job description input
-    job_description = st.sidebar.text_area(
-        "Paste Job Description or Skills Required",
-        """
+    return Recommender(
+        df, tfidf, tfidf_matrix,
+        engine=setup_retrieval_engine(df, tfidf, tfidf_matrix),
+        filters=setup_filters(df),
+        live_index=setup_live_index(df) if CHANGE_LOG_PATH else None,
+        semantic=setup_semantic_engine(),
+        cache=setup_result_cache(),
+        skill_graph=setup_skill_graph(df)
+    )
+
+# Description shown when the page opens
+DEFAULT_JOB_DESCRIPTION = """
 We are looking for a skilled Python Developer to join our data science team. 
 The ideal candidate should have expertise in Python programming, data analysis, and machine learning. 
 Experience with pandas, numpy, scikit-learn, and TensorFlow is required.
 Knowledge of SQL and database concepts is a must.
-        """,
-        height=300
+        """
+
+# Quiet time after the last keystroke before a live search runs
+LIVE_DEBOUNCE_MS = 250
+
+# Job description input for live search: sends the text once typing pauses
+if LIVE_INPUT_AVAILABLE:
+    live_text_area = st.components.v2.component(
+        "live_job_description",
+        html="""
+<label for="live-description">Paste Job Description or Skills Required</label>
+<textarea id="live-description" rows="14"></textarea>
+""",
+        css="""
+label { display: block; font-size: 0.875rem; margin-bottom: 0.5rem; }
+textarea { width: 100%; box-sizing: border-box; background-color: #232129; color: #D6CFE1; border: 1px solid #D6CFE1; border-radius: 0.5rem; padding: 0.75rem; font: inherit; resize: vertical; }
+""",
+        js="""
+export default function(component) {
+    const { data, setStateValue, parentElement } = component;
+    const textarea = parentElement.querySelector("textarea");
+    // Reruns mount the component again; keep what the user has typed since
+    if (textarea.dataset.mounted !== "true") {
+        textarea.value = data.value;
+        textarea.dataset.mounted = "true";
+    }
+    let timer = null;
+    textarea.oninput = () => {
+        clearTimeout(timer);
+        timer = setTimeout(() => setStateValue("text", textarea.value), data.debounce_ms);
+    };
+    return () => clearTimeout(timer);
+}
+""",
     )
+
+# Results shown per page; only the visible page is turned into HTML
+RESULTS_PAGE_SIZE = 5
+
+# Card HTML for one search result, built once per resource and reused across reruns and sessions.
+# Keyed by the fields it shows, so a resource edited in the live index or a rebuilt catalog gets a new card.
+# Rank and score change with every search, so they are left as markers filled in per render.
+@st.cache_data(max_entries=10000)
+def result_card_html(resource_id, title, description, source, duration):
+    return f"""
+<div class="resource-card">
+    <div style="display: flex; justify-content: space-between; align-items: flex-start;">
+        <div style="flex-grow: 1;">
+            <div style="display: flex; align-items: center; margin-bottom: 10px;">
+                <span style="background-color: @RANK_COLOR@; color: white; border-radius: 50%; width: 25px; height: 25px; display: inline-flex; align-items: center; justify-content: center; font-weight: bold; margin-right: 10px; font-size: 0.9rem;">
+                    @RANK@
+                </span>
+                <div class="resource-title">{title}</div>
+            </div>
+            <div class="resource-desc">{description}</div>
+            <div class="resource-meta" style="margin-top: 10px;">
+                <span><b>Source:</b> {source}</span> | 
+                <span><b>Duration:</b> {duration}</span> | 
+                <span><b>Match Score:</b> @SCORE@%</span>
+            </div>
+        </div>
+    </div>
+    <div style="margin-top: 15px;">
+        <a href="{resource_id}" target="_blank" style="background-color: #D6CFE1; color: #232129; padding: 8px 16px; border-radius: 5px; text-decoration: none; display: inline-block;">
+            🚀 Start Learning
+        </a>
+    </div>
+</div>
+"""
+
+# Card HTML for one featured resource, cached by the fields it shows
+@st.cache_data(max_entries=10000)
+def featured_card_html(resource_id, title, description, source, duration):
+    return f"""
+<div class="resource-card" style="height: 200px;">
+    <div class="resource-title">{title}</div>
+    <div class="resource-desc" style="font-size: 0.9rem; margin: 10px 0; overflow: hidden; text-overflow: ellipsis;">
+        {description[:100]}...
+    </div>
+    <div class="resource-meta">
+        <span><b>Source:</b> {source}</span><br>
+        <span><b>Duration:</b> {duration}</span>
+    </div>
+    <div style="margin-top: 10px;">
+        <a href="{resource_id}" target="_blank" style="color: #D6CFE1;">
+            🔗 Explore Resource
+        </a>
+    </div>
+</div>
+"""
+
+# Function to pick the fields a card shows, which are also its cache key
+def card_fields(resource):
+    return resource['url'], resource['title'], resource['description'], resource['source'], resource['duration']
+
+# Function to render one page of results as a single HTML block
+def render_results_page(results, page):
+    start = page * RESULTS_PAGE_SIZE
+    cards = []
+    for rank, resource in enumerate(results.iloc[start:start + RESULTS_PAGE_SIZE].to_dict(orient="records"), start + 1):
+        ranking_color = "#4CAF50" if rank <= 3 else "#FF9800" if rank <= 6 else "#757575"
+        cards.append(
+            result_card_html(*card_fields(resource))
+            .replace("@RANK_COLOR@", ranking_color)
+            .replace("@RANK@", str(rank))
+            .replace("@SCORE@", f"{resource['score']:.1f}")
+        )
+    st.markdown("".join(cards), unsafe_allow_html=True)
+
+# Function to turn the selected skill tags into a filter expression
+def skill_filter(skills, match):
+    if not skills:
+        return None
+    return ("and" if match == "All" else "or",) + tuple(("skill", skill) for skill in skills)
+
+# Function to move the results view to another page
+def change_results_page(step):
+    st.session_state.results_page += step
+
+# Main app
+def main():
+    recommender = setup_recommender()
+    facets = recommender.facets()
+    
+    # Sidebar for input
+    st.sidebar.markdown("## Input Job Details")
+    
+    # Live search updates the recommendations while the description is edited
+    live_mode = False
+    if LIVE_INPUT_AVAILABLE:
+        live_mode = st.sidebar.toggle("Live Search", help="Update recommendations as you type")
+    
+    # Job description input
+    if live_mode:
+        with st.sidebar:
+            job_description = live_text_area(
+                key="live_job_description",
+                data={"value": DEFAULT_JOB_DESCRIPTION, "debounce_ms": LIVE_DEBOUNCE_MS},
+                default={"text": DEFAULT_JOB_DESCRIPTION},
+                on_text_change=lambda: None
+            ).text
+    else:
+        job_description = st.sidebar.text_area(
+            "Paste Job Description or Skills Required",
+            DEFAULT_JOB_DESCRIPTION,
+            height=300
+        )
     
     # Number of recommendations slider
     num_recommendations = st.sidebar.slider(
@@ -435,17 +357,57 @@ Knowledge of SQL and database concepts is a must.
     
     # Additional filters
     st.sidebar.markdown("## Additional Filters")
-    sources = list(df['source'].unique())
+    
+    # Live counts per facet value under the other filters, read from the bitmap index
+    counts = recommender.facet_counts(
+        st.session_state.get("filter_sources"),
+        st.session_state.get("filter_duration", ALL_DURATIONS),
+        skill_filter(st.session_state.get("filter_skills"), st.session_state.get("filter_skill_match"))
+    )
+    
+    sources = facets["sources"]
     selected_sources = st.sidebar.multiselect(
         "Filter by Source",
         sources,
-        default=sources
+        default=sources,
+        key="filter_sources",
+        format_func=lambda source: f"{source} ({counts['source'].get(source, 0)})"
     )
     
     # Duration filter
     duration_filter = st.sidebar.selectbox(
         "Preferred Duration",
-        ["All Durations", "Short (< 5 hours)", "Medium (5-50 hours)", "Long (> 50 hours)"]
+        facets["durations"],
+        key="filter_duration",
+        format_func=lambda duration: duration if duration == ALL_DURATIONS else f"{duration} ({counts['duration'].get(duration, 0)})"
+    )
+    
+    # Skill tag filter
+    selected_skills = st.sidebar.multiselect(
+        "Filter by Skill Tags",
+        facets["skills"],
+        key="filter_skills",
+        format_func=lambda skill: f"{skill} ({counts['skill'].get(skill, 0)})"
+    )
+    skill_match = st.sidebar.radio("Skill Tags to Match", ["Any", "All"], horizontal=True, key="filter_skill_match")
+    where = skill_filter(selected_skills, skill_match)
+    
+    # Search mode, when a semantic index is available
+    search_mode = "lexical"
+    if len(facets["modes"]) > 1:
+        search_mode = st.sidebar.radio(
+            "Search Mode",
+            facets["modes"],
+            format_func=lambda mode: {"lexical": "Keyword (TF-IDF)", "semantic": "Semantic", "hybrid": "Hybrid"}[mode]
+        )
+    
+    # Study time available for the learning plan (0 means no limit)
+    budget_hours = st.sidebar.number_input(
+        "Learning Time Budget (hours, 0 = no limit)",
+        min_value=0,
+        max_value=1000,
+        value=0,
+        step=5
     )
     
     # Search button
@@ -471,23 +433,28 @@ Knowledge of SQL and database concepts is a must.
     if search_clicked and job_description:
         # Search for relevant resources
         with st.spinner("Analyzing job description and finding resources..."):
-            results, extracted_skills = search_resources(
-                job_description, tfidf, tfidf_matrix, df, k=num_recommendations
+            # Sources and duration restrict ranking, so k qualifying resources come back
+            st.session_state.search_results = recommender.search(
+                job_description, k=num_recommendations, sources=selected_sources,
+                duration=duration_filter, mode=search_mode, where=where
             )
-        
-        # Filter by selected sources
-        if selected_sources:
-            results = results[results['source'].isin(selected_sources)]
-        
-        # Apply duration filter
-        if duration_filter != "All Durations":
-            if duration_filter == "Short (< 5 hours)":
-                results = results[~results['duration'].str.contains('300 hours')]
-            elif duration_filter == "Medium (5-50 hours)":
-                results = results[results['duration'].str.contains('hours') & 
-                                ~results['duration'].str.contains('300 hours')]
-            elif duration_filter == "Long (> 50 hours)":
-                results = results[results['duration'].str.contains('300 hours')]
+            st.session_state.results_page = 0
+    elif live_mode and job_description:
+        # Each debounced edit updates the session's previous query instead of searching from scratch
+        if "live_search" not in st.session_state:
+            st.session_state.live_search = recommender.live_search()
+        live_query = (job_description, num_recommendations, tuple(selected_sources), duration_filter, search_mode, where)
+        if st.session_state.get("live_query") != live_query:
+            st.session_state.search_results = st.session_state.live_search.search(
+                job_description, k=num_recommendations, sources=selected_sources,
+                duration=duration_filter, mode=search_mode, where=where
+            )
+            st.session_state.results_page = 0
+            st.session_state.live_query = live_query
+    
+    # Results stay in the session so paging reruns the page without searching again
+    if "search_results" in st.session_state:
+        results, extracted_skills = st.session_state.search_results
         
         # Create columns for layout
         col1, col2 = st.columns([2, 1])
@@ -508,51 +475,37 @@ Knowledge of SQL and database concepts is a must.
             st.markdown("### 📚 Recommended Learning Resources")
             
             if len(results) > 0:
-                for idx, (_, resource) in enumerate(results.iterrows(), 1):
-                    with st.container():
-                        # Add ranking number
-                        ranking_color = "#4CAF50" if idx <= 3 else "#FF9800" if idx <= 6 else "#757575"
-                        st.markdown(f"""
-                        <div class="resource-card">
-                            <div style="display: flex; justify-content: space-between; align-items: flex-start;">
-                                <div style="flex-grow: 1;">
-                                    <div style="display: flex; align-items: center; margin-bottom: 10px;">
-                                        <span style="background-color: {ranking_color}; color: white; border-radius: 50%; width: 25px; height: 25px; display: inline-flex; align-items: center; justify-content: center; font-weight: bold; margin-right: 10px; font-size: 0.9rem;">
-                                            {idx}
-                                        </span>
-                                        <div class="resource-title">{resource['title']}</div>
-                                    </div>
-                                    <div class="resource-desc">{resource['description']}</div>
-                                    <div class="resource-meta" style="margin-top: 10px;">
-                                        <span><b>Source:</b> {resource['source']}</span> | 
-                                        <span><b>Duration:</b> {resource['duration']}</span> | 
-                                        <span><b>Match Score:</b> {resource['score']:.1f}%</span>
-                                    </div>
-                                </div>
-                            </div>
-                            <div style="margin-top: 15px;">
-                                <a href="{resource['url']}" target="_blank" style="background-color: #D6CFE1; color: #232129; padding: 8px 16px; border-radius: 5px; text-decoration: none; display: inline-block;">
-                                    🚀 Start Learning
-                                </a>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                n_pages = -(-len(results) // RESULTS_PAGE_SIZE)
+                page = min(st.session_state.results_page, n_pages - 1)
+                render_results_page(results, page)
+                
+                # Page controls, only when the results do not fit on one page
+                if n_pages > 1:
+                    prev_col, page_col, next_col = st.columns([1, 2, 1])
+                    with prev_col:
+                        st.button("◀ Previous", on_click=change_results_page, args=(-1,), disabled=page == 0)
+                    with page_col:
+                        st.markdown(f"<div style='text-align: center;'>Page {page + 1} of {n_pages}</div>",
+                                    unsafe_allow_html=True)
+                    with next_col:
+                        st.button("Next ▶", on_click=change_results_page, args=(1,), disabled=page == n_pages - 1)
             else:
                 st.warning("No matching resources found. Try adjusting your search filters or using different keywords.")
         
         with col2:
-            # Learning path suggestions
-            st.markdown("### 🛤️ Suggested Learning Paths")
-            learning_paths = get_learning_path(extracted_skills, df)
+            # Learning plan built from the skill graph
+            st.markdown("### 🛤️ Suggested Learning Plan")
+            learning_plan = recommender.learning_path(extracted_skills, budget_hours or None)
             
-            if learning_paths:
-                for path_name, overlap_count, path_skills in learning_paths:
-                    path_display_name = path_name.replace('_', ' ').title()
-                    with st.expander(f"{path_display_name} ({overlap_count} matches)"):
-                        st.write("**Recommended skill progression:**")
-                        for skill in path_skills:
-                            emoji = "✅" if skill in extracted_skills else "⏳"
-                            st.write(f"{emoji} {skill.title()}")
+            if learning_plan.steps:
+                st.write(f"**{len(learning_plan.steps)} resources, about {learning_plan.total_hours:.0f} hours**")
+                for idx, step in enumerate(learning_plan.steps, 1):
+                    hours = f"~{step.hours:.0f}h" if step.estimated else f"{step.hours:.0f}h"
+                    with st.expander(f"{idx}. {step.title} ({hours})"):
+                        st.write(f"**Covers:** {', '.join(skill.title() for skill in step.skills)}")
+                        st.markdown(f"[{step.source}]({step.url})")
+                if learning_plan.skipped:
+                    st.caption(f"Not covered by this plan: {', '.join(learning_plan.skipped)}")
             else:
                 st.info("Enter more specific skills to get personalized learning path recommendations.")
             
@@ -639,36 +592,22 @@ Knowledge of SQL and database concepts is a must.
 
         # Display some featured resources
         st.markdown("### 🌟 Featured Free Learning Resources")
-        featured_df = df.sample(n=4).reset_index(drop=True)
+        # Drawn once per session, so reruns reuse the same cached cards
+        if "featured" not in st.session_state:
+            st.session_state.featured = recommender.featured(4).to_dict(orient="records")
         
         cols = st.columns(2)
-        for idx, (_, resource) in enumerate(featured_df.iterrows()):
+        for idx, resource in enumerate(st.session_state.featured):
             with cols[idx % 2]:
-                st.markdown(f"""
-                <div class="resource-card" style="height: 200px;">
-                    <div class="resource-title">{resource['title']}</div>
-                    <div class="resource-desc" style="font-size: 0.9rem; margin: 10px 0; overflow: hidden; text-overflow: ellipsis;">
-                        {resource['description'][:100]}...
-                    </div>
-                    <div class="resource-meta">
-                        <span><b>Source:</b> {resource['source']}</span><br>
-                        <span><b>Duration:</b> {resource['duration']}</span>
-                    </div>
-                    <div style="margin-top: 10px;">
-                        <a href="{resource['url']}" target="_blank" style="color: #D6CFE1;">
-                            🔗 Explore Resource
-                        </a>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(featured_card_html(*card_fields(resource)), unsafe_allow_html=True)
         
         # Add some statistics
         st.markdown("---")
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Total Resources", len(df))
+            st.metric("Total Resources", facets["total"])
         with col2:
-            st.metric("Resource Sources", df['source'].nunique())
+            st.metric("Resource Sources", facets["source_count"])
         with col3:
             st.metric("Skill Categories", "25+")
         with col4:
@@ -0,0 +1,78 @@
+"""Turn a feed of job descriptions into learning-resource recommendations.
+
+    python batch_recommend.py jobs.csv recommendations.jsonl --column description --k 10
+
+The feed is read in chunks and every output line is one job: its row number,
+extracted skills and ranked resources. Memory use does not grow with the feed.
+"""
+import argparse
+import json
+import time
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from catalog_store import CATALOG_PATH, INDEX_DIR, build_engine, fit_index, load_engine, load_index, load_resource_frame
+from recommender import search_resources_batch
+
+RESULT_COLUMNS = ["title", "url", "source", "duration"]
+
+
+def read_descriptions(path, column, chunk_size):
+    """Stream job descriptions from a CSV, Parquet or plain text (one per line) file"""
+    if path.endswith(".parquet"):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=[column]):
+            yield from batch.column(0).to_pylist()
+    elif path.endswith(".csv"):
+        for frame in pd.read_csv(path, usecols=[column], chunksize=chunk_size):
+            yield from frame[column].fillna("").astype(str)
+    else:
+        with open(path) as f:
+            for line in f:
+                yield line.rstrip("\n")
+
+
+def load_search_index():
+    """Load the persisted index, or fit one from the catalog when none is built"""
+    df = load_resource_frame(CATALOG_PATH)
+    index = load_index(INDEX_DIR, CATALOG_PATH)
+    if index is None:
+        tfidf, tfidf_matrix = fit_index(df)
+        return df, tfidf, tfidf_matrix, build_engine(df, tfidf, tfidf_matrix)
+
+    tfidf, tfidf_matrix = index
+    return df, tfidf, tfidf_matrix, load_engine(INDEX_DIR, CATALOG_PATH) or build_engine(df, tfidf, tfidf_matrix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch learning-resource recommendations")
+    parser.add_argument("feed", help="CSV, Parquet or text file of job descriptions")
+    parser.add_argument("output", help="JSON Lines file to write")
+    parser.add_argument("--column", default="description", help="Description column in CSV/Parquet feeds")
+    parser.add_argument("--k", type=int, default=10, help="Recommendations per job")
+    parser.add_argument("--chunk-size", type=int, default=512, help="Descriptions scored per matrix product")
+    args = parser.parse_args()
+
+    df, tfidf, tfidf_matrix, engine = load_search_index()
+    descriptions = read_descriptions(args.feed, args.column, args.chunk_size)
+
+    start = time.perf_counter()
+    count = 0
+    with open(args.output, "w") as out:
+        batches = search_resources_batch(
+            descriptions, tfidf, tfidf_matrix, df, k=args.k, engine=engine, chunk_size=args.chunk_size
+        )
+        for count, (results, extracted_skills) in enumerate(batches, 1):
+            recommendations = results[RESULT_COLUMNS + ["score"]].to_dict(orient="records")
+            out.write(json.dumps({
+                "job_index": count - 1,
+                "skills": extracted_skills,
+                "recommendations": recommendations,
+            }) + "\n")
+
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {count} jobs to {args.output} in {elapsed:.2f}s ({count / max(elapsed, 1e-9):.0f} jobs/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Memory saved and ranking drift of the compact index against the default TF-IDF index.
+
+For each catalog size the default float64 index is compared with compact
+float32 indexes at several document-frequency pruning settings. Run from the
+jobwise-search directory:
+    python benchmarks/bench_compact_index.py
+    python benchmarks/bench_compact_index.py --sizes 100000 --output compact.json
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_scalability import synthetic_catalog, synthetic_job_descriptions
+from catalog_store import build_vectorizer, fit_index
+from compact_index import compact_index
+from recommender import build_search_text, extract_skills
+from retrieval import InvertedIndexEngine
+
+# (min_df, max_df) settings compared with the default index
+PRUNING = [(1, 1.0), (2, 1.0), (2, 0.5), (5, 0.5)]
+
+
+def vocabulary_bytes(tfidf):
+    """Approximate footprint of the vectorizer's per-term Python objects"""
+    if hasattr(tfidf, "vocabulary_"):
+        vocabulary = tfidf.vocabulary_
+        total = sys.getsizeof(vocabulary) + sum(sys.getsizeof(term) + sys.getsizeof(column)
+                                                for term, column in vocabulary.items())
+        stop_words = getattr(tfidf, "stop_words_", None) or ()
+        return total + sys.getsizeof(stop_words) + sum(sys.getsizeof(term) for term in stop_words)
+    return tfidf.vocabulary.nbytes
+
+
+def index_bytes(tfidf, tfidf_matrix, engine):
+    arrays = (tfidf.idf_, tfidf_matrix.data, tfidf_matrix.indices, tfidf_matrix.indptr,
+              engine.postings_indptr, engine.postings_doc_ids, engine.postings_weights)
+    return {
+        "arrays": int(sum(array.nbytes for array in arrays)),
+        "vocabulary": int(vocabulary_bytes(tfidf)),
+    }
+
+
+def rankings(tfidf, engine, search_texts, k):
+    return [engine.top_k(tfidf.transform([text]), k) for text in search_texts]
+
+
+def drift(reference, candidate, k):
+    """Overlap of the top k with the reference and how far shared scores moved"""
+    recalls, identical, score_diffs = [], [], []
+    for (ref_ids, ref_scores), (ids, scores) in zip(reference, candidate):
+        recalls.append(len(set(ref_ids.tolist()) & set(ids.tolist())) / k)
+        identical.append(np.array_equal(ref_ids, ids))
+        shared, ref_pos, pos = np.intersect1d(ref_ids, ids, return_indices=True)
+        if len(shared):
+            score_diffs.append(np.abs(ref_scores[ref_pos] - scores[pos]).max())
+    return {
+        f"recall_at_{k}": round(float(np.mean(recalls)), 4),
+        "identical_rankings": round(float(np.mean(identical)), 4),
+        "max_score_diff": float(max(score_diffs)) if score_diffs else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact index memory and ranking drift report")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--output", help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    search_texts = [build_search_text(jd, extract_skills(jd)) for jd in synthetic_job_descriptions(args.queries)]
+    analyzer = build_vectorizer().build_analyzer()
+    report = []
+
+    print(f"{'docs':>8} {'index':>14} {'terms':>6} {'arrays MB':>10} {'vocab KB':>9} {'saved':>7} "
+          f"{'recall@k':>9} {'identical':>10} {'max |diff|':>11}")
+    for size in args.sizes:
+        df = synthetic_catalog(size)
+        tfidf, tfidf_matrix = fit_index(df)
+        engine = InvertedIndexEngine(tfidf_matrix)
+        baseline = index_bytes(tfidf, tfidf_matrix, engine)
+        reference = rankings(tfidf, engine, search_texts, args.k)
+
+        rows = [("default", tfidf, tfidf_matrix, engine)]
+        for min_df, max_df in PRUNING:
+            compact_tfidf, compact_matrix = compact_index(tfidf, tfidf_matrix, analyzer, min_df, max_df)
+            rows.append((f"compact {min_df}/{max_df:g}", compact_tfidf, compact_matrix,
+                         InvertedIndexEngine(compact_matrix)))
+
+        for name, row_tfidf, row_matrix, row_engine in rows:
+            footprint = index_bytes(row_tfidf, row_matrix, row_engine)
+            saved = 1 - sum(footprint.values()) / sum(baseline.values())
+            row_drift = drift(reference, rankings(row_tfidf, row_engine, search_texts, args.k), args.k)
+            report.append({"size": size, "index": name, "terms": row_matrix.shape[1], "bytes": footprint,
+                           "saved": round(saved, 4), **row_drift})
+            print(f"{size:>8} {name:>14} {row_matrix.shape[1]:>6} {footprint['arrays'] / 2 ** 20:>10.2f} "
+                  f"{footprint['vocabulary'] / 1024:>9.1f} {saved:>7.1%} {row_drift[f'recall_at_{args.k}']:>9.3f} "
+                  f"{row_drift['identical_rankings']:>10.3f} {row_drift['max_score_diff']:>11.2e}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
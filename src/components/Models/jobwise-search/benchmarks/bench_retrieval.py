@@ -0,0 +1,74 @@
+"""Compare the inverted-index engine with brute-force cosine similarity.
+
+Checks that both engines return the same scores and times a query on
+synthetic catalogs of growing size. Run from the jobwise-search directory:
+    python benchmarks/bench_retrieval.py
+"""
+import os
+import random
+import sys
+import time
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from retrieval import CosineEngine, InvertedIndexEngine
+from skill_matcher import COMMON_SKILLS
+
+QUERY = """
+We are looking for a skilled Python Developer to join our data science team.
+The ideal candidate should have expertise in Python programming, data analysis, and machine learning.
+Experience with pandas, numpy, scikit-learn, and TensorFlow is required.
+Knowledge of SQL and database concepts is a must.
+"""
+
+
+def synthetic_corpus(size, seed=0):
+    """Resource texts built from the skill list plus a long tail of rare words"""
+    rng = random.Random(seed)
+    rare_words = [f"topic{i}" for i in range(20000)]
+    corpus = []
+    for _ in range(size):
+        skills = rng.sample(COMMON_SKILLS, 3)
+        rare = rng.sample(rare_words, 8)
+        corpus.append(", ".join(skills) + " " + " ".join(rare))
+    return corpus
+
+
+def median_ms(func, repeat=20):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000
+
+
+def main():
+    print(f"{'docs':>9} {'cosine ms':>10} {'inverted ms':>12} {'max |diff|':>11}")
+    for size in (1000, 10000, 100000):
+        tfidf = TfidfVectorizer(stop_words='english', ngram_range=(1, 2), max_features=5000)
+        tfidf_matrix = tfidf.fit_transform(synthetic_corpus(size))
+        query_vector = tfidf.transform([QUERY.lower()])
+
+        cosine = CosineEngine(tfidf_matrix)
+        inverted = InvertedIndexEngine(tfidf_matrix)
+
+        # Scores must match the brute-force cosine output for every touched resource
+        all_doc_ids, all_scores = cosine.top_k(query_vector, size)
+        expected = np.zeros(size)
+        expected[all_doc_ids] = all_scores
+        doc_ids, scores = inverted.score(query_vector)
+        max_diff = np.abs(expected[doc_ids] - scores).max()
+        assert np.allclose(expected[doc_ids], scores, rtol=0, atol=1e-12)
+        assert not np.delete(expected, doc_ids).any()
+
+        cosine_ms = median_ms(lambda: cosine.top_k(query_vector, 10))
+        inverted_ms = median_ms(lambda: inverted.top_k(query_vector, 10))
+        print(f"{size:>9} {cosine_ms:>10.2f} {inverted_ms:>12.2f} {max_diff:>11.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""Build time, peak memory and query latency of every retrieval engine as the catalog grows.
+
+Generates synthetic catalogs and job descriptions, builds each index the way
+the app does, and times single and batch searches end to end through
+recommender.py, plus the throughput of single searches from several
+concurrent client threads. Results are written as JSON so runs on different
+commits can be compared. Run from the jobwise-search directory:
+    python benchmarks/bench_scalability.py                      # 1k, 100k and 1M resources
+    python benchmarks/bench_scalability.py --sizes 1000 100000 --engines inverted live
+    python benchmarks/bench_scalability.py --engines inverted sharded --shards 4 --clients 1 2 4 8
+    python benchmarks/bench_scalability.py --compare benchmarks/results/scalability-<commit>.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import scipy
+import sklearn
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog_store import build_bm25f_engine, build_corpus, fit_compact_index, fit_hashed, fit_index
+from filters import add_duration_hours
+from live_index import LiveIndex
+from recommender import search_live_resources, search_resources, search_resources_batch
+from retrieval import CosineEngine, InvertedIndexEngine
+from semantic import IvfIndex, LsaEncoder, SemanticEngine
+from sharded_index import ShardedEngine
+from skill_matcher import COMMON_SKILLS
+
+ENGINES = ["cosine", "inverted", "bm25f", "sharded", "semantic", "hybrid", "live", "hashed", "int8", "float16",
+           "compact"]
+
+# Engines over the fitted vocabulary with quantized postings storage
+QUANTIZED_ENGINES = ["int8", "float16"]
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+SOURCES = ["freeCodeCamp", "Coursera (Audit)", "edX (Audit)", "YouTube", "MIT OpenCourseWare", "Khan Academy",
+           "The Odin Project", "MDN Web Docs", "Kaggle Learn", "GitHub"]
+DURATIONS = ["1 hour", "2 hours", "4.5 hours", "10 hours", "30 hours", "300 hours", "Self-paced", "Various"]
+LEVELS = ["Introduction to", "Practical", "Advanced", "Hands-on", "Complete Guide to", "Fundamentals of"]
+ROLES = ["Software Engineer", "Data Scientist", "Backend Developer", "Frontend Developer", "DevOps Engineer",
+         "Machine Learning Engineer", "Data Engineer", "Mobile Developer", "Security Analyst"]
+FILLER = [
+    "You will work closely with product managers and designers.",
+    "We value clean code, code review and automated testing.",
+    "The role is remote friendly with flexible hours.",
+    "You will mentor junior engineers and help shape our architecture.",
+    "Strong communication skills and a collaborative attitude are essential.",
+    "Experience working in an agile team is a plus.",
+]
+
+
+def synthetic_catalog(size, seed=0):
+    """Resources shaped like the built-in catalog: a few skill tags and a Zipf-distributed long tail"""
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"topic{i}" for i in range(50000)])
+    skills = np.array(COMMON_SKILLS)
+    tail = np.minimum(rng.zipf(1.3, size=(size, 12)) - 1, len(vocabulary) - 1)
+    tags = rng.integers(0, len(skills), size=(size, 3))
+    levels = rng.integers(0, len(LEVELS), size)
+    sources = rng.integers(0, len(SOURCES), size)
+    durations = rng.integers(0, len(DURATIONS), size)
+
+    records = []
+    for i in range(size):
+        resource_skills = skills[tags[i]].tolist()
+        records.append({
+            "title": f"{LEVELS[levels[i]]} {resource_skills[0].title()} {i}",
+            "url": f"https://example.org/resources/{i}",
+            "description": f"Learn {resource_skills[0]} and {resource_skills[1]} with " + " ".join(vocabulary[tail[i]]),
+            "skills": ", ".join(resource_skills),
+            "source": SOURCES[sources[i]],
+            "duration": DURATIONS[durations[i]],
+        })
+    return add_duration_hours(pd.DataFrame(records))
+
+
+def synthetic_job_descriptions(count, seed=1):
+    """Job postings that name a handful of skills among ordinary boilerplate"""
+    rng = random.Random(seed)
+    descriptions = []
+    for _ in range(count):
+        required = rng.sample(COMMON_SKILLS, rng.randint(3, 7))
+        descriptions.append(
+            f"We are looking for a {rng.choice(ROLES)} to join our team. "
+            f"You should have experience with {', '.join(required[:-1])} and {required[-1]}. "
+            + " ".join(rng.sample(FILLER, 3))
+        )
+    return descriptions
+
+
+def measure_build(func, track_memory=True):
+    """(result, seconds, peak traced MB) of one build; memory is traced on a second, untimed run"""
+    gc.collect()
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+
+    peak_mb = None
+    if track_memory:
+        gc.collect()
+        tracemalloc.start()
+        func()
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return result, seconds, peak_mb
+
+
+def percentiles(timings):
+    timings = np.asarray(timings) * 1000
+    return {
+        "mean": round(float(timings.mean()), 4),
+        "p50": round(float(np.percentile(timings, 50)), 4),
+        "p90": round(float(np.percentile(timings, 90)), 4),
+        "p99": round(float(np.percentile(timings, 99)), 4),
+    }
+
+
+def time_calls(func, inputs, warmup=3):
+    for item in inputs[:warmup]:
+        func(item)
+    timings = []
+    for item in inputs:
+        start = time.perf_counter()
+        func(item)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def concurrent_throughput(func, inputs, clients):
+    """Calls per second with `clients` threads calling func concurrently"""
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(func, inputs[:clients]))
+        start = time.perf_counter()
+        list(pool.map(func, inputs))
+        return len(inputs) / (time.perf_counter() - start)
+
+
+def build_engines(df, engines, track_memory, n_components, n_shards):
+    """Build what each engine needs; returns (search functions, build measurements)"""
+    builds = {}
+    built = {}
+    tfidf, tfidf_matrix = None, None
+
+    def record(name, func):
+        built[name], seconds, peak_mb = measure_build(func, track_memory)
+        builds[name] = {"seconds": round(seconds, 4), "peak_mb": None if peak_mb is None else round(peak_mb, 2)}
+        print(f"    build {name:<10} {seconds:>9.2f}s" + ("" if peak_mb is None else f" {peak_mb:>10.1f} MB"))
+
+    if set(engines) & {"cosine", "inverted", "bm25f", "sharded", "hybrid", *QUANTIZED_ENGINES}:
+        record("tfidf", lambda: fit_index(df))
+        tfidf, tfidf_matrix = built["tfidf"]
+    if "cosine" in engines:
+        record("cosine", lambda: CosineEngine(tfidf_matrix))
+    if set(engines) & {"inverted", "hybrid"}:
+        record("inverted", lambda: InvertedIndexEngine(tfidf_matrix))
+    if "bm25f" in engines:
+        record("bm25f", lambda: build_bm25f_engine(df, tfidf))
+    if "sharded" in engines:
+        record("sharded", lambda: ShardedEngine(InvertedIndexEngine(tfidf_matrix), n_shards))
+    if set(engines) & {"semantic", "hybrid"}:
+        def build_semantic():
+            corpus = list(build_corpus(df))
+            encoder = LsaEncoder(n_components=n_components).fit(corpus)
+            embeddings = np.concatenate([encoder.encode(corpus[i:i + 4096]) for i in range(0, len(corpus), 4096)])
+            return SemanticEngine(encoder, IvfIndex.build(embeddings))
+        record("semantic", build_semantic)
+    if "live" in engines:
+        record("live", lambda: LiveIndex.from_frame(df))
+    for storage in QUANTIZED_ENGINES:
+        if storage in engines:
+            record(storage, lambda storage=storage: InvertedIndexEngine(tfidf_matrix, storage=storage))
+
+    # Hashed and compact indexes bring their own vectorizer, so each is (vectorizer, matrix, engine)
+    def with_engine(fit):
+        vectorizer, matrix = fit()
+        return vectorizer, matrix, InvertedIndexEngine(matrix)
+    if "hashed" in engines:
+        record("hashed", lambda: with_engine(lambda: fit_hashed(df)))
+    if "compact" in engines:
+        record("compact", lambda: with_engine(lambda: fit_compact_index(df)))
+
+    searches = {}
+    if "cosine" in engines:
+        searches["cosine"] = (
+            lambda jd, k: search_resources(jd, tfidf, tfidf_matrix, df, k=k, engine=built["cosine"]),
+            lambda jds, k: list(search_resources_batch(jds, tfidf, tfidf_matrix, df, k=k)),
+        )
+    if "inverted" in engines:
+        searches["inverted"] = (
+            lambda jd, k: search_resources(jd, tfidf, tfidf_matrix, df, k=k, engine=built["inverted"]),
+            lambda jds, k: list(search_resources_batch(jds, tfidf, tfidf_matrix, df, k=k, engine=built["inverted"])),
+        )
+    if "bm25f" in engines:
+        searches["bm25f"] = (
+            lambda jd, k: search_resources(jd, tfidf, tfidf_matrix, df, k=k, engine=built["bm25f"]),
+            lambda jds, k: list(search_resources_batch(jds, tfidf, tfidf_matrix, df, k=k, engine=built["bm25f"])),
+        )
+    if "sharded" in engines:
+        searches["sharded"] = (
+            lambda jd, k: search_resources(jd, tfidf, tfidf_matrix, df, k=k, engine=built["sharded"]),
+            lambda jds, k: [search_resources(jd, tfidf, tfidf_matrix, df, k=k, engine=built["sharded"]) for jd in jds],
+        )
+    for mode in ("semantic", "hybrid"):
+        if mode in engines:
+            def single(jd, k, mode=mode):
+                return search_resources(jd, tfidf, tfidf_matrix, df, k=k, engine=built.get("inverted"),
+                                        mode=mode, semantic=built["semantic"])
+            searches[mode] = (single, lambda jds, k, single=single: [single(jd, k) for jd in jds])
+    if "live" in engines:
+        single = lambda jd, k: search_live_resources(jd, built["live"], k=k)
+        searches["live"] = (single, lambda jds, k: [single(jd, k) for jd in jds])
+    for storage in QUANTIZED_ENGINES:
+        if storage in engines:
+            engine = built[storage]
+            searches[storage] = (
+                lambda jd, k, engine=engine: search_resources(jd, tfidf, tfidf_matrix, df, k=k, engine=engine),
+                lambda jds, k, engine=engine: list(search_resources_batch(jds, tfidf, tfidf_matrix, df, k=k,
+                                                                          engine=engine)),
+            )
+    for name in ("hashed", "compact"):
+        if name in engines:
+            vectorizer, matrix, engine = built[name]
+            searches[name] = (
+                lambda jd, k, vectorizer=vectorizer, matrix=matrix, engine=engine:
+                    search_resources(jd, vectorizer, matrix, df, k=k, engine=engine),
+                lambda jds, k, vectorizer=vectorizer, matrix=matrix, engine=engine:
+                    list(search_resources_batch(jds, vectorizer, matrix, df, k=k, engine=engine)),
+            )
+    return searches, builds
+
+
+def run(args):
+    job_descriptions = synthetic_job_descriptions(args.queries)
+    results = []
+    for size in args.sizes:
+        print(f"{size} resources")
+        start = time.perf_counter()
+        df = synthetic_catalog(size)
+        print(f"    generated catalog in {time.perf_counter() - start:.2f}s")
+
+        searches, builds = build_engines(df, args.engines, not args.skip_memory, args.n_components,
+                                         args.shards)
+        engines = {}
+        for engine, (single, batch) in searches.items():
+            single_ms = percentiles(time_calls(lambda jd: single(jd, args.k), job_descriptions))
+            batches = [job_descriptions[i:i + args.batch_size]
+                       for i in range(0, len(job_descriptions), args.batch_size)]
+            batch_timings = time_calls(lambda jds: batch(jds, args.k), batches, warmup=1)
+            batch_ms = percentiles(batch_timings)
+            throughput = len(job_descriptions) / sum(batch_timings)
+            concurrent_qps = {
+                str(clients): round(concurrent_throughput(lambda jd: single(jd, args.k), job_descriptions, clients), 2)
+                for clients in args.clients
+            }
+            engines[engine] = {"single_ms": single_ms, "batch_ms": batch_ms, "batch_qps": round(throughput, 2),
+                               "concurrent_qps": concurrent_qps}
+            print(f"    {engine:<10} single p50 {single_ms['p50']:>8.2f} ms  p99 {single_ms['p99']:>8.2f} ms  "
+                  f"batch of {args.batch_size} p50 {batch_ms['p50']:>9.2f} ms  {throughput:>9.1f} q/s")
+            print(f"    {'':<10} concurrent " + "  ".join(f"{clients} clients {qps:>9.1f} q/s"
+                                                          for clients, qps in concurrent_qps.items()))
+
+        results.append({
+            "size": size,
+            "builds": builds,
+            "engines": engines,
+            "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        })
+        del df, searches
+        gc.collect()
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current, baseline_path):
+    """Print current / baseline ratios for every metric both runs measured"""
+    with open(baseline_path) as f:
+        baseline = {result["size"]: result for result in json.load(f)["results"]}
+    print(f"\nCompared with {baseline_path} (ratio < 1 is an improvement)")
+    for result in current:
+        base = baseline.get(result["size"])
+        if base is None:
+            continue
+        for phase, build in result["builds"].items():
+            base_build = base["builds"].get(phase)
+            if base_build:
+                line = f"  {result['size']:>8} build {phase:<10} time x{build['seconds'] / base_build['seconds']:.2f}"
+                if build["peak_mb"] and base_build["peak_mb"]:
+                    line += f"  memory x{build['peak_mb'] / base_build['peak_mb']:.2f}"
+                print(line)
+        for engine, metrics in result["engines"].items():
+            base_metrics = base["engines"].get(engine)
+            if base_metrics:
+                print(f"  {result['size']:>8} {engine:<16} single p50 x{metrics['single_ms']['p50'] / base_metrics['single_ms']['p50']:.2f}"
+                      f"  p99 x{metrics['single_ms']['p99'] / base_metrics['single_ms']['p99']:.2f}"
+                      f"  batch p50 x{metrics['batch_ms']['p50'] / base_metrics['batch_ms']['p50']:.2f}")
+                for clients, qps in metrics.get("concurrent_qps", {}).items():
+                    base_qps = base_metrics.get("concurrent_qps", {}).get(clients)
+                    if base_qps:
+                        # Throughput, so here a ratio > 1 is the improvement
+                        print(f"  {result['size']:>8} {engine:<16} {clients} clients q/s x{qps / base_qps:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scalability benchmark for the resource recommender")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=ENGINES)
+    parser.add_argument("--queries", type=int, default=200, help="Job descriptions timed per engine")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4],
+                        help="Concurrent client threads for the single-search throughput runs")
+    parser.add_argument("--n-components", type=int, default=128, help="LSA dimensions of the semantic engine")
+    parser.add_argument("--shards", type=int, default=max(2, os.cpu_count() or 1), help="Shards of the sharded engine")
+    parser.add_argument("--skip-memory", action="store_true", help="Skip the traced second build of each index")
+    parser.add_argument("--output", help="JSON results file (default: results/scalability-<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = run(args)
+    output = args.output or os.path.join(RESULTS_DIR, f"scalability-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "meta": {
+                "commit": commit,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "scipy": scipy.__version__,
+                "sklearn": sklearn.__version__,
+                "machine": platform.machine(),
+                "cpu_count": os.cpu_count(),
+                "queries": args.queries,
+                "k": args.k,
+                "batch_size": args.batch_size,
+                "shards": args.shards,
+                "clients": args.clients,
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"Wrote {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
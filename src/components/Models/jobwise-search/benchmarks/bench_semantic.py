@@ -0,0 +1,53 @@
+"""Recall and latency of the IVF semantic index against exact dense search.
+
+Run from the jobwise-search directory:
+    python benchmarks/bench_semantic.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_retrieval import synthetic_corpus
+from semantic import ExactDenseIndex, IvfIndex, LsaEncoder
+
+QUERIES = [
+    "python data science pandas numpy machine learning",
+    "react javascript frontend web development",
+    "kubernetes docker devops cloud computing",
+    "sql database postgresql data engineering",
+    "security penetration testing linux",
+]
+
+
+def main():
+    print(f"{'docs':>8} {'n_probe':>8} {'recall@10':>10} {'exact ms':>9} {'ivf ms':>8}")
+    for size in (10000, 100000):
+        corpus = synthetic_corpus(size)
+        encoder = LsaEncoder(n_components=128).fit(corpus)
+        embeddings = np.concatenate([encoder.encode(corpus[i:i + 4096]) for i in range(0, size, 4096)])
+        queries = encoder.encode(QUERIES)
+
+        exact = ExactDenseIndex(embeddings)
+        ivf = IvfIndex.build(embeddings)
+        truth = [set(exact.search(query, 10)[0].tolist()) for query in queries]
+
+        start = time.perf_counter()
+        for query in queries:
+            exact.search(query, 10)
+        exact_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+        for n_probe in (1, 4, 8, 16, 32):
+            start = time.perf_counter()
+            found = [set(ivf.search(query, 10, n_probe)[0].tolist()) for query in queries]
+            ivf_ms = (time.perf_counter() - start) / len(queries) * 1000
+            recall = np.mean([len(f & t) / len(t) for f, t in zip(found, truth)])
+            print(f"{size:>8} {n_probe:>8} {recall:>10.3f} {exact_ms:>9.2f} {ivf_ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
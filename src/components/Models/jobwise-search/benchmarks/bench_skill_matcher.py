@@ -0,0 +1,98 @@
+"""Benchmark the single-pass skill matcher against the per-skill regex loop.
+
+Run from the jobwise-search directory:
+    python benchmarks/bench_skill_matcher.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_matcher import COMMON_SKILLS, SkillMatcher
+
+SAMPLE_DESCRIPTIONS = [
+    """
+    We are looking for a skilled Python Developer to join our data science team.
+    The ideal candidate should have expertise in Python programming, data analysis, and machine learning.
+    Experience with pandas, numpy, scikit-learn, and TensorFlow is required.
+    Knowledge of SQL and database concepts is a must.
+    """,
+    """
+    Full-Stack Developer needed with strong JavaScript skills. Experience with React,
+    Node.js, Express, and MongoDB required. Knowledge of HTML/CSS, RESTful APIs, and
+    version control systems like Git is essential. TypeScript and cloud deployment
+    experience (AWS/Heroku) is a plus.
+    """,
+    """
+    DevOps Engineer with expertise in CI/CD pipelines, Docker, Kubernetes, and cloud platforms
+    (AWS/Azure). Experience with infrastructure as code using Terraform or CloudFormation required.
+    Scripting skills in Python or Bash essential. Knowledge of monitoring and logging solutions,
+    Jenkins, and GitLab CI/CD is highly valued.
+    """,
+]
+
+
+def legacy_extract_skills(job_description, skills):
+    """The original loop: one regex search per skill"""
+    job_description = job_description.lower()
+    found_skills = []
+    for skill in skills:
+        if re.search(r'\b' + re.escape(skill) + r'\b', job_description):
+            found_skills.append(skill)
+    return found_skills
+
+
+def synthetic_skills(count, seed=0):
+    """Pad the real skill list with generated skills and aliases"""
+    rng = random.Random(seed)
+    alphabet = "abcdefghijklmnopqrstuvwxyz"
+    skills = list(COMMON_SKILLS)
+    seen = set(skills)
+    while len(skills) < count:
+        words = [
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(3, 9)))
+            for _ in range(rng.randint(1, 3))
+        ]
+        skill = " ".join(words)
+        if skill not in seen:
+            seen.add(skill)
+            skills.append(skill)
+    return skills
+
+
+def time_per_call(func, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - start) / (repeat * len(texts))
+
+
+def main():
+    texts = SAMPLE_DESCRIPTIONS + [" ".join(SAMPLE_DESCRIPTIONS) * 10]
+
+    print(f"{'skills':>8} {'build ms':>10} {'regex us':>12} {'matcher us':>12} {'speedup':>8}")
+    for count in (len(COMMON_SKILLS), 1000, 10000, 30000):
+        skills = synthetic_skills(count)
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(skills)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        # Same skills in the same order as the loop it replaces
+        for text in texts:
+            expected = legacy_extract_skills(text, skills)
+            actual = [match.skill for match in matcher.match(text)]
+            assert actual == expected, (expected, actual)
+
+        repeat = max(1, 2000 // count)
+        regex_us = time_per_call(lambda text: legacy_extract_skills(text, skills), texts, repeat) * 1e6
+        matcher_us = time_per_call(matcher.match, texts, max(repeat, 20)) * 1e6
+        print(f"{count:>8} {build_ms:>10.1f} {regex_us:>12.1f} {matcher_us:>12.1f} {regex_us / matcher_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Build the on-disk catalog, TF-IDF index and skill graph artifacts loaded by app.py.
+
+    python build_index.py                        # export the built-in catalog, then index it
+    python build_index.py --catalog resources.parquet
+    python build_index.py --compact --min-df 2 --max-df 0.5   # float32 index, pruned vocabulary
+    python build_index.py --hashed --jobs 8 --storage int8     # hashed buckets, quantized postings
+    python build_index.py --semantic --encoder sentence-transformers --model ./models/all-MiniLM-L6-v2
+
+Without an existing catalog file the built-in resource list is written to
+--catalog first. The index is written to a temporary directory and swapped
+into place, so running app processes never see a partial index.
+"""
+import argparse
+import os
+import shutil
+import time
+
+import pandas as pd
+
+from catalog_store import (
+    CATALOG_PATH, HASH_FEATURES, INDEX_DIR, INDEX_STORAGE, INDEX_STORAGES, VECTORIZER, build_bm25f_engine,
+    fit_compact_index, fit_hashed, fit_index, load_catalog, read_catalog_version, save_catalog, save_index
+)
+from default_catalog import DEFAULT_RESOURCES
+from semantic import EMBEDDING_MODEL, SEMANTIC_DIR, LsaEncoder, SentenceTransformerEncoder, build_semantic_index
+from skill_graph import SKILL_GRAPH_PATH, SkillGraph
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the resource catalog and TF-IDF index")
+    parser.add_argument("--catalog", default=CATALOG_PATH, help="Parquet or Arrow catalog file")
+    parser.add_argument("--index-dir", default=INDEX_DIR, help="Directory for the index artifacts")
+    parser.add_argument("--compact", action="store_true",
+                        help="Store a float32 index with an array-backed vocabulary")
+    parser.add_argument("--min-df", type=int, default=1, help="With --compact, drop terms in fewer resources")
+    parser.add_argument("--max-df", type=float, default=1.0,
+                        help="With --compact, drop terms in more than this share of resources")
+    parser.add_argument("--hashed", action="store_true", default=VECTORIZER == "hashed",
+                        help="Hash terms into a fixed number of buckets instead of fitting a vocabulary")
+    parser.add_argument("--n-features", type=int, default=HASH_FEATURES, help="With --hashed, number of buckets")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(),
+                        help="With --hashed, processes hashing the catalog")
+    parser.add_argument("--storage", choices=INDEX_STORAGES, default=INDEX_STORAGE,
+                        help="Weight type of the TF-IDF postings; int8 and float16 keep a scale per resource")
+    parser.add_argument("--skill-graph", default=SKILL_GRAPH_PATH, help="File for the learning-path skill graph")
+    parser.add_argument("--semantic", action="store_true", help="Also build the dense-embedding ANN index")
+    parser.add_argument("--semantic-dir", default=SEMANTIC_DIR, help="Directory for the semantic index")
+    parser.add_argument("--encoder", choices=["lsa", "sentence-transformers"], default="lsa",
+                        help="Embedding model used for the semantic index")
+    parser.add_argument("--model", default=EMBEDDING_MODEL, help="Local sentence-transformers model path")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.catalog):
+        save_catalog(pd.DataFrame(DEFAULT_RESOURCES), args.catalog)
+        print(f"Wrote built-in catalog to {args.catalog}")
+
+    start = time.perf_counter()
+    df = load_catalog(args.catalog)
+    if args.hashed:
+        tfidf, tfidf_matrix = fit_hashed(df, args.n_features, args.jobs)
+    elif args.compact:
+        tfidf, tfidf_matrix = fit_compact_index(df, args.min_df, args.max_df)
+    else:
+        tfidf, tfidf_matrix = fit_index(df, "vocabulary")
+
+    staging_dir = args.index_dir + ".tmp"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    save_index(tfidf, tfidf_matrix, staging_dir, args.catalog, bm25f=build_bm25f_engine(df, tfidf),
+               storage=args.storage)
+    shutil.rmtree(args.index_dir, ignore_errors=True)
+    os.replace(staging_dir, args.index_dir)
+
+    features = "buckets" if args.hashed else "terms"
+    print(
+        f"Indexed {tfidf_matrix.shape[0]} resources, {tfidf_matrix.shape[1]} {features} "
+        f"in {time.perf_counter() - start:.2f}s -> {args.index_dir}"
+    )
+
+    start = time.perf_counter()
+    skill_graph = SkillGraph.build(df)
+    skill_graph.save(args.skill_graph + ".tmp", read_catalog_version(args.catalog))
+    os.replace(args.skill_graph + ".tmp", args.skill_graph)
+    n_edges = sum(len(required) for required in skill_graph.prerequisites.values())
+    print(
+        f"Linked {len(skill_graph.skill_resources)} skills with {n_edges} prerequisite edges "
+        f"in {time.perf_counter() - start:.2f}s -> {args.skill_graph}"
+    )
+
+    if args.semantic:
+        start = time.perf_counter()
+        encoder = SentenceTransformerEncoder(args.model) if args.encoder == "sentence-transformers" else LsaEncoder()
+
+        staging_dir = args.semantic_dir + ".tmp"
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        engine = build_semantic_index(df, args.catalog, staging_dir, encoder)
+        shutil.rmtree(args.semantic_dir, ignore_errors=True)
+        os.replace(staging_dir, args.semantic_dir)
+
+        print(
+            f"Embedded {len(df)} resources into {engine.index.embeddings.shape[1]} dimensions, "
+            f"{len(engine.index.centroids)} lists in {time.perf_counter() - start:.2f}s -> {args.semantic_dir}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+import functools
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+from compact_index import ArrayVocabulary, CompactVectorizer, compact_index
+from default_catalog import DEFAULT_RESOURCES
+from filters import add_duration_hours
+from hashed_index import HashedVectorizer, fit_hashed_index
+from retrieval import QUANTIZED_STORAGE, BM25FEngine, InvertedIndexEngine
+
+# Default locations, overridable per deployment
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+CATALOG_PATH = os.environ.get("JOBWISE_CATALOG", os.path.join(DATA_DIR, "catalog.arrow"))
+INDEX_DIR = os.environ.get("JOBWISE_INDEX_DIR", os.path.join(DATA_DIR, "index"))
+
+INDEX_FORMAT_VERSION = 1
+
+# Ranking function chosen at setup time: "tfidf" (cosine) or "bm25f"
+RANKING = os.environ.get("JOBWISE_RANKING", "tfidf")
+RANKINGS = ["tfidf", "bm25f"]
+
+# BM25F settings: skill tags are short and decisive, descriptions long and noisy
+BM25F_FIELDS = {
+    "skills": {"weight": 2.0, "b": 0.3},
+    "description": {"weight": 1.0, "b": 0.75},
+}
+BM25_K1 = 1.2
+
+# Feature space: "vocabulary" (fitted TF-IDF terms) or "hashed" (fixed number of hashed buckets)
+VECTORIZER = os.environ.get("JOBWISE_VECTORIZER", "vocabulary")
+VECTORIZERS = ["vocabulary", "hashed"]
+HASH_FEATURES = int(os.environ.get("JOBWISE_HASH_FEATURES", str(2 ** 18)))
+
+# Weight type of the TF-IDF postings: "float64", or "int8" / "float16" with per-resource scales
+INDEX_STORAGE = os.environ.get("JOBWISE_INDEX_STORAGE", "float64")
+INDEX_STORAGES = ["float64"] + QUANTIZED_STORAGE
+
+# TF-IDF settings shared by every process that fits or loads the index
+VECTORIZER_PARAMS = {
+    "stop_words": "english",
+    "ngram_range": (1, 2),  # Include bigrams for better matching
+    "max_features": 5000,   # Limit features for performance
+}
+
+
+def build_vectorizer():
+    """Create an unfitted TF-IDF vectorizer with the app's settings"""
+    return TfidfVectorizer(**VECTORIZER_PARAMS)
+
+
+def build_corpus(df):
+    """Text indexed for each resource: its skills followed by its description"""
+    return df['skills'] + " " + df['description']
+
+
+def fit_index(df, vectorizer=VECTORIZER):
+    """Fit the vectorizer on the catalog and return (tfidf, tfidf_matrix)"""
+    if vectorizer == "hashed":
+        return fit_hashed(df)
+    tfidf = build_vectorizer()
+    tfidf_matrix = tfidf.fit_transform(build_corpus(df))
+    # Older scikit-learn keeps every pruned term in stop_words_; it is never used to transform
+    if getattr(tfidf, "stop_words_", None) is not None:
+        tfidf.stop_words_ = None
+    return tfidf, tfidf_matrix
+
+
+def fit_compact_index(df, min_df=1, max_df=1.0):
+    """Fit the index and return it as (CompactVectorizer, float32 tfidf_matrix)"""
+    tfidf, tfidf_matrix = fit_index(df, "vocabulary")
+    return compact_index(tfidf, tfidf_matrix, build_vectorizer().build_analyzer(), min_df, max_df)
+
+
+def fit_hashed(df, n_features=HASH_FEATURES, n_jobs=1):
+    """Hash the catalog into (HashedVectorizer, float32 tfidf_matrix), using n_jobs processes"""
+    return fit_hashed_index(
+        build_corpus(df),
+        n_features,
+        stop_words=VECTORIZER_PARAMS["stop_words"],
+        ngram_range=VECTORIZER_PARAMS["ngram_range"],
+        n_jobs=n_jobs,
+    )
+
+
+def field_counts(tfidf, texts):
+    """Term counts of texts over the feature space of any vectorizer type"""
+    if isinstance(tfidf, (CompactVectorizer, HashedVectorizer)):
+        return tfidf.count(texts)
+    params = {key: value for key, value in VECTORIZER_PARAMS.items() if key != "max_features"}
+    return CountVectorizer(vocabulary=tfidf.vocabulary_, **params).transform(texts)
+
+
+def build_bm25f_engine(df, tfidf):
+    """BM25F engine over the skills and description fields, sharing the TF-IDF vocabulary"""
+    return BM25FEngine(
+        [field_counts(tfidf, df[field]) for field in BM25F_FIELDS],
+        [settings["weight"] for settings in BM25F_FIELDS.values()],
+        [settings["b"] for settings in BM25F_FIELDS.values()],
+        k1=BM25_K1,
+    )
+
+
+def build_engine(df, tfidf, tfidf_matrix, ranking=RANKING, storage=INDEX_STORAGE):
+    """Retrieval engine for the chosen ranking function"""
+    if ranking == "bm25f":
+        return build_bm25f_engine(df, tfidf)
+    return InvertedIndexEngine(tfidf_matrix, storage=storage)
+
+
+def save_catalog(df, path):
+    """Write the catalog as Parquet or as an Arrow IPC file, chosen by extension"""
+    # Persist parsed durations so loading the catalog does not reparse them
+    table = pa.Table.from_pandas(add_duration_hours(df.copy()), preserve_index=False)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.endswith(".parquet"):
+        pq.write_table(table, path)
+    else:
+        # Uncompressed so readers can memory-map the columns as they are
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+
+def load_catalog(path):
+    """Load the catalog as a DataFrame whose columns stay in Arrow memory.
+
+    Arrow IPC files are memory-mapped, so rows are paged in from disk as they
+    are read instead of being copied into every process up front.
+    """
+    if path.endswith(".parquet"):
+        table = pq.read_table(path, memory_map=True)
+    else:
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def load_resource_frame(catalog_path=CATALOG_PATH):
+    """The catalog file if there is one, else the built-in list, with parsed durations"""
+    if os.path.exists(catalog_path):
+        df = load_catalog(catalog_path)
+    else:
+        df = pd.DataFrame(DEFAULT_RESOURCES)
+    return add_duration_hours(df)
+
+
+def catalog_fingerprint(catalog_path):
+    """Cheap identity of the catalog file, used to spot stale index artifacts"""
+    stat = os.stat(catalog_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def read_catalog_version(catalog_path=CATALOG_PATH):
+    """Version tag of the catalog in use, changing whenever the file is rewritten"""
+    if not os.path.exists(catalog_path):
+        return "builtin"
+    fingerprint = catalog_fingerprint(catalog_path)
+    return f"{fingerprint['size']}-{fingerprint['mtime_ns']}"
+
+
+def index_arrays(tfidf, tfidf_matrix, bm25f=None, storage=INDEX_STORAGE):
+    """Flat arrays and manifest fields that make up a fitted index.
+
+    Returns (arrays, fields, vocabulary); vocabulary is the term dict of a
+    plain TfidfVectorizer and None for the compact and hashed vectorizers,
+    whose vocabulary is part of the arrays or not needed at all.
+    """
+    tfidf_matrix = tfidf_matrix.tocsr()
+    engine = InvertedIndexEngine(tfidf_matrix, storage=storage)
+
+    arrays = {
+        "idf": tfidf.idf_,
+        "matrix_data": tfidf_matrix.data,
+        "matrix_indices": tfidf_matrix.indices,
+        "matrix_indptr": tfidf_matrix.indptr,
+        "postings_indptr": engine.postings_indptr,
+        "postings_doc_ids": engine.postings_doc_ids,
+        "postings_weights": engine.postings_weights,
+    }
+    if engine.doc_scales is not None:
+        arrays["postings_doc_scales"] = engine.doc_scales
+    if bm25f is not None:
+        arrays.update({
+            "bm25f_idf": bm25f.idf,
+            "bm25f_postings_indptr": bm25f.postings_indptr,
+            "bm25f_postings_doc_ids": bm25f.postings_doc_ids,
+            "bm25f_postings_weights": bm25f.postings_weights,
+        })
+
+    compact = isinstance(tfidf, CompactVectorizer)
+    hashed = isinstance(tfidf, HashedVectorizer)
+    vocabulary = None
+    if compact:
+        arrays["vocabulary_terms"] = tfidf.vocabulary.terms
+        arrays["vocabulary_columns"] = tfidf.vocabulary.columns
+    elif not hashed:
+        vocabulary = {term: int(column) for term, column in tfidf.vocabulary_.items()}
+
+    fields = {
+        "shape": list(tfidf_matrix.shape),
+        "compact": compact,
+        "hashed": hashed,
+        "storage": storage if engine.doc_scales is not None else "float64",
+        "rankings": ["tfidf", "bm25f"] if bm25f is not None else ["tfidf"],
+    }
+    return arrays, fields, vocabulary
+
+
+def save_index(tfidf, tfidf_matrix, index_dir, catalog_path, bm25f=None, storage=INDEX_STORAGE):
+    """Persist the fitted vocabulary, IDF weights, CSR matrix and postings.
+
+    A CompactVectorizer is stored as its vocabulary arrays instead of JSON,
+    and a HashedVectorizer needs no vocabulary at all. Postings are stored
+    with the given weight type. A BM25F engine, if given, is stored next to
+    the TF-IDF postings.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    arrays, fields, vocabulary = index_arrays(tfidf, tfidf_matrix, bm25f, storage)
+    for name, array in arrays.items():
+        np.save(os.path.join(index_dir, name + ".npy"), np.ascontiguousarray(array))
+    if vocabulary is not None:
+        with open(os.path.join(index_dir, "vocabulary.json"), "w") as f:
+            json.dump(vocabulary, f)
+
+    # The manifest is written last so a half-written index is never picked up
+    manifest = dict(format_version=INDEX_FORMAT_VERSION, **fields, catalog=catalog_fingerprint(catalog_path))
+    with open(os.path.join(index_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f)
+
+
+def _read_manifest(index_dir, catalog_path):
+    """Return the manifest if the index exists and was built from this catalog"""
+    manifest_path = os.path.join(index_dir, "manifest.json")
+    if not os.path.exists(manifest_path) or not os.path.exists(catalog_path):
+        return None
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != INDEX_FORMAT_VERSION:
+        return None
+    if manifest.get("catalog") != catalog_fingerprint(catalog_path):
+        return None
+    return manifest
+
+
+def _load_array(index_dir, name):
+    return np.load(os.path.join(index_dir, name + ".npy"), mmap_mode="r")
+
+
+def index_from_arrays(manifest, array, vocabulary=None):
+    """Rebuild (tfidf, tfidf_matrix) around arrays looked up by name, without copying them"""
+    if manifest.get("hashed"):
+        tfidf = HashedVectorizer(array("idf"), VECTORIZER_PARAMS["stop_words"], VECTORIZER_PARAMS["ngram_range"])
+    elif manifest.get("compact"):
+        vocabulary = ArrayVocabulary(array("vocabulary_terms"), array("vocabulary_columns"))
+        tfidf = CompactVectorizer(vocabulary, array("idf"), build_vectorizer().build_analyzer())
+    else:
+        tfidf = build_vectorizer()
+        tfidf.vocabulary_ = vocabulary
+        tfidf.idf_ = array("idf")
+
+    tfidf_matrix = csr_matrix(
+        (array("matrix_data"), array("matrix_indices"), array("matrix_indptr")),
+        shape=tuple(manifest["shape"]),
+        copy=False,
+    )
+    return tfidf, tfidf_matrix
+
+
+def engine_from_arrays(manifest, array, ranking=RANKING):
+    """Engine for a ranking around postings arrays looked up by name, or None if the index lacks it"""
+    if ranking not in manifest.get("rankings", ["tfidf"]):
+        return None
+
+    if ranking == "bm25f":
+        return BM25FEngine.from_postings(
+            array("bm25f_postings_indptr"),
+            array("bm25f_postings_doc_ids"),
+            array("bm25f_postings_weights"),
+            n_docs=manifest["shape"][0],
+            idf=array("bm25f_idf"),
+        )
+    quantized = manifest.get("storage") in QUANTIZED_STORAGE
+    return InvertedIndexEngine.from_postings(
+        array("postings_indptr"),
+        array("postings_doc_ids"),
+        array("postings_weights"),
+        n_docs=manifest["shape"][0],
+        doc_scales=array("postings_doc_scales") if quantized else None,
+    )
+
+
+def load_index(index_dir, catalog_path):
+    """Load (tfidf, tfidf_matrix) without refitting, or None if the index is missing or stale.
+
+    The matrix arrays are memory-mapped read-only, so every process shares
+    the same page cache instead of holding its own copy.
+    """
+    manifest = _read_manifest(index_dir, catalog_path)
+    if manifest is None:
+        return None
+
+    vocabulary = None
+    if not manifest.get("hashed") and not manifest.get("compact"):
+        with open(os.path.join(index_dir, "vocabulary.json")) as f:
+            vocabulary = json.load(f)
+    return index_from_arrays(manifest, functools.partial(_load_array, index_dir), vocabulary)
+
+
+def load_engine(index_dir, catalog_path, ranking=RANKING):
+    """Load the memory-mapped engine for a ranking, or None if it is missing or stale"""
+    manifest = _read_manifest(index_dir, catalog_path)
+    if manifest is None:
+        return None
+    return engine_from_arrays(manifest, functools.partial(_load_array, index_dir), ranking)
@@ -0,0 +1,99 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.preprocessing import normalize
+
+
+class ArrayVocabulary:
+    """Term -> column lookup over a sorted array of UTF-8 terms.
+
+    Replaces the fitted vectorizer's vocabulary dict: two flat arrays that
+    can be memory-mapped, searched for a whole token list at once.
+    """
+
+    def __init__(self, terms, columns):
+        self.terms = terms        # sorted UTF-8 bytes, numpy 'S' dtype
+        self.columns = columns    # matrix column of terms[i]
+
+    @classmethod
+    def from_dict(cls, vocabulary):
+        terms = np.array([term.encode("utf-8") for term in vocabulary])
+        columns = np.fromiter(vocabulary.values(), dtype=np.int32, count=len(vocabulary))
+        order = np.argsort(terms, kind="stable")
+        return cls(terms[order], columns[order])
+
+    def __len__(self):
+        return len(self.terms)
+
+    @property
+    def nbytes(self):
+        return self.terms.nbytes + self.columns.nbytes
+
+    def lookup(self, tokens):
+        """Columns of the tokens, with -1 for tokens outside the vocabulary"""
+        if not len(tokens) or not len(self.terms):
+            return np.full(len(tokens), -1, dtype=np.int32)
+        tokens = np.array([token.encode("utf-8") for token in tokens])
+        positions = np.minimum(np.searchsorted(self.terms, tokens), len(self.terms) - 1)
+        found = self.terms[positions] == tokens
+        return np.where(found, self.columns[positions], -1).astype(np.int32)
+
+
+class CompactVectorizer:
+    """TF-IDF transform over an ArrayVocabulary, producing float32 rows.
+
+    Produces the same L2-normalised weights as TfidfVectorizer.transform for
+    the same vocabulary and IDF, without holding any per-term Python objects.
+    """
+
+    def __init__(self, vocabulary, idf, analyzer):
+        self.vocabulary = vocabulary
+        self.idf_ = idf
+        self.analyzer = analyzer
+
+    def count(self, texts):
+        """Term counts over the vocabulary, like CountVectorizer.transform"""
+        indptr = [0]
+        indices = []
+        data = []
+        for text in texts:
+            columns = self.vocabulary.lookup(self.analyzer(text))
+            columns, counts = np.unique(columns[columns >= 0], return_counts=True)
+            indices.append(columns)
+            data.append(counts.astype(np.float64))
+            indptr.append(indptr[-1] + len(columns))
+        return csr_matrix(
+            (
+                np.concatenate(data) if data else np.empty(0),
+                np.concatenate(indices).astype(np.int32) if indices else np.empty(0, dtype=np.int32),
+                np.asarray(indptr, dtype=np.int32),
+            ),
+            shape=(len(indptr) - 1, len(self.idf_)),
+        )
+
+    def transform(self, texts):
+        matrix = self.count(texts)
+        matrix.data *= self.idf_[matrix.indices]
+        return normalize(matrix).astype(np.float32)
+
+
+def compact_index(tfidf, tfidf_matrix, analyzer, min_df=1, max_df=1.0):
+    """Convert a fitted (tfidf, tfidf_matrix) pair to the compact representation.
+
+    Terms in fewer than min_df resources, or in more than the max_df share of
+    them, are dropped and rows are re-normalised over the remaining terms.
+    The matrix is stored as float32 with int32 indices.
+    """
+    tfidf_matrix = tfidf_matrix.tocsr()
+    n_docs, n_terms = tfidf_matrix.shape
+    doc_freq = np.bincount(tfidf_matrix.indices, minlength=n_terms)
+    keep = (doc_freq >= min_df) & (doc_freq <= max_df * n_docs)
+
+    new_columns = np.cumsum(keep) - 1
+    vocabulary = {term: int(new_columns[column]) for term, column in tfidf.vocabulary_.items() if keep[column]}
+
+    matrix = normalize(tfidf_matrix[:, keep]).astype(np.float32)
+    matrix = csr_matrix(
+        (matrix.data, matrix.indices.astype(np.int32), matrix.indptr.astype(np.int32)), shape=matrix.shape
+    )
+    idf = np.asarray(tfidf.idf_, dtype=np.float32)[keep]
+    return CompactVectorizer(ArrayVocabulary.from_dict(vocabulary), idf, analyzer), matrix
@@ -0,0 +1,312 @@
+"""Crawl course pages into the on-disk resource catalog loaded by app.py.
+
+    python crawler.py seeds.jsonl                       # writes data/catalog.arrow
+    python crawler.py seeds.txt --output catalog.parquet --merge --rate 2
+
+Seeds are one URL per line, or JSON lines such as
+{"url": ..., "source": ..., "skills": "python, pandas", "duration": "4 hours"}
+whose fields override what is read from the page. Pages are fetched
+concurrently over one pooled connection set, at most --rate requests per
+second per host, with retries on connection errors, 429 and 5xx. The ETag
+and Last-Modified of every page are kept in --state, so a recrawl sends
+conditional requests and reuses the stored record on 304 Not Modified.
+Only the <head> is parsed, incrementally as it arrives; the body is never
+downloaded. Run build_index.py afterwards to index the new catalog.
+"""
+import argparse
+import asyncio
+import codecs
+import hashlib
+import json
+import os
+import re
+import time
+from html.parser import HTMLParser
+from urllib.parse import urldefrag, urljoin, urlsplit, urlunsplit
+
+import aiohttp
+import pandas as pd
+
+from catalog_store import CATALOG_PATH, DATA_DIR, load_resource_frame, save_catalog
+from skill_matcher import get_skill_matcher
+
+CRAWL_STATE_PATH = os.path.join(DATA_DIR, "crawl_state.json")
+
+USER_AGENT = "jobwise-search-crawler/1.0"
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Fields of a record from build_record, and so the columns of a crawled catalog
+RECORD_COLUMNS = ["title", "url", "description", "skills", "source", "duration"]
+
+
+def normalize_url(url):
+    """Canonical form used for deduplication: lowercase scheme and host, no fragment or trailing slash"""
+    parts = urlsplit(urldefrag(url)[0])
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+
+def parse_iso_duration(value):
+    """Hours from an ISO 8601 duration such as PT4H30M, or None"""
+    match = re.fullmatch(r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?)?", value.strip().upper())
+    if not match or not any(match.groups()):
+        return None
+    days, hours, minutes = (int(group or 0) for group in match.groups())
+    return days * 24 + hours + minutes / 60
+
+
+class HeadParser(HTMLParser):
+    """Incremental parser for the page metadata in <head>.
+
+    Fed chunks as they arrive; done is set at </head> or <body> so the
+    caller can stop reading the response there.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+        self.title = ""
+        self.canonical = None
+        self.done = False
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "title":
+            self._in_title = True
+        elif tag == "meta":
+            key = (attrs.get("property") or attrs.get("name") or attrs.get("itemprop") or "").lower()
+            if key and attrs.get("content") and key not in self.meta:
+                self.meta[key] = attrs["content"].strip()
+        elif tag == "link" and "canonical" in (attrs.get("rel") or "").lower().split() and attrs.get("href"):
+            self.canonical = attrs["href"]
+        elif tag == "body":
+            self.done = True
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        elif tag == "head":
+            self.done = True
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+
+
+def build_record(url, parser, seed):
+    """Catalog row from the parsed page, with seed fields taking precedence"""
+    meta = parser.meta
+    title = seed.get("title") or meta.get("og:title") or " ".join(parser.title.split())
+    description = seed.get("description") or meta.get("og:description") or meta.get("description") or ""
+    if not title or not description:
+        return None
+
+    skills = seed.get("skills") or meta.get("keywords")
+    if not skills:
+        # Pages without keywords get the known skills named in their own text
+        skills = ", ".join(match.skill for match in get_skill_matcher().match(title + " " + description))
+
+    duration = seed.get("duration")
+    if not duration:
+        hours = parse_iso_duration(meta.get("duration") or meta.get("timerequired") or "")
+        duration = f"{hours:g} hours" if hours else "Self-paced"
+
+    return {
+        "title": title,
+        "url": urljoin(url, parser.canonical) if parser.canonical else url,
+        "description": description,
+        "skills": skills or "general",
+        "source": seed.get("source") or meta.get("og:site_name") or urlsplit(url).netloc,
+        "duration": duration,
+    }
+
+
+class HostRateLimiter:
+    """Spaces requests to each host at least 1 / rate seconds apart"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self._next_slot = {}
+        self._locks = {}
+
+    async def wait(self, host):
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class Crawler:
+    """Fetches seeds concurrently and turns their pages into catalog records"""
+
+    def __init__(self, state=None, concurrency=32, per_host=4, rate=1.0, retries=3, timeout=30, backoff=1.0):
+        self.state = state if state is not None else {}
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.limiter = HostRateLimiter(rate)
+        self.retries = retries
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.backoff = backoff
+        self.stats = {"fetched": 0, "not_modified": 0, "failed": 0, "retries": 0, "skipped": 0}
+
+    async def crawl(self, seeds):
+        """Return one record per seed that could be fetched and parsed"""
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host)
+        async with aiohttp.ClientSession(connector=connector, timeout=self.timeout,
+                                         headers={"User-Agent": USER_AGENT}) as session:
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def bounded(seed):
+                async with semaphore:
+                    return await self.fetch(session, seed)
+
+            # Seeds that only differ in form (trailing slash, fragment, host case) are fetched once
+            unique_seeds = {}
+            for seed in seeds:
+                unique_seeds.setdefault(normalize_url(seed["url"]), seed)
+            records = await asyncio.gather(*(bounded(seed) for seed in unique_seeds.values()))
+        return [record for record in records if record is not None]
+
+    async def fetch(self, session, seed):
+        url = seed["url"]
+        previous = self.state.get(normalize_url(url), {})
+        headers = {}
+        if previous.get("record"):
+            if previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous.get("last_modified"):
+                headers["If-Modified-Since"] = previous["last_modified"]
+
+        for attempt in range(self.retries + 1):
+            await self.limiter.wait(urlsplit(url).netloc)
+            try:
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304:
+                        self.stats["not_modified"] += 1
+                        return previous["record"]
+                    if response.status in RETRY_STATUSES and attempt < self.retries:
+                        await self._retry_delay(attempt, response.headers.get("Retry-After"))
+                        continue
+                    if response.status != 200 or "html" not in response.headers.get("Content-Type", "html"):
+                        self.stats["failed"] += 1
+                        return None
+
+                    parser = HeadParser()
+                    decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(errors="replace")
+                    async for chunk in response.content.iter_chunked(8192):
+                        parser.feed(decoder.decode(chunk))
+                        if parser.done:
+                            break
+                    record = build_record(str(response.url), parser, seed)
+                    if record is None:
+                        self.stats["skipped"] += 1
+                        return None
+
+                    self.stats["fetched"] += 1
+                    self.state[normalize_url(url)] = {
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                        "record": record,
+                    }
+                    return record
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt < self.retries:
+                    await self._retry_delay(attempt)
+                    continue
+                self.stats["failed"] += 1
+                return None
+
+    async def _retry_delay(self, attempt, retry_after=None):
+        self.stats["retries"] += 1
+        delay = self.backoff * 2 ** attempt
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, int(retry_after))
+        await asyncio.sleep(delay)
+
+
+def deduplicate(records):
+    """Drop repeats by canonical URL, then by identical title and description (mirrors)"""
+    seen_urls = set()
+    seen_content = set()
+    unique = []
+    for record in records:
+        url = normalize_url(record["url"])
+        content = hashlib.sha1(f"{record['title'].lower()}\x1f{record['description'].lower()}".encode()).hexdigest()
+        if url in seen_urls or content in seen_content:
+            continue
+        seen_urls.add(url)
+        seen_content.add(content)
+        unique.append(record)
+    return unique
+
+
+def read_seeds(path):
+    seeds = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            seeds.append(json.loads(line) if line.startswith("{") else {"url": line})
+    return seeds
+
+
+def load_state(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(state, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f)
+    os.replace(path + ".tmp", path)
+
+
+def write_catalog(records, path):
+    """Write the catalog next to the target and swap it in, so readers never see a partial file"""
+    stem, extension = os.path.splitext(path)
+    staging_path = f"{stem}.tmp{extension}"
+    # Columns given explicitly so a crawl that kept nothing still writes a valid, empty catalog
+    frame = pd.DataFrame(records) if records else pd.DataFrame(columns=RECORD_COLUMNS, dtype="string")
+    save_catalog(frame, staging_path)
+    os.replace(staging_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl course pages into the resource catalog")
+    parser.add_argument("seeds", help="Text file of URLs or JSON lines of seed records")
+    parser.add_argument("--output", default=CATALOG_PATH, help="Parquet or Arrow catalog file to write")
+    parser.add_argument("--state", default=CRAWL_STATE_PATH, help="ETag / Last-Modified cache between crawls")
+    parser.add_argument("--merge", action="store_true", help="Keep resources of the current catalog not crawled now")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight overall")
+    parser.add_argument("--per-host", type=int, default=4, help="Open connections per host")
+    parser.add_argument("--rate", type=float, default=1.0, help="Requests per second per host")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds per request")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    crawler = Crawler(load_state(args.state), args.concurrency, args.per_host, args.rate, args.retries, args.timeout)
+    records = asyncio.run(crawler.crawl(read_seeds(args.seeds)))
+    if args.merge:
+        records += load_resource_frame(args.output).drop(columns=["duration_hours"]).to_dict(orient="records")
+    records = deduplicate(records)
+
+    write_catalog(records, args.output)
+    save_state(crawler.state, args.state)
+    print(
+        f"Wrote {len(records)} resources to {args.output} in {time.perf_counter() - start:.2f}s "
+        f"({', '.join(f'{count} {name}' for name, count in crawler.stats.items())})"
+    )
+
+
+if __name__ == "__main__":
+    main()
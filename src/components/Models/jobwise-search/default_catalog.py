@@ -0,0 +1,203 @@
+# Hand-maintained catalog of free learning resources, used when no catalog file is on disk
+DEFAULT_RESOURCES = [
+    {
+        "title": "JavaScript Algorithms and Data Structures",
+        "description": "Learn JavaScript fundamentals, ES6, regular expressions, debugging, data structures, OOP, functional programming, and algorithmic thinking",
+        "skills": "javascript, data structures, algorithms, programming, es6, functional programming, oop",
+        "duration": "300 hours",
+        "source": "freeCodeCamp",
+        "url": "https://www.freecodecamp.org/learn/javascript-algorithms-and-data-structures/"
+    },
+    {
+        "title": "Responsive Web Design Certification",
+        "description": "Learn HTML, CSS, visual design, accessibility, and responsive web design principles",
+        "skills": "html, css, responsive design, web development, frontend, accessibility",
+        "duration": "300 hours",
+        "source": "freeCodeCamp",
+        "url": "https://www.freecodecamp.org/learn/responsive-web-design/"
+    },
+    {
+        "title": "Scientific Computing with Python",
+        "description": "Python fundamentals, Python for data science, and completing scientific computing projects",
+        "skills": "python, data science, scientific computing, programming",
+        "duration": "300 hours",
+        "source": "freeCodeCamp",
+        "url": "https://www.freecodecamp.org/learn/scientific-computing-with-python/"
+    },
+    {
+        "title": "Data Analysis with Python",
+        "description": "Learn data analysis techniques using NumPy, Pandas, Matplotlib, and Seaborn",
+        "skills": "python, data analysis, pandas, numpy, matplotlib, visualization",
+        "duration": "300 hours",
+        "source": "freeCodeCamp",
+        "url": "https://www.freecodecamp.org/learn/data-analysis-with-python/"
+    },
+    {
+        "title": "Information Security",
+        "description": "Learn information security with HelmetJS, Python for penetration testing, and security concepts",
+        "skills": "security, information security, python, penetration testing, cybersecurity",
+        "duration": "300 hours",
+        "source": "freeCodeCamp",
+        "url": "https://www.freecodecamp.org/learn/information-security/"
+    },
+    {
+        "title": "Machine Learning with Python",
+        "description": "Learn TensorFlow and various machine learning algorithms and techniques",
+        "skills": "machine learning, python, tensorflow, deep learning, neural networks, ai",
+        "duration": "300 hours",
+        "source": "freeCodeCamp",
+        "url": "https://www.freecodecamp.org/learn/machine-learning-with-python/"
+    },
+    {
+        "title": "Learn Python - Full Course for Beginners",
+        "description": "A complete Python tutorial covering all the basics for beginners",
+        "skills": "python, programming, beginners, fundamentals",
+        "duration": "4 hours",
+        "source": "freeCodeCamp YouTube",
+        "url": "https://www.youtube.com/watch?v=rfscVS0vtbw"
+    },
+    {
+        "title": "Learn SQL - Full Database Course for Beginners",
+        "description": "A comprehensive introduction to SQL and database concepts",
+        "skills": "sql, database, data engineering, postgresql, mysql",
+        "duration": "4 hours",
+        "source": "freeCodeCamp YouTube",
+        "url": "https://www.youtube.com/watch?v=HXV3zeQKqGY"
+    },
+    {
+        "title": "React Tutorial for Beginners",
+        "description": "Learn the React JavaScript library from the ground up",
+        "skills": "react, javascript, frontend, web development",
+        "duration": "10 hours",
+        "source": "freeCodeCamp YouTube",
+        "url": "https://www.youtube.com/watch?v=bMknfKXIFA8"
+    },
+    {
+        "title": "Git and GitHub for Beginners - Crash Course",
+        "description": "Learn the basics of Git version control and GitHub",
+        "skills": "git, github, version control, collaboration",
+        "duration": "1 hour",
+        "source": "freeCodeCamp YouTube",
+        "url": "https://www.youtube.com/watch?v=RGOj5yH7evk"
+    },
+    {
+        "title": "Docker Tutorial for Beginners",
+        "description": "Full Docker course teaching containerization from scratch",
+        "skills": "docker, devops, containerization, deployment",
+        "duration": "3 hours",
+        "source": "freeCodeCamp YouTube",
+        "url": "https://www.youtube.com/watch?v=fqMOX6JJhGo"
+    },
+    {
+        "title": "The Rust Programming Language Tutorial",
+        "description": "Learn systems programming with Rust",
+        "skills": "rust, systems programming, low-level, performance",
+        "duration": "3 hours",
+        "source": "freeCodeCamp YouTube",
+        "url": "https://www.youtube.com/watch?v=MsocPEZBd-M"
+    },
+    {
+        "title": "Object Oriented Programming in Python",
+        "description": "Master OOP concepts using Python",
+        "skills": "python, oop, object oriented programming, classes, inheritance",
+        "duration": "1.5 hours",
+        "source": "Programiz",
+        "url": "https://www.programiz.com/python-programming/object-oriented-programming"
+    },
+    {
+        "title": "Learn Node.js",
+        "description": "Comprehensive guide to server-side JavaScript with Node.js",
+        "skills": "nodejs, javascript, backend, server, express, api",
+        "duration": "Various",
+        "source": "MDN Web Docs",
+        "url": "https://developer.mozilla.org/en-US/docs/Learn/Server-side/Node_server_without_framework"
+    },
+    {
+        "title": "React Hooks Tutorial",
+        "description": "Modern React development using functional components and hooks",
+        "skills": "react, javascript, hooks, frontend, web development",
+        "duration": "Various",
+        "source": "React Docs",
+        "url": "https://reactjs.org/docs/hooks-intro.html"
+    },
+    {
+        "title": "Data Visualization with D3.js",
+        "description": "Learn to create interactive data visualizations for the web",
+        "skills": "d3js, data visualization, javascript, svg, web development",
+        "duration": "Various",
+        "source": "Observable",
+        "url": "https://observablehq.com/@d3/learn-d3"
+    },
+    {
+        "title": "Learn AWS Serverless",
+        "description": "Build serverless applications on AWS",
+        "skills": "aws, serverless, lambda, cloud computing, backend",
+        "duration": "Various",
+        "source": "AWS Workshops",
+        "url": "https://aws.amazon.com/getting-started/hands-on/build-serverless-web-app-lambda-apigateway-s3-dynamodb-cognito/"
+    },
+    {
+        "title": "Django Web Framework",
+        "description": "Build web applications quickly with Django",
+        "skills": "python, django, web development, backend, mvc, databases",
+        "duration": "Various",
+        "source": "Django Project",
+        "url": "https://docs.djangoproject.com/en/stable/intro/tutorial01/"
+    },
+    {
+        "title": "Flutter Mobile App Development",
+        "description": "Build cross-platform mobile apps with Flutter",
+        "skills": "flutter, dart, mobile development, ui design, cross-platform",
+        "duration": "Various",
+        "source": "Flutter Dev",
+        "url": "https://flutter.dev/docs/get-started/codelab"
+    },
+    {
+        "title": "CSS Grid and Flexbox",
+        "description": "Master modern CSS layout techniques",
+        "skills": "css, web development, frontend, responsive design, layout",
+        "duration": "Various",
+        "source": "CSS-Tricks",
+        "url": "https://css-tricks.com/snippets/css/complete-guide-grid/"
+    },
+    {
+        "title": "Kubernetes for Beginners",
+        "description": "Learn container orchestration with Kubernetes",
+        "skills": "kubernetes, docker, devops, orchestration, cloud computing",
+        "duration": "4 hours",
+        "source": "freeCodeCamp YouTube",
+        "url": "https://www.youtube.com/watch?v=d6WC5n9G_sM"
+    },
+    {
+        "title": "MongoDB Tutorial for Beginners",
+        "description": "Learn NoSQL database concepts with MongoDB",
+        "skills": "mongodb, nosql, database, json, backend",
+        "duration": "2 hours",
+        "source": "Programming with Mosh",
+        "url": "https://www.youtube.com/watch?v=pWbMrx5rVBE"
+    },
+    {
+        "title": "Linux Command Line Basics",
+        "description": "Master the Linux terminal and command line interface",
+        "skills": "linux, command line, bash, shell scripting, system administration",
+        "duration": "3 hours",
+        "source": "freeCodeCamp YouTube",
+        "url": "https://www.youtube.com/watch?v=ZtqBQ68cfJc"
+    },
+    {
+        "title": "Vue.js Complete Guide",
+        "description": "Learn Vue.js framework for building user interfaces",
+        "skills": "vuejs, javascript, frontend, web development, spa",
+        "duration": "8 hours",
+        "source": "Vue Mastery",
+        "url": "https://www.vuemastery.com/courses/intro-to-vue-3/intro-to-vue3"
+    },
+    {
+        "title": "Angular Tutorial for Beginners",
+        "description": "Complete guide to Angular framework",
+        "skills": "angular, typescript, javascript, frontend, web development",
+        "duration": "6 hours",
+        "source": "Programming with Mosh",
+        "url": "https://www.youtube.com/watch?v=k5E2AVpwsko"
+    }
+]
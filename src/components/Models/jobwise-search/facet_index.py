@@ -0,0 +1,192 @@
+from functools import reduce
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# A bitmap with fewer members than n_docs / SPARSE_RATIO is kept as a position array (4 bytes per
+# member) instead of packed bits (n_docs / 8 bytes), whichever is smaller
+SPARSE_RATIO = 32
+
+# Population count of every byte value, for NumPy versions without bitwise_count
+_BYTE_COUNTS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.int64)
+
+
+def _popcount(words):
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum(dtype=np.int64))
+    return int(_BYTE_COUNTS[words].sum())
+
+
+class Bitmap:
+    """Set of resource positions, compressed by picking the smaller of two layouts.
+
+    Sparse sets are a sorted uint32 array of positions and dense sets are
+    packed bits, as in the array and bitmap containers of Roaring bitmaps.
+    Set operations pick the cheapest kernel for the pair of layouts.
+    """
+
+    __slots__ = ("n", "positions", "words")
+
+    def __init__(self, n, positions=None, words=None):
+        self.n = n
+        self.positions = positions
+        self.words = words
+
+    @classmethod
+    def empty(cls, n):
+        return cls(n, positions=np.empty(0, dtype=np.uint32))
+
+    @classmethod
+    def from_positions(cls, n, positions):
+        positions = np.asarray(positions, dtype=np.uint32)
+        if len(positions) * SPARSE_RATIO < n:
+            return cls(n, positions=positions)
+        mask = np.zeros(n, dtype=bool)
+        mask[positions] = True
+        return cls(n, words=np.packbits(mask))
+
+    @classmethod
+    def from_mask(cls, mask):
+        return cls.from_positions(len(mask), np.flatnonzero(mask))
+
+    @classmethod
+    def _from_words(cls, n, words):
+        if _popcount(words) * SPARSE_RATIO < n:
+            return cls(n, positions=np.flatnonzero(np.unpackbits(words, count=n)).astype(np.uint32))
+        return cls(n, words=words)
+
+    @property
+    def sparse(self):
+        return self.positions is not None
+
+    @property
+    def nbytes(self):
+        return self.positions.nbytes if self.sparse else self.words.nbytes
+
+    def __len__(self):
+        return len(self.positions) if self.sparse else _popcount(self.words)
+
+    def _dense_words(self):
+        return self.words if not self.sparse else np.packbits(self.to_mask())
+
+    def contains(self, positions):
+        """Boolean array telling which of the positions are members"""
+        if self.sparse:
+            return np.isin(positions, self.positions, assume_unique=True)
+        return (self.words[positions >> 3] >> (7 - (positions & 7)).astype(np.uint8)) & 1 == 1
+
+    def __and__(self, other):
+        if self.sparse and other.sparse:
+            return Bitmap(self.n, positions=np.intersect1d(self.positions, other.positions, assume_unique=True))
+        if self.sparse or other.sparse:
+            sparse, dense = (self, other) if self.sparse else (other, self)
+            return Bitmap(self.n, positions=sparse.positions[dense.contains(sparse.positions)])
+        return Bitmap._from_words(self.n, self.words & other.words)
+
+    def __or__(self, other):
+        if self.sparse and other.sparse:
+            return Bitmap.from_positions(self.n, np.union1d(self.positions, other.positions))
+        return Bitmap(self.n, words=self._dense_words() | other._dense_words())
+
+    def __invert__(self):
+        words = ~self._dense_words()
+        if self.n % 8:
+            # Clear the padding bits past the last resource
+            words[-1] &= np.uint8(0xFF << (8 - self.n % 8) & 0xFF)
+        return Bitmap._from_words(self.n, words)
+
+    def to_mask(self):
+        """Boolean array over all resources"""
+        if self.sparse:
+            mask = np.zeros(self.n, dtype=bool)
+            mask[self.positions] = True
+            return mask
+        return np.unpackbits(self.words, count=self.n).view(bool)
+
+
+def check_expression(expression, facets):
+    """Raise ValueError unless the expression is well formed and only selects on the given facets"""
+    if not isinstance(expression, (list, tuple)) or not expression:
+        raise ValueError(f"Filter expression must be a non-empty list, not {expression!r}")
+    op, *args = expression
+    if op in ("and", "or"):
+        if not args:
+            raise ValueError(f"{op!r} needs at least one operand")
+        for arg in args:
+            check_expression(arg, facets)
+    elif op == "not":
+        if len(args) != 1:
+            raise ValueError("'not' takes exactly one operand")
+        check_expression(args[0], facets)
+    elif op in facets:
+        if len(args) != 1 or not isinstance(args[0], str):
+            raise ValueError(f"{op!r} takes exactly one value")
+    else:
+        raise ValueError(f"Unknown filter operator or facet: {op!r}")
+
+
+class FacetIndex:
+    """One compressed bitmap per facet value, built once when the catalog is loaded.
+
+    Filter expressions are nested sequences: ("source", "Coursera") selects
+    one facet value, and ("and", expr, ...), ("or", expr, ...) and
+    ("not", expr) combine them. Lists work as well as tuples, so expressions
+    can come straight from JSON.
+    """
+
+    def __init__(self, n_docs, bitmaps):
+        self.n_docs = n_docs
+        self.bitmaps = bitmaps    # facet -> value -> Bitmap, values in descending count order
+
+    @classmethod
+    def from_values(cls, n_docs, facet_values):
+        """Build from facet -> (doc positions, values) pairs; a resource may have several values"""
+        bitmaps = {}
+        for facet, (positions, values) in facet_values.items():
+            encoded = pa.array(values).dictionary_encode()
+            codes = pc.fill_null(encoded.indices, -1).to_numpy()
+            uniques = encoded.dictionary.to_pylist()
+            positions = np.asarray(positions)[codes >= 0]
+            codes = codes[codes >= 0]
+            order = np.lexsort((positions, codes))
+            positions, codes = positions[order], codes[order]
+
+            # Drop repeats of a value within one resource, then cut the sorted positions per value
+            keep = np.ones(len(codes), dtype=bool)
+            keep[1:] = (codes[1:] != codes[:-1]) | (positions[1:] != positions[:-1])
+            positions, codes = positions[keep], codes[keep]
+            groups = np.split(positions, np.cumsum(np.bincount(codes, minlength=len(uniques)))[:-1])
+            facet_bitmaps = {value: Bitmap.from_positions(n_docs, group) for value, group in zip(uniques, groups)}
+            bitmaps[facet] = dict(sorted(facet_bitmaps.items(), key=lambda item: -len(item[1])))
+        return cls(n_docs, bitmaps)
+
+    @property
+    def nbytes(self):
+        return sum(bitmap.nbytes for values in self.bitmaps.values() for bitmap in values.values())
+
+    def values(self, facet):
+        return list(self.bitmaps.get(facet, ()))
+
+    def evaluate(self, expression):
+        """Bitmap of the resources matching the expression"""
+        op, *args = expression
+        if op in ("and", "or") and not args:
+            raise ValueError(f"{op!r} needs at least one operand")
+        if op == "and":
+            # Intersect the smallest sets first so the running result stays small
+            return reduce(lambda a, b: a & b, sorted((self.evaluate(arg) for arg in args), key=len))
+        if op == "or":
+            return reduce(lambda a, b: a | b, (self.evaluate(arg) for arg in args), Bitmap.empty(self.n_docs))
+        if op == "not":
+            return ~self.evaluate(args[0])
+        if op not in self.bitmaps:
+            raise ValueError(f"Unknown filter operator or facet: {op!r}")
+        bitmap = self.bitmaps[op].get(args[0])
+        return bitmap if bitmap is not None else Bitmap.empty(self.n_docs)
+
+    def counts(self, facet, within=None):
+        """Resources per value of the facet, restricted to the bitmap within if given"""
+        if within is None:
+            return {value: len(bitmap) for value, bitmap in self.bitmaps.get(facet, {}).items()}
+        return {value: len(bitmap & within) for value, bitmap in self.bitmaps.get(facet, {}).items()}
@@ -0,0 +1,144 @@
+import re
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from facet_index import FacetIndex
+
+ALL_DURATIONS = "All Durations"
+
+# Facets a filter expression can select on, see ResourceFilters and record_matches
+FACETS = ["source", "duration", "skill"]
+
+# Duration buckets offered in the sidebar, as predicates on the duration in hours
+DURATION_BUCKETS = {
+    "Short (< 5 hours)": lambda hours: hours < 5,
+    "Medium (5-50 hours)": lambda hours: (hours >= 5) & (hours <= 50),
+    "Long (> 50 hours)": lambda hours: hours > 50,
+}
+
+_DURATION_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(hours?|hrs?|minutes?|mins?|days?|weeks?)\b')
+_HOURS_PER_UNIT = {"h": 1, "m": 1 / 60, "d": 8, "w": 40}
+
+
+def parse_duration_hours(duration):
+    """Convert free text such as '1.5 hours' or '45 minutes' to hours, or NaN if unknown"""
+    match = _DURATION_PATTERN.search(str(duration).lower())
+    if not match:
+        return np.nan
+    return float(match.group(1)) * _HOURS_PER_UNIT[match.group(2)[0]]
+
+
+def add_duration_hours(df):
+    """Add the numeric duration_hours column used by the duration filter"""
+    if 'duration_hours' not in df.columns:
+        df['duration_hours'] = np.array([parse_duration_hours(duration) for duration in df['duration']], dtype=np.float64)
+    return df
+
+
+class ResourceFilters:
+    """Compressed bitmaps over the catalog per source, duration bucket and skill tag.
+
+    Sidebar choices and any extra expression (see FacetIndex) are combined
+    and evaluated as bitmap operations; facet counts come from bitmap
+    cardinalities.
+    """
+
+    def __init__(self, df):
+        self.n_docs = len(df)
+        positions = np.arange(self.n_docs)
+
+        # Unknown durations (NaN) match no bucket, so they only show under "All Durations"
+        hours = np.asarray(df['duration_hours'], dtype=np.float64)
+        buckets = np.full(self.n_docs, None, dtype=object)
+        for label, predicate in DURATION_BUCKETS.items():
+            buckets[predicate(hours)] = label
+
+        # Comma-separated skill tags, split and cleaned in Arrow without a Python object per tag
+        tag_lists = pc.split_pattern(pc.utf8_lower(pa.array(np.asarray(df['skills'].astype(str)))), ",")
+        tags = pc.utf8_trim_whitespace(pc.list_flatten(tag_lists))
+        self.index = FacetIndex.from_values(self.n_docs, {
+            "source": (positions, np.asarray(df['source'].astype(str))),
+            "duration": (positions, buckets),
+            "skill": (pc.list_parent_indices(tag_lists).to_numpy(), pc.if_else(pc.equal(tags, ""), None, tags)),
+        })
+
+    @property
+    def sources(self):
+        return self.index.values("source")
+
+    @property
+    def skills(self):
+        """Skill tags, most common first"""
+        return self.index.values("skill")
+
+    def expression(self, sources=None, duration=ALL_DURATIONS, where=None):
+        """AND of the selections that restrict anything, or None when nothing is filtered"""
+        clauses = []
+
+        # Selecting every source is the same as not filtering by source
+        if sources and not set(self.sources) <= set(sources):
+            clauses.append(("or",) + tuple(("source", source) for source in sources))
+        if duration and duration != ALL_DURATIONS:
+            clauses.append(("duration", duration))
+        if where:
+            clauses.append(where)
+        return ("and",) + tuple(clauses) if clauses else None
+
+    def bitmap(self, sources=None, duration=ALL_DURATIONS, where=None):
+        expression = self.expression(sources, duration, where)
+        return None if expression is None else self.index.evaluate(expression)
+
+    def mask(self, sources=None, duration=ALL_DURATIONS, where=None):
+        """Boolean mask for the selections, or None when nothing is filtered"""
+        bitmap = self.bitmap(sources, duration, where)
+        return None if bitmap is None else bitmap.to_mask()
+
+    def counts(self, sources=None, duration=ALL_DURATIONS, where=None):
+        """Live facet counts: each facet's values counted under the other facets' selections"""
+        return {
+            "source": self.index.counts("source", self.bitmap(None, duration, where)),
+            "duration": self.index.counts("duration", self.bitmap(sources, ALL_DURATIONS, where)),
+            "skill": self.index.counts("skill", self.bitmap(sources, duration, where)),
+        }
+
+
+def record_matches(expression, record):
+    """Evaluate a FacetIndex expression against a single resource record"""
+    op, *args = expression
+    if op == "and":
+        return all(record_matches(arg, record) for arg in args)
+    if op == "or":
+        return any(record_matches(arg, record) for arg in args)
+    if op == "not":
+        return not record_matches(args[0], record)
+    if op == "source":
+        return record.get('source') == args[0]
+    if op == "duration":
+        hours = record.get('duration_hours')
+        bucket = DURATION_BUCKETS.get(args[0])
+        return bucket is not None and hours is not None and not np.isnan(hours) and bool(bucket(hours))
+    if op == "skill":
+        return args[0] in [tag.strip() for tag in str(record.get('skills', '')).lower().split(",")]
+    raise ValueError(f"Unknown filter operator or facet: {op!r}")
+
+
+def record_filter(sources=None, duration=ALL_DURATIONS, where=None):
+    """Predicate on a single resource record matching ResourceFilters.mask, or None"""
+    bucket = DURATION_BUCKETS.get(duration)
+    if not sources and bucket is None and not where:
+        return None
+    sources = set(sources or ())
+
+    def allowed(record):
+        if sources and record.get('source') not in sources:
+            return False
+        if where and not record_matches(where, record):
+            return False
+        if bucket is not None:
+            hours = record.get('duration_hours')
+            return hours is not None and not np.isnan(hours) and bool(bucket(hours))
+        return True
+
+    return allowed
@@ -0,0 +1,82 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.sparse import vstack
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+# Resources hashed per task when the build is spread over processes
+BUILD_CHUNK_SIZE = 20000
+
+
+def _hashing_vectorizer(n_features, signed, stop_words, ngram_range):
+    return HashingVectorizer(
+        n_features=n_features,
+        alternate_sign=signed,
+        norm=None,
+        stop_words=stop_words,
+        ngram_range=ngram_range,
+    )
+
+
+class HashedVectorizer:
+    """TF-IDF over a fixed number of hashed buckets instead of a fitted vocabulary.
+
+    Terms are hashed with a sign, so colliding terms tend to cancel rather
+    than add up. Nothing grows with the vocabulary: the only fitted state is
+    one IDF weight per bucket, and terms never seen in the catalog still land
+    in a bucket instead of being dropped.
+    """
+
+    def __init__(self, idf, stop_words="english", ngram_range=(1, 2)):
+        self.idf_ = idf
+        self.n_features = len(idf)
+        self.stop_words = stop_words
+        self.ngram_range = ngram_range
+        self._signed = _hashing_vectorizer(self.n_features, True, stop_words, ngram_range)
+        self._unsigned = _hashing_vectorizer(self.n_features, False, stop_words, ngram_range)
+        self._hasher = FeatureHasher(self.n_features, input_type="string", alternate_sign=True)
+
+    def count(self, texts):
+        """Unsigned term counts per bucket, for rankings such as BM25 that need counts"""
+        return self._unsigned.transform(texts)
+
+    def feature_columns(self, features):
+        """(columns, signs) that transform would hash the given n-grams to"""
+        hashed = self._hasher.transform([[feature] for feature in features]).tocsr()
+        return hashed.indices.tolist(), hashed.data.tolist()
+
+    def transform(self, texts):
+        matrix = self._signed.transform(texts).tocsr()
+        matrix.data *= self.idf_[matrix.indices]
+        return normalize(matrix).astype(np.float32)
+
+
+def _hash_chunk(texts, n_features, stop_words, ngram_range):
+    return _hashing_vectorizer(n_features, True, stop_words, ngram_range).transform(texts).tocsr()
+
+
+def fit_hashed_index(corpus, n_features=2 ** 18, stop_words="english", ngram_range=(1, 2), n_jobs=1):
+    """Hash the corpus into (HashedVectorizer, float32 tfidf_matrix).
+
+    Hashing needs no shared state, so with n_jobs > 1 chunks of the corpus
+    are hashed in separate processes and only the bucket document
+    frequencies are combined afterwards.
+    """
+    corpus = list(corpus)
+    chunks = [corpus[start:start + BUILD_CHUNK_SIZE] for start in range(0, len(corpus), BUILD_CHUNK_SIZE)]
+    args = (n_features, stop_words, ngram_range)
+    if n_jobs > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            parts = list(pool.map(_hash_chunk, chunks, *([arg] * len(chunks) for arg in args)))
+    else:
+        parts = [_hash_chunk(chunk, *args) for chunk in chunks]
+    counts = vstack(parts, format="csr") if parts else _hash_chunk([], *args)
+
+    # Same smoothed IDF as TfidfVectorizer, per bucket
+    doc_freq = np.bincount(counts.indices, minlength=n_features)
+    idf = (np.log((1 + counts.shape[0]) / (1 + doc_freq)) + 1).astype(np.float32)
+
+    counts.data *= idf[counts.indices]
+    return HashedVectorizer(idf, stop_words, ngram_range), normalize(counts).astype(np.float32)
@@ -0,0 +1,192 @@
+import re
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from catalog_store import build_vectorizer
+from compact_index import CompactVectorizer
+from hashed_index import HashedVectorizer
+from skill_matcher import get_skill_matcher
+
+
+def common_prefix_length(a, b):
+    """Length of the longest common prefix, found with a binary search of slice comparisons"""
+    low, high = 0, min(len(a), len(b))
+    if b.startswith(a[:high]):
+        return high
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def common_suffix_length(a, b, limit):
+    """Length of the longest common suffix, at most limit characters"""
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle:] == b[len(b) - middle:]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+class IncrementalQuery:
+    """Query vector and extracted skills of a job description that is being edited.
+
+    Each update diffs the new text against the previous one, re-tokenizes
+    only the changed span and adjusts the n-gram counts of the previous
+    vector, so the cost of a keystroke depends on the size of the edit and
+    not on the length of the description. The result equals
+    tfidf.transform([build_search_text(text, extract_skills(text))]).
+    """
+
+    def __init__(self, tfidf, matcher=None):
+        self.tfidf = tfidf
+        self.matcher = matcher or get_skill_matcher()
+        params = build_vectorizer()
+        self._token_pattern = re.compile(params.token_pattern)
+        self._stop_words = params.get_stop_words() or frozenset()
+        self._min_n, self._max_n = params.ngram_range
+        self._max_skill_length = max(len(skill) for skill in self.matcher.skills)
+        self._idf = np.asarray(tfidf.idf_, dtype=np.float64)
+        self._dtype = tfidf.transform([""]).dtype
+        self._columns = {}  # feature -> (column, sign), -1 for features outside the index
+        self.reset()
+
+    def reset(self):
+        self.text = ""
+        self.skills = []
+        self._occurrences = []  # (start, end, skill_index) of every skill match
+        self._tokens = []       # description tokens left after stop word removal
+        self._starts = np.empty(0, dtype=np.intp)
+        self._ends = np.empty(0, dtype=np.intp)
+        self._counts = {}       # column -> summed signed count of the description's features
+        self._skill_tokens = []
+        self._skill_counts = {}
+
+    def update(self, job_description):
+        """Return (query_vector, extracted_skills) for the edited description"""
+        text = job_description.lower()
+        if text != self.text:
+            prefix = common_prefix_length(self.text, text)
+            suffix = common_suffix_length(self.text, text, min(len(self.text), len(text)) - prefix)
+            old_end = len(self.text) - suffix
+            new_end = len(text) - suffix
+            self._update_skills(text, prefix, old_end, new_end)
+            self._update_tokens(text, prefix, old_end, new_end)
+            self.text = text
+        return self._query_vector(), list(self.skills)
+
+    def _update_skills(self, text, prefix, old_end, new_end):
+        # Matches far enough from the edit keep their boundaries; only the span around it is rescanned
+        shift = new_end - old_end
+        window_start = max(0, prefix - self._max_skill_length)
+        kept_before = [match for match in self._occurrences if match[0] < window_start]
+        kept_after = [(start + shift, end + shift, skill_index)
+                      for start, end, skill_index in self._occurrences if start > old_end]
+
+        scan_start = max(0, window_start - 1)
+        scan_end = min(len(text), new_end + self._max_skill_length + 2)
+        found = [
+            (scan_start + start, scan_start + end, skill_index)
+            for skill_index, start, end in self.matcher.finditer(text[scan_start:scan_end])
+            if window_start <= scan_start + start <= new_end
+        ]
+        self._occurrences = kept_before + sorted(found) + kept_after
+
+        skills = [self.matcher.skills[index] for index in sorted({match[2] for match in self._occurrences})]
+        if skills != self.skills:
+            self.skills = skills
+            self._skill_tokens = self._tokenize(" ".join(skills))[0]
+            self._skill_counts = self._count(self._skill_tokens, 0, 0)
+
+    def _update_tokens(self, text, prefix, old_end, new_end):
+        # Tokens ending before the edit and starting after it are separated from it by unchanged characters
+        left = int(np.searchsorted(self._ends, prefix, side="left"))
+        right = int(np.searchsorted(self._starts, old_end, side="right"))
+        shift = new_end - old_end
+        span_start = int(self._ends[left - 1]) if left else 0
+        span_end = int(self._starts[right]) + shift if right < len(self._tokens) else len(text)
+        tokens, starts, ends = self._tokenize(text, span_start, span_end)
+
+        # Only n-grams that touch the changed tokens, with n - 1 tokens of context on each side, can change
+        context = self._max_n - 1
+        before = self._tokens[max(0, left - context):left]
+        after = self._tokens[right:right + context]
+        self._add(self._counts, self._count(before + self._tokens[left:right] + after, len(before), len(after)), -1)
+        self._add(self._counts, self._count(before + tokens + after, len(before), len(after)), 1)
+
+        self._tokens = self._tokens[:left] + tokens + self._tokens[right:]
+        self._starts = np.concatenate([self._starts[:left], starts, self._starts[right:] + shift])
+        self._ends = np.concatenate([self._ends[:left], ends, self._ends[right:] + shift])
+
+    def _tokenize(self, text, start=0, end=None):
+        tokens, starts, ends = [], [], []
+        for match in self._token_pattern.finditer(text, start, len(text) if end is None else end):
+            if match.group() not in self._stop_words:
+                tokens.append(match.group())
+                starts.append(match.start())
+                ends.append(match.end())
+        return tokens, np.asarray(starts, dtype=np.intp), np.asarray(ends, dtype=np.intp)
+
+    def _count(self, window, context_before, context_after):
+        """Column counts of the window's n-grams that are not wholly inside either context"""
+        features = []
+        for n in range(self._min_n, self._max_n + 1):
+            for start in range(len(window) - n + 1):
+                if start + n > context_before and start < len(window) - context_after:
+                    features.append(" ".join(window[start:start + n]))
+
+        unknown = [feature for feature in set(features) if feature not in self._columns]
+        if unknown:
+            self._columns.update(zip(unknown, zip(*self._feature_columns(unknown))))
+        counts = {}
+        for feature in features:
+            column, sign = self._columns[feature]
+            if column >= 0:
+                counts[column] = counts.get(column, 0) + sign
+        return counts
+
+    def _feature_columns(self, features):
+        if isinstance(self.tfidf, HashedVectorizer):
+            return self.tfidf.feature_columns(features)
+        if isinstance(self.tfidf, CompactVectorizer):
+            columns = self.tfidf.vocabulary.lookup(features).tolist()
+        else:
+            columns = [self.tfidf.vocabulary_.get(feature, -1) for feature in features]
+        return columns, [1] * len(features)
+
+    @staticmethod
+    def _add(counts, delta, sign):
+        for column, count in delta.items():
+            total = counts.get(column, 0) + sign * count
+            if total:
+                counts[column] = total
+            else:
+                counts.pop(column, None)
+
+    def _query_vector(self):
+        counts = dict(self._counts)
+        self._add(counts, self._skill_counts, 1)
+
+        # N-grams spanning the end of the description and the start of the skill list
+        context = self._max_n - 1
+        if context and self._tokens and self._skill_tokens:
+            before = self._tokens[-context:]
+            after = self._skill_tokens[:context]
+            self._add(counts, self._count(before + after, len(before), len(after)), 1)
+
+        columns = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+        order = np.argsort(columns)
+        columns = columns[order]
+        weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))[order] * self._idf[columns]
+        norm = np.sqrt(weights @ weights)
+        if norm:
+            weights /= norm
+        indptr = np.array([0, len(columns)], dtype=np.int32)
+        return csr_matrix((weights.astype(self._dtype), columns, indptr), shape=(1, len(self._idf)), copy=False)
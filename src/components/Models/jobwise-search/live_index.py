@@ -0,0 +1,426 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from catalog_store import build_corpus
+from filters import add_duration_hours
+from retrieval import rank_top_k
+
+# JSON Lines change log followed by the app when set
+CHANGE_LOG_PATH = os.environ.get("JOBWISE_CHANGE_LOG")
+
+
+def _gather(starts, lengths):
+    """Flat positions of the postings that start at starts and have the given lengths"""
+    total = int(lengths.sum())
+    return np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+
+
+class _Segment:
+    """Immutable postings for the resources indexed at the last compaction, by term and by resource"""
+
+    def __init__(self, terms, indptr, slots, counts, row_indptr, row_terms, row_counts):
+        self.terms = terms              # sorted hashed feature ids that have postings
+        self.indptr = indptr            # postings of terms[i] are slots/counts[indptr[i]:indptr[i + 1]]
+        self.slots = slots
+        self.counts = counts
+        self.row_indptr = row_indptr    # terms of slot s are row_terms/row_counts[row_indptr[s]:row_indptr[s + 1]]
+        self.row_terms = row_terms
+        self.row_counts = row_counts
+
+    @classmethod
+    def empty(cls):
+        return cls.from_rows(np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+
+    @classmethod
+    def from_rows(cls, row_indptr, row_terms, row_counts):
+        """Build a segment from the rows of slots 0..n-1, laid out like a CSR matrix"""
+        slots = np.repeat(np.arange(len(row_indptr) - 1, dtype=np.int64), np.diff(row_indptr))
+        # Stable, so the postings of each term stay in slot order
+        order = np.argsort(row_terms, kind="stable")
+        terms = row_terms[order]
+        unique_terms, starts = np.unique(terms, return_index=True)
+        indptr = np.append(starts, len(terms)).astype(np.int64)
+        return cls(unique_terms, indptr, slots[order], row_counts[order], row_indptr, row_terms, row_counts)
+
+    @property
+    def n_rows(self):
+        return len(self.row_indptr) - 1
+
+    def postings(self, query_terms):
+        """(slots, counts, position of the query term) for every posting of the query terms"""
+        if not len(self.terms):
+            return self.slots, self.counts, np.empty(0, dtype=np.int64)
+        found = np.minimum(np.searchsorted(self.terms, query_terms), len(self.terms) - 1)
+        present = self.terms[found] == query_terms
+        term_positions = np.flatnonzero(present)
+        starts = self.indptr[found[present]]
+        lengths = self.indptr[found[present] + 1] - starts
+        offsets = _gather(starts, lengths)
+        return self.slots[offsets], self.counts[offsets], np.repeat(term_positions, lengths)
+
+    def rows(self, slots):
+        """(terms, counts, position of the slot) for every term of the given slots"""
+        starts = self.row_indptr[slots]
+        lengths = self.row_indptr[slots + 1] - starts
+        offsets = _gather(starts, lengths)
+        return self.row_terms[offsets], self.row_counts[offsets], np.repeat(np.arange(len(slots)), lengths)
+
+
+def _norm_sums(row_slots, counts, log_doc_freq, size):
+    """Per slot sums of count^2, count^2 * L and count^2 * L^2, with L = log(1 + document frequency)"""
+    squares = counts * counts
+    return np.stack([
+        np.bincount(row_slots, weights=squares, minlength=size),
+        np.bincount(row_slots, weights=squares * log_doc_freq, minlength=size),
+        np.bincount(row_slots, weights=squares * log_doc_freq * log_doc_freq, minlength=size),
+    ], axis=1)
+
+
+class _Slots:
+    """Everything queries address by slot, replaced as one reference when compaction renumbers the slots"""
+
+    def __init__(self, records, ids, live, sums, base):
+        self.records = records  # slot -> resource record
+        self.ids = ids          # slot -> resource id
+        self.live = live        # slot -> not deleted
+        self.sums = sums        # slot -> _norm_sums of its row, from which its norm under the current IDF follows
+        self.base = base        # postings at the last compaction
+        self.delta = {}         # postings added since, {term: ([slots], [counts])}
+        self.delta_rows = {}    # terms of the slots added since, {slot: (terms, counts)}
+
+    def row(self, slot):
+        """(terms, counts) of one slot"""
+        if slot < self.base.n_rows:
+            start, end = self.base.row_indptr[slot], self.base.row_indptr[slot + 1]
+            return self.base.row_terms[start:end], self.base.row_counts[start:end]
+        return self.delta_rows[slot]
+
+    def postings(self, terms):
+        """(slots, counts, position of the term) for every posting of the terms, in the base and the delta"""
+        slots, counts, positions = self.base.postings(terms)
+        slot_parts, count_parts, position_parts = [slots], [counts], [positions]
+        for position, term in enumerate(terms.tolist()):
+            postings = self.delta.get(term)
+            if postings:
+                # Read counts first: writers append slots last, so the lengths always line up
+                term_counts = postings[1][:]
+                term_slots = postings[0][:len(term_counts)]
+                slot_parts.append(np.asarray(term_slots, dtype=np.int64))
+                count_parts.append(np.asarray(term_counts[:len(term_slots)], dtype=np.float64))
+                position_parts.append(np.full(len(term_slots), position))
+        return np.concatenate(slot_parts), np.concatenate(count_parts), np.concatenate(position_parts)
+
+    def add(self, record, resource_id, terms, counts):
+        """Append a resource to the delta under a new slot, not yet live; returns the slot"""
+        slot = len(self.records)
+        self.records.append(record)
+        self.ids.append(resource_id)
+        self.delta_rows[slot] = (terms, counts)
+        for term, count in zip(terms.tolist(), counts.tolist()):
+            slots, term_counts = self.delta.setdefault(term, ([], []))
+            term_counts.append(count)
+            slots.append(slot)
+        return slot
+
+    def grow(self, size):
+        if size > len(self.live):
+            capacity = max(size, 2 * len(self.live), 1024)
+            live = np.zeros(capacity, dtype=bool)
+            live[:len(self.live)] = self.live
+            sums = np.zeros((capacity, 3), dtype=np.float64)
+            sums[:len(self.sums)] = self.sums
+            # Sums first: a reader that sees the new live array must see its sums too
+            self.sums = sums
+            self.live = live
+
+
+class LiveIndex:
+    """Hashed TF-IDF index that takes inserts, updates and deletes while serving queries.
+
+    Features are hashed into a fixed space, so new text never needs a refit.
+    Document frequencies are kept current as resources change and IDF
+    weights are derived from them at query time. Resource norms follow the
+    same IDF: each resource keeps sums over its terms from which its norm
+    under any number of resources is one expression, and a write updates
+    the sums of the resources sharing a term with it. Scores therefore equal
+    those of an index freshly built from the live resources.
+
+    New resources go into a small in-memory delta, deleted ones are
+    tombstoned, and an upsert of an indexed id is a delete followed by an
+    add. compact() folds delta and tombstones into a fresh immutable
+    segment, renumbering the live resources densely so memory follows the
+    catalog rather than the number of writes; the segment is built outside
+    the write lock and swapped in together with the writes made meanwhile.
+    Queries never take the write lock.
+    """
+
+    def __init__(self, n_features=2 ** 20, compact_threshold=10000):
+        self._vectorizer = HashingVectorizer(
+            stop_words='english',
+            ngram_range=(1, 2),
+            n_features=n_features,
+            alternate_sign=False,
+            norm=None,
+        )
+        self.compact_threshold = compact_threshold
+        self._write_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._doc_freq = np.zeros(n_features, dtype=np.int64)
+        self._n_live = 0
+        self._slot_by_id = {}
+        self._slots = _Slots([], [], np.zeros(0, dtype=bool), np.zeros((0, 3), dtype=np.float64), _Segment.empty())
+        self._delta_size = 0
+        self.version = 0
+
+    @classmethod
+    def from_frame(cls, df, id_column='url', **kwargs):
+        """Seed a live index with every resource of a catalog DataFrame in one bulk pass.
+
+        A repeated id keeps its last row, as if the rows had been upserted in order.
+        """
+        index = cls(**kwargs)
+        df = add_duration_hours(df.drop_duplicates(subset=id_column, keep="last").reset_index(drop=True))
+        matrix = index._vectorizer.transform(build_corpus(df)).tocsr()
+        matrix.sort_indices()
+
+        records = df.to_dict(orient="records")
+        ids = [record[id_column] for record in records]
+        base = _Segment.from_rows(matrix.indptr.astype(np.int64), matrix.indices.astype(np.int64),
+                                  matrix.data.astype(np.float64))
+        index._doc_freq += np.bincount(matrix.indices, minlength=len(index._doc_freq))
+        index._n_live = len(records)
+
+        capacity = max(len(records), 1024)
+        live = np.zeros(capacity, dtype=bool)
+        live[:len(records)] = True
+        row_slots = np.repeat(np.arange(len(records)), np.diff(base.row_indptr))
+        sums = _norm_sums(row_slots, base.row_counts, np.log1p(index._doc_freq[base.row_terms]), capacity)
+        index._slots = _Slots(records, ids, live, sums, base)
+        index._slot_by_id = {resource_id: slot for slot, resource_id in enumerate(ids)}
+        return index
+
+    def __len__(self):
+        return self._n_live
+
+    def _idf(self, terms):
+        # Same smoothed IDF as TfidfVectorizer, from the current document frequencies
+        return np.log((1 + self._n_live) / (1 + self._doc_freq[terms])) + 1
+
+    def _norms(self, sums):
+        # |row|^2 = sum of count^2 * (log(1 + n) + 1 - L)^2, expanded over the stored sums
+        scale = np.log1p(self._n_live) + 1
+        squares = scale * scale * sums[:, 0] - 2 * scale * sums[:, 1] + sums[:, 2]
+        norms = np.sqrt(np.maximum(squares, 0))
+        norms[norms == 0] = 1.0
+        return norms
+
+    def _vectorize(self, text):
+        row = self._vectorizer.transform([text])
+        return row.indices.astype(np.int64), row.data.astype(np.float64)
+
+    def _change_doc_freq(self, terms, change):
+        """Add change to the document frequency of terms and to the sums of every resource containing them"""
+        current = self._slots
+        before = np.log1p(self._doc_freq[terms])
+        self._doc_freq[terms] += change
+        after = np.log1p(self._doc_freq[terms])
+        slots, counts, positions = current.postings(terms)
+        squares = counts * counts
+        np.add.at(current.sums[:, 1], slots, squares * (after - before)[positions])
+        np.add.at(current.sums[:, 2], slots, squares * (after * after - before * before)[positions])
+
+    def upsert(self, resource_id, resource):
+        """Add a resource, or replace the one with the same id; visible to the next query"""
+        record = add_duration_hours(pd.DataFrame([resource])).to_dict(orient="records")[0]
+        terms, counts = self._vectorize(build_corpus(pd.DataFrame([record])).iloc[0])
+
+        with self._write_lock:
+            self._delete_locked(resource_id)
+            self._change_doc_freq(terms, 1)
+            self._n_live += 1
+
+            # Slots are not reused before a compaction, since in-flight queries may still read the old one
+            current = self._slots
+            slot = current.add(record, resource_id, terms, counts)
+            current.grow(slot + 1)
+            current.sums[slot] = _norm_sums(np.zeros(len(terms), dtype=np.int64), counts,
+                                            np.log1p(self._doc_freq[terms]), 1)[0]
+            self._delta_size += len(terms)
+
+            self._slot_by_id[resource_id] = slot
+            current.live[slot] = True
+            self.version += 1
+            compact = self._delta_size >= self.compact_threshold
+
+        if compact:
+            self._compact(blocking=False)
+
+    def delete(self, resource_id):
+        """Remove a resource; returns False if it was not indexed"""
+        with self._write_lock:
+            deleted = self._delete_locked(resource_id)
+            if deleted:
+                self.version += 1
+            return deleted
+
+    def _delete_locked(self, resource_id):
+        slot = self._slot_by_id.pop(resource_id, None)
+        if slot is None:
+            return False
+        # Tombstone now; the postings and the slot are dropped at the next compaction
+        current = self._slots
+        current.live[slot] = False
+        terms, _ = current.row(slot)
+        self._change_doc_freq(terms, -1)
+        self._n_live -= 1
+        return True
+
+    def compact(self):
+        """Fold the delta and tombstones into a new base segment, renumbering the live resources"""
+        self._compact()
+
+    def _compact(self, blocking=True):
+        if not self._compact_lock.acquire(blocking=blocking):
+            return  # A compaction already running folds these writes in
+        try:
+            # Writes after this point only append slots, clear live flags and adjust sums, all replayed below
+            with self._write_lock:
+                current = self._slots
+                n_slots = len(current.records)
+                kept = np.flatnonzero(current.live[:n_slots])
+
+            # Renumber the live resources 0..n-1 in slot order without holding up writers
+            base_kept = kept[kept < current.base.n_rows]
+            terms, counts, positions = current.base.rows(base_kept)
+            delta_rows = [current.delta_rows[slot] for slot in kept[len(base_kept):].tolist()]
+            lengths = np.concatenate([
+                np.bincount(positions, minlength=len(base_kept)),
+                np.array([len(row_terms) for row_terms, _ in delta_rows], dtype=np.int64),
+            ])
+            base = _Segment.from_rows(
+                np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+                np.concatenate([terms] + [row_terms for row_terms, _ in delta_rows]).astype(np.int64),
+                np.concatenate([counts] + [row_counts for _, row_counts in delta_rows]).astype(np.float64),
+            )
+            records = [current.records[slot] for slot in kept.tolist()]
+            ids = [current.ids[slot] for slot in kept.tolist()]
+            slot_by_id = {resource_id: slot for slot, resource_id in enumerate(ids)}
+
+            with self._write_lock:
+                # Resources deleted since the snapshot stay as tombstones until the next compaction
+                n_kept = len(kept)
+                capacity = max(n_kept, 1024)
+                live = np.zeros(capacity, dtype=bool)
+                live[:n_kept] = current.live[kept]
+                sums = np.zeros((capacity, 3), dtype=np.float64)
+                sums[:n_kept] = current.sums[kept]
+                for slot in np.flatnonzero(~live[:n_kept]).tolist():
+                    slot_by_id.pop(ids[slot], None)
+                state = _Slots(records, ids, live, sums, base)
+
+                # Resources added since the snapshot go into the new delta
+                delta_size = 0
+                for slot in range(n_slots, len(current.records)):
+                    if current.live[slot]:
+                        terms, counts = current.delta_rows[slot]
+                        new_slot = state.add(current.records[slot], current.ids[slot], terms, counts)
+                        state.grow(new_slot + 1)
+                        state.sums[new_slot] = current.sums[slot]
+                        state.live[new_slot] = True
+                        slot_by_id[current.ids[slot]] = new_slot
+                        delta_size += len(terms)
+
+                self._slots = state
+                self._slot_by_id = slot_by_id
+                self._delta_size = delta_size
+        finally:
+            self._compact_lock.release()
+
+    def top_k(self, text, k, allowed=None):
+        """Return (slots, scores) of the k resources most similar to text, best first.
+
+        allowed, if given, is a predicate on resource records applied before ranking.
+        """
+        return self._top_k(text, k, allowed, self._slots)
+
+    def _top_k(self, text, k, allowed, slots_state):
+        records = slots_state.records
+        live = slots_state.live
+
+        query_terms, query_counts = self._vectorize(text)
+        if not len(query_terms):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        idf = self._idf(query_terms)
+        query_weights = query_counts * idf
+        query_weights /= np.sqrt(query_weights @ query_weights)
+
+        slots, counts, positions = slots_state.postings(query_terms)
+        contributions = counts * (idf * query_weights)[positions]
+
+        # Skip tombstones and slots added after this query took its snapshot
+        visible = slots < len(live)
+        slots, contributions = slots[visible], contributions[visible]
+        visible = live[slots]
+        slots, contributions = slots[visible], contributions[visible]
+
+        candidates, inverse = np.unique(slots, return_inverse=True)
+        scores = np.bincount(inverse, weights=contributions) / self._norms(slots_state.sums[candidates])
+
+        if allowed is not None:
+            keep = np.array([allowed(records[slot]) for slot in candidates.tolist()], dtype=bool)
+            candidates, scores = candidates[keep], scores[keep]
+
+        return rank_top_k(candidates, scores, k)
+
+    def search(self, text, k, allowed=None):
+        """Return (records DataFrame, scores) of the k best matches, best first"""
+        # Slots are only meaningful within one numbering, so rank and look up records in the same one
+        slots_state = self._slots
+        slots, scores = self._top_k(text, k, allowed, slots_state)
+        return pd.DataFrame([slots_state.records[slot] for slot in slots.tolist()]), scores
+
+
+def follow_changes(live_index, path, poll_interval=1.0, stop_event=None):
+    """Apply a JSON Lines change log to the index as it grows.
+
+    Each line is {"op": "upsert", "id": ..., "resource": {...}} or
+    {"op": "delete", "id": ...}. Runs until stop_event is set.
+    """
+    stop_event = stop_event or threading.Event()
+    position = 0
+    while not stop_event.is_set():
+        try:
+            with open(path) as f:
+                f.seek(position)
+                for line in iter(f.readline, ""):
+                    if not line.endswith("\n"):
+                        break  # Partially written line, read it again next time
+                    position = f.tell()
+                    if not line.strip():
+                        continue
+                    change = json.loads(line)
+                    if change["op"] == "upsert":
+                        live_index.upsert(change["id"], change["resource"])
+                    elif change["op"] == "delete":
+                        live_index.delete(change["id"])
+        except FileNotFoundError:
+            pass
+        stop_event.wait(poll_interval)
+
+
+def start_following(live_index, path, poll_interval=1.0):
+    """Follow a change log on a daemon thread; returns the event that stops it"""
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=follow_changes,
+        args=(live_index, path, poll_interval, stop_event),
+        name="live-index-follower",
+        daemon=True,
+    )
+    thread.start()
+    return stop_event
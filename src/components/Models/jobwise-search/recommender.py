@@ -0,0 +1,336 @@
+import numpy as np
+from scipy.sparse import csr_matrix, diags
+from sklearn.preprocessing import normalize
+
+from catalog_store import (
+    CATALOG_PATH, INDEX_DIR, build_engine, fit_index, load_engine, load_index, load_resource_frame, read_catalog_version
+)
+from filters import ALL_DURATIONS, DURATION_BUCKETS, ResourceFilters, record_filter
+from incremental_search import IncrementalQuery
+from live_index import CHANGE_LOG_PATH, LiveIndex, start_following
+from result_cache import normalize_description
+from retrieval import CosineEngine, InvertedIndexEngine, pad_with_zero_scores
+from semantic import SEARCH_MODES, load_semantic_engine
+from sharded_index import SHARDS, ShardedEngine
+from skill_graph import SkillGraph, load_skill_graph
+from skill_matcher import get_skill_matcher
+
+# Function to extract skills from job description
+def extract_skills(job_description):
+    # Single pass over the text with the precompiled skill automaton
+    return [match.skill for match in extract_skill_matches(job_description)]
+
+# Function to extract skills together with where they occur in the description
+def extract_skill_matches(job_description):
+    return get_skill_matcher().match(job_description)
+
+# Function to build the text that is vectorized for a job description
+def build_search_text(job_description, extracted_skills):
+    # Combine skills with job description for better matching
+    return job_description.lower() + " " + " ".join(extracted_skills)
+
+# Function to turn ranked resource indices into the results table
+def select_results(df, top_indices, top_scores):
+    # Filter out results with very low similarity (threshold = 0.1)
+    keep = top_scores > 0.1
+    
+    if not keep.any():
+        # If no resources meet the threshold, return top 3 anyway
+        keep[:3] = True
+    
+    # Get the matching resources
+    results = df.iloc[top_indices[keep]].copy()
+    results['score'] = top_scores[keep] * 100
+    
+    return results
+
+# Function to search for relevant resources using cosine similarity
+def search_resources(job_description, tfidf, tfidf_matrix, df, k=10, engine=None, mask=None,
+                     mode="lexical", semantic=None, alpha=0.5):
+    # Extract key skills
+    extracted_skills = extract_skills(job_description)
+    search_text = build_search_text(job_description, extracted_skills)
+    
+    # Semantic search ranks by embeddings alone and never needs the TF-IDF vector
+    if mode == "semantic":
+        top_indices, top_scores = semantic.top_k(search_text, k, mask)
+        return select_results(df, top_indices, top_scores), extracted_skills
+    
+    # Transform search text using the same TF-IDF vectorizer
+    search_vector = tfidf.transform([search_text])
+    
+    # Rank resources by cosine similarity, brute force unless an index is given
+    if engine is None:
+        engine = CosineEngine(tfidf_matrix)
+    
+    if mode == "hybrid":
+        top_indices, top_scores = semantic.hybrid_top_k(search_text, search_vector, engine, k, mask, alpha)
+    else:
+        top_indices, top_scores = engine.top_k(search_vector, k, mask)
+    
+    return select_results(df, top_indices, top_scores), extracted_skills
+
+# Function to search a live index that is updated while it serves queries
+def search_live_resources(job_description, live_index, k=10, allowed=None):
+    # Extract key skills
+    extracted_skills = extract_skills(job_description)
+    
+    # The live index hashes the text itself, so there is no fitted vectorizer
+    records, top_scores = live_index.search(build_search_text(job_description, extracted_skills), k, allowed)
+    
+    return select_results(records, np.arange(len(records)), top_scores), extracted_skills
+
+# Function to search for many job descriptions at once
+def search_resources_batch(job_descriptions, tfidf, tfidf_matrix, df, k=10, engine=None, mask=None, chunk_size=512):
+    """Yield (results, extracted_skills) per job description, like search_resources.
+
+    Descriptions are consumed lazily and scored chunk_size at a time with one
+    sparse matrix product, so memory stays bounded for feeds of any size.
+    """
+    n_docs = tfidf_matrix.shape[0]
+    k = min(k, n_docs)
+    
+    # The batch product runs in this process, over the full postings the shards were cut from
+    if isinstance(engine, ShardedEngine):
+        engine = engine.engine
+    
+    # Term-by-resource matrix of the engine's weights, shared by every chunk
+    if isinstance(engine, InvertedIndexEngine):
+        postings = csr_matrix(
+            (engine.postings_weights, engine.postings_doc_ids, engine.postings_indptr),
+            shape=(len(engine.postings_indptr) - 1, n_docs),
+            copy=False,
+        )
+        if engine.doc_scales is not None:
+            # Fold the per-resource scales of quantized postings back in once for the whole feed
+            postings = postings @ diags(engine.doc_scales)
+        prepare_queries = engine.prepare_queries
+    else:
+        postings = normalize(tfidf_matrix).T.tocsr()
+        prepare_queries = normalize
+    
+    # Zero the columns of filtered-out resources so they never reach the top k
+    if mask is not None:
+        postings = postings @ diags(mask.astype(postings.dtype))
+        postings.eliminate_zeros()
+    
+    chunk = []
+    for job_description in job_descriptions:
+        chunk.append(job_description)
+        if len(chunk) == chunk_size:
+            yield from _search_chunk(chunk, tfidf, prepare_queries, postings, df, k, mask)
+            chunk = []
+    if chunk:
+        yield from _search_chunk(chunk, tfidf, prepare_queries, postings, df, k, mask)
+
+def _search_chunk(job_descriptions, tfidf, prepare_queries, postings, df, k, mask):
+    """Score one chunk of job descriptions against every resource"""
+    skills_per_job = [extract_skills(job_description) for job_description in job_descriptions]
+    search_texts = [
+        build_search_text(job_description, extracted_skills)
+        for job_description, extracted_skills in zip(job_descriptions, skills_per_job)
+    ]
+    
+    # One sparse product scores the whole chunk, touching only shared terms
+    similarities = (prepare_queries(tfidf.transform(search_texts)) @ postings).tocsr()
+    
+    for (top_indices, top_scores), extracted_skills in zip(_top_k_per_row(similarities, k), skills_per_job):
+        top_indices, top_scores = pad_with_zero_scores(top_indices, top_scores, k, postings.shape[1], mask)
+        yield select_results(df, top_indices, top_scores), extracted_skills
+
+def _top_k_per_row(similarities, k):
+    """Best k (indices, scores) of every row of a sparse score matrix, best first"""
+    indptr = similarities.indptr
+    row_lengths = np.diff(indptr)
+    rows = np.repeat(np.arange(similarities.shape[0]), row_lengths)
+    
+    # Sort all entries by row, then score descending, then resource position
+    order = np.lexsort((similarities.indices, -similarities.data, rows))
+    rank_in_row = np.arange(len(order)) - indptr[rows[order]]
+    selected = order[rank_in_row < k]
+    
+    splits = np.cumsum(np.minimum(row_lengths, k))[:-1]
+    return zip(
+        np.split(similarities.indices[selected].astype(np.intp), splits),
+        np.split(similarities.data[selected], splits),
+    )
+
+# Function to get personalized learning path
+def get_learning_path(extracted_skills, skill_graph, budget_hours=None, known_skills=()):
+    """Plan concrete resources, in prerequisite order, for the extracted skills.
+
+    Runs against the graph precomputed from the catalog; budget_hours caps the
+    total study time and known_skills are left out of the plan.
+    """
+    return skill_graph.plan(extracted_skills, budget_hours=budget_hours, known_skills=known_skills)
+
+class Recommender:
+    """Everything needed to serve recommendations, loaded once and shared by callers.
+
+    The Streamlit page and the HTTP service both go through this object, so
+    they rank, filter and build learning paths the same way.
+    """
+
+    def __init__(self, df, tfidf, tfidf_matrix, engine, filters, live_index=None, semantic=None,
+                 cache=None, catalog_version=None, skill_graph=None):
+        self.df = df
+        self.tfidf = tfidf
+        self.tfidf_matrix = tfidf_matrix
+        self.engine = engine
+        self.filters = filters
+        self.live_index = live_index
+        self.semantic = semantic
+        self.cache = cache
+        self.catalog_version = catalog_version or read_catalog_version(CATALOG_PATH)
+        self.skill_graph = skill_graph or SkillGraph.build(df)
+
+    @classmethod
+    def load(cls, catalog_path=CATALOG_PATH, index_dir=INDEX_DIR, follow_changes=True, cache=None):
+        """Load the persisted catalog and indexes, fitting the TF-IDF model only if none is built"""
+        df = load_resource_frame(catalog_path)
+        index = load_index(index_dir, catalog_path)
+        tfidf, tfidf_matrix = fit_index(df) if index is None else index
+        engine = load_engine(index_dir, catalog_path) or build_engine(df, tfidf, tfidf_matrix)
+        if SHARDS > 1:
+            # Shards keep the configured ranking and storage of the engine they split
+            engine = ShardedEngine(engine, SHARDS)
+
+        live_index = None
+        if follow_changes and CHANGE_LOG_PATH:
+            live_index = LiveIndex.from_frame(df)
+            start_following(live_index, CHANGE_LOG_PATH)
+
+        return cls(df, tfidf, tfidf_matrix, engine, ResourceFilters(df), live_index, load_semantic_engine(),
+                   cache=cache, catalog_version=read_catalog_version(catalog_path),
+                   skill_graph=load_skill_graph(catalog_path=catalog_path))
+
+    @classmethod
+    def from_shared_index(cls, shared, follow_changes=True, cache=None):
+        """Serve the catalog and term index published in shared memory, see shared_index.py.
+
+        Only those are shared; filters, the live index and the skill graph are built by this process.
+        """
+        df = shared.df
+        live_index = None
+        if follow_changes and CHANGE_LOG_PATH:
+            live_index = LiveIndex.from_frame(df)
+            start_following(live_index, CHANGE_LOG_PATH)
+
+        # The skill graph and semantic index on disk only apply if they were built from the published catalog
+        semantic = skill_graph = None
+        if read_catalog_version(CATALOG_PATH) == shared.catalog_version:
+            semantic = load_semantic_engine()
+            skill_graph = load_skill_graph(catalog_path=CATALOG_PATH)
+        return cls(df, shared.tfidf, shared.tfidf_matrix, shared.engine(), ResourceFilters(df), live_index, semantic,
+                   cache=cache, catalog_version=shared.catalog_version, skill_graph=skill_graph)
+
+    @property
+    def version(self):
+        """Changes whenever the catalog or any index behind the results changes"""
+        return (self.catalog_version, self.live_index.version if self.live_index is not None else None)
+
+    def facets(self):
+        """Filter choices and capabilities for building a search form"""
+        return {
+            "sources": list(self.df['source'].unique()),
+            "skills": self.filters.skills,
+            "durations": [ALL_DURATIONS] + list(DURATION_BUCKETS),
+            "modes": SEARCH_MODES if self.semantic is not None and self.live_index is None else ["lexical"],
+            "total": len(self.live_index) if self.live_index is not None else len(self.df),
+            "source_count": int(self.df['source'].nunique()),
+        }
+
+    def featured(self, n=4):
+        """A random sample of resources to show before any search"""
+        # Draws n positions directly instead of permuting the whole catalog
+        positions = np.random.default_rng().choice(len(self.df), size=min(n, len(self.df)), replace=False)
+        return self.df.iloc[positions].reset_index(drop=True)
+
+    def facet_counts(self, sources=None, duration=ALL_DURATIONS, where=None):
+        """Resources per source, duration bucket and skill tag under the other current selections"""
+        return self.filters.counts(sources, duration, where)
+
+    def search(self, job_description, k=10, sources=None, duration=ALL_DURATIONS, mode="lexical", where=None):
+        """Return (results, extracted_skills) for one job description.
+
+        where is an optional filter expression over the facets, see
+        FacetIndex. The description is normalised first, and with a cache
+        repeated searches skip skill extraction, vectorization and scoring.
+        """
+        return self.search_batch([job_description], k, sources, duration, mode, where)[0]
+
+    def _search(self, job_description, k, sources, duration, mode, where=None):
+        if self.live_index is not None:
+            # Sources added since startup are only excluded by an explicit source selection
+            if sources and set(sources) >= set(self.filters.sources):
+                sources = None
+            return search_live_resources(job_description, self.live_index, k=k,
+                                         allowed=record_filter(sources, duration, where))
+
+        return search_resources(
+            job_description, self.tfidf, self.tfidf_matrix, self.df, k=k, engine=self.engine,
+            mask=self.filters.mask(sources, duration, where), mode=mode, semantic=self.semantic
+        )
+
+    def search_batch(self, job_descriptions, k=10, sources=None, duration=ALL_DURATIONS, mode="lexical", where=None):
+        """Return a list of (results, extracted_skills), one per job description, exactly as search would.
+
+        Descriptions found in the cache are answered from it; only the rest
+        are scored, lexical ones together in one sparse product.
+        """
+        job_descriptions = [normalize_description(job_description) for job_description in job_descriptions]
+        outputs = [None] * len(job_descriptions)
+        if self.cache is not None:
+            version = self.version
+            keys = [self.cache.key(job_description, k, sources, duration, mode, where)
+                    for job_description in job_descriptions]
+            outputs = [self.cache.get(key, version) for key in keys]
+        missing = [position for position, output in enumerate(outputs) if output is None]
+
+        # Preparing the batch postings only pays off for several descriptions
+        if mode != "lexical" or self.live_index is not None or len(missing) == 1:
+            scored = (self._search(job_descriptions[position], k, sources, duration, mode, where)
+                      for position in missing)
+        else:
+            scored = search_resources_batch(
+                [job_descriptions[position] for position in missing], self.tfidf, self.tfidf_matrix, self.df, k=k,
+                engine=self.engine, mask=self.filters.mask(sources, duration, where)
+            )
+        for position, output in zip(missing, scored):
+            outputs[position] = output
+            if self.cache is not None:
+                results, _ = output
+                self.cache.put(keys[position], output, int(results.memory_usage(deep=True).sum()), version)
+
+        # Copies, so callers cannot change what later hits return
+        return [(results.copy(), list(extracted_skills)) for results, extracted_skills in outputs]
+
+    def learning_path(self, extracted_skills, budget_hours=None):
+        return get_learning_path(extracted_skills, self.skill_graph, budget_hours)
+
+    def live_search(self):
+        """Search state for one user editing a description, see LiveSearch"""
+        return LiveSearch(self)
+
+class LiveSearch:
+    """Searches a job description again after every edit, reusing the previous query vector.
+
+    The query vector and extracted skills are updated from the edited span
+    only, so repeated searches while typing cost little more than scoring.
+    The result cache is bypassed since nearly every edit is a new text.
+    Semantic modes and a live index fall back to a full search.
+    """
+
+    def __init__(self, recommender):
+        self.recommender = recommender
+        self.query = IncrementalQuery(recommender.tfidf)
+
+    def search(self, job_description, k=10, sources=None, duration=ALL_DURATIONS, mode="lexical", where=None):
+        recommender = self.recommender
+        if mode != "lexical" or recommender.live_index is not None:
+            return recommender.search(job_description, k, sources, duration, mode, where)
+
+        search_vector, extracted_skills = self.query.update(job_description)
+        mask = recommender.filters.mask(sources, duration, where)
+        top_indices, top_scores = recommender.engine.top_k(search_vector, k, mask)
+        return select_results(recommender.df, top_indices, top_scores), extracted_skills
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_description(job_description):
+    """Lowercase and collapse whitespace, so pasted copies of the same text share a key.
+
+    Search scores the normalised text too, which gives the same results as
+    the raw text: skill matching and vectorization ignore case and spacing.
+    """
+    return " ".join(job_description.lower().split())
+
+
+class ResultCache:
+    """LRU cache of search results with a TTL, bounded by entry count and bytes.
+
+    Entries are tagged with the recommender version they were computed for;
+    the first lookup under a new version drops everything cached before it.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, ttl=600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(normalized_description, k, sources, duration, mode, where=None):
+        """Stable hash of everything that changes the results of a search"""
+        parts = [normalized_description, str(k), "|".join(sorted(sources or ())), str(duration), str(mode),
+                 json.dumps(where)]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def _check_version(self, version):
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+            self._version = version
+
+    def get(self, key, version):
+        """Return the cached value, or None on a miss"""
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, size, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, size, version):
+        """Store a value whose approximate footprint is size bytes"""
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._check_version(version)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size, time.monotonic() + self.ttl)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,212 @@
+import numpy as np
+from scipy.sparse import diags
+from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+
+# Postings weight types that are stored with a per-resource scale
+QUANTIZED_STORAGE = ["int8", "float16"]
+
+
+def rank_top_k(doc_ids, scores, k):
+    """Pick the k best (doc_id, score) pairs without sorting everything.
+
+    Ties are broken by document position so rankings are deterministic.
+    """
+    if k <= 0:
+        return doc_ids[:0], scores[:0]
+    if len(scores) > k:
+        # Everything tied with the k-th score is kept, since argpartition picks among ties arbitrarily
+        kth_score = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        keep = np.flatnonzero(scores >= kth_score)
+        doc_ids = doc_ids[keep]
+        scores = scores[keep]
+    order = np.lexsort((doc_ids, -scores))[:k]
+    return doc_ids[order], scores[order]
+
+
+def pad_with_zero_scores(doc_ids, scores, k, n_docs, mask=None):
+    """Append the first untouched resources with score 0 until there are k rows.
+
+    With a mask only resources allowed by it are used, so fewer than k rows
+    come back when fewer than k resources qualify.
+    """
+    if len(doc_ids) >= k:
+        return doc_ids, scores
+    # Fewer than k resources are taken, so the padding is among the first k allowed ones
+    candidates = np.arange(min(k, n_docs)) if mask is None else np.flatnonzero(mask)[:k]
+    padding = candidates[~np.isin(candidates, doc_ids)][:k - len(doc_ids)]
+    doc_ids = np.concatenate([doc_ids, padding.astype(np.intp)])
+    scores = np.concatenate([scores, np.zeros(len(padding))])
+    return doc_ids, scores
+
+
+def quantize_postings(postings, n_docs, dtype):
+    """Postings weights as dtype ("int8" or "float16"), scaled per resource.
+
+    Returns (weights, doc_scales); a weight times the doc_scales entry of its
+    resource restores the original value up to rounding.
+    """
+    magnitudes = np.zeros(n_docs, dtype=np.float32)
+    np.maximum.at(magnitudes, postings.indices, np.abs(postings.data))
+    magnitudes[magnitudes == 0] = 1.0
+    doc_scales = magnitudes / 127 if dtype == "int8" else magnitudes
+    weights = postings.data / doc_scales[postings.indices]
+    if dtype == "int8":
+        weights = np.rint(weights)
+    return weights.astype(dtype), doc_scales
+
+
+class CosineEngine:
+    """Brute-force cosine similarity against every row of the TF-IDF matrix"""
+
+    def __init__(self, tfidf_matrix):
+        self.tfidf_matrix = tfidf_matrix
+        self.n_docs = tfidf_matrix.shape[0]
+
+    def score(self, query_vector):
+        """Return (doc_ids, scores) for every resource with a nonzero similarity"""
+        similarities = cosine_similarity(query_vector, self.tfidf_matrix).flatten()
+        doc_ids = np.flatnonzero(similarities)
+        return doc_ids, similarities[doc_ids]
+
+    def top_k(self, query_vector, k, mask=None):
+        """Return (doc_ids, scores) of the k most similar resources allowed by mask, best first"""
+        similarities = cosine_similarity(query_vector, self.tfidf_matrix).flatten()
+        doc_ids = np.arange(self.n_docs)
+        if mask is not None:
+            doc_ids = doc_ids[mask]
+            similarities = similarities[mask]
+        return rank_top_k(doc_ids, similarities, min(k, self.n_docs))
+
+
+class InvertedIndexEngine:
+    """Cosine similarity computed from the postings of the query's terms only.
+
+    The TF-IDF matrix is L2-normalised once and stored column-major, so the
+    column of a term is its postings list. A query touches only the documents
+    that share a term with it, and the top k are picked with a partial
+    selection instead of a full sort.
+
+    With storage "int8" or "float16" the weights are quantized per resource
+    and doc_scales holds the factor each resource's summed score is
+    multiplied by.
+    """
+
+    def __init__(self, tfidf_matrix, storage=None):
+        postings = normalize(tfidf_matrix).tocsc()
+        postings.sort_indices()
+        self.n_docs = tfidf_matrix.shape[0]
+        self.postings_indptr = postings.indptr
+        self.postings_doc_ids = postings.indices
+        self.postings_weights = postings.data
+        self.doc_scales = None
+        if storage in QUANTIZED_STORAGE:
+            self.postings_weights, self.doc_scales = quantize_postings(postings, self.n_docs, storage)
+
+    @classmethod
+    def from_postings(cls, postings_indptr, postings_doc_ids, postings_weights, n_docs, doc_scales=None):
+        """Wrap postings arrays saved earlier, e.g. memory-mapped from disk"""
+        engine = cls.__new__(cls)
+        engine.n_docs = n_docs
+        engine.postings_indptr = postings_indptr
+        engine.postings_doc_ids = postings_doc_ids
+        engine.postings_weights = postings_weights
+        engine.doc_scales = doc_scales
+        return engine
+
+    def prepare_queries(self, query_matrix):
+        """Query weights whose dot product with the postings is the cosine similarity"""
+        return normalize(query_matrix).tocsr()
+
+    def score(self, query_vector):
+        """Return (doc_ids, scores) for every resource sharing a term with the query"""
+        return self.score_prepared(self.prepare_queries(query_vector))
+
+    def score_prepared(self, query_vector):
+        """score() of a query already passed through prepare_queries, a one-row CSR matrix"""
+        terms = query_vector.indices
+        term_weights = query_vector.data
+
+        starts = self.postings_indptr[terms]
+        ends = self.postings_indptr[terms + 1]
+        lengths = ends - starts
+        if not lengths.sum():
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+
+        # Gather all postings of the query terms in one vectorised step
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        doc_ids = self.postings_doc_ids[offsets]
+        contributions = self.postings_weights[offsets] * np.repeat(term_weights, lengths)
+
+        # Sum contributions per document over the touched documents only
+        candidates, slots = np.unique(doc_ids, return_inverse=True)
+        scores = np.bincount(slots, weights=contributions)
+        if self.doc_scales is not None:
+            scores *= self.doc_scales[candidates]
+        return candidates.astype(np.intp), scores
+
+    def top_k(self, query_vector, k, mask=None):
+        """Return (doc_ids, scores) of the k most similar resources allowed by mask, best first"""
+        k = min(k, self.n_docs)
+        doc_ids, scores = self.score(query_vector)
+
+        # Drop filtered-out resources before ranking so k qualifying ones remain
+        if mask is not None:
+            allowed = mask[doc_ids]
+            doc_ids = doc_ids[allowed]
+            scores = scores[allowed]
+        doc_ids, scores = rank_top_k(doc_ids, scores, k)
+
+        # Pad with zero-score resources so callers always get k rows, like argsort did
+        return pad_with_zero_scores(doc_ids, scores, k, self.n_docs, mask)
+
+
+class BM25FEngine(InvertedIndexEngine):
+    """BM25F over separately weighted fields, scored from precomputed postings.
+
+    Each field's term counts are length-normalised with its own b and summed
+    with its field weight before a single k1 saturation, so a long skill list
+    no longer dilutes every other term the way cosine normalisation does. The
+    saturated weight times IDF is stored per (term, resource) posting, which
+    makes a query a sum over the postings of its distinct terms. Scores are
+    divided by the query's best attainable score so they fall in [0, 1].
+    """
+
+    def __init__(self, field_counts, field_weights, field_b, k1=1.2):
+        n_docs, n_terms = field_counts[0].shape
+        combined = None
+        for counts, weight, b in zip(field_counts, field_weights, field_b):
+            counts = counts.tocsr().astype(np.float64)
+            lengths = np.asarray(counts.sum(axis=1)).ravel()
+            average = lengths.mean() if n_docs and lengths.mean() > 0 else 1.0
+            scaled = diags(weight / ((1 - b) + b * lengths / average)) @ counts
+            combined = scaled if combined is None else combined + scaled
+        combined = combined.tocsc()
+        combined.sum_duplicates()
+        combined.sort_indices()
+
+        doc_freq = np.diff(combined.indptr)
+        self.idf = np.log(1 + (n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+        term_ids = np.repeat(np.arange(n_terms), doc_freq)
+        combined.data = self.idf[term_ids] * combined.data / (k1 + combined.data)
+
+        self.n_docs = n_docs
+        self.doc_scales = None
+        self.postings_indptr = combined.indptr
+        self.postings_doc_ids = combined.indices
+        self.postings_weights = combined.data
+
+    @classmethod
+    def from_postings(cls, postings_indptr, postings_doc_ids, postings_weights, n_docs, idf=None):
+        """Wrap postings and IDF arrays saved earlier, e.g. memory-mapped from disk"""
+        engine = super().from_postings(postings_indptr, postings_doc_ids, postings_weights, n_docs)
+        engine.idf = idf
+        return engine
+
+    def prepare_queries(self, query_matrix):
+        """Each distinct query term counts once, scaled by the query's best attainable score"""
+        queries = query_matrix.tocsr().copy()
+        queries.eliminate_zeros()
+        queries.data = np.ones_like(queries.data, dtype=np.float64)
+        bounds = queries @ self.idf
+        return (diags(1 / np.where(bounds > 0, bounds, 1)) @ queries).tocsr()
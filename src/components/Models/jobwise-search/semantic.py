@@ -0,0 +1,243 @@
+import json
+import os
+
+import joblib
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from catalog_store import CATALOG_PATH, DATA_DIR, build_corpus, catalog_fingerprint
+from retrieval import rank_top_k
+
+# Optional: a local sentence-transformers model for true semantic embeddings
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+SEMANTIC_DIR = os.environ.get("JOBWISE_SEMANTIC_DIR", os.path.join(DATA_DIR, "semantic"))
+EMBEDDING_MODEL = os.environ.get("JOBWISE_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+
+SEMANTIC_FORMAT_VERSION = 1
+
+SEARCH_MODES = ["lexical", "semantic", "hybrid"]
+
+
+class LsaEncoder:
+    """Latent semantic embeddings: TF-IDF projected onto the catalog's top SVD components.
+
+    Needs nothing beyond scikit-learn, and places terms that co-occur in the
+    catalog (such as "k8s" and "kubernetes") close together.
+    """
+
+    def __init__(self, n_components=256):
+        self.n_components = n_components
+        self.vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2), sublinear_tf=True)
+        self.svd = None
+
+    def fit(self, texts):
+        tfidf_matrix = self.vectorizer.fit_transform(texts)
+        n_components = max(1, min(self.n_components, tfidf_matrix.shape[0] - 1, tfidf_matrix.shape[1] - 1))
+        self.svd = TruncatedSVD(n_components=n_components, random_state=0)
+        self.svd.fit(tfidf_matrix)
+        return self
+
+    def encode(self, texts):
+        embeddings = self.svd.transform(self.vectorizer.transform(texts))
+        return normalize(embeddings).astype(np.float32)
+
+
+class SentenceTransformerEncoder:
+    """Embeddings from a sentence-transformers model stored on local disk"""
+
+    def __init__(self, model_name_or_path=EMBEDDING_MODEL):
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            raise ImportError("Install sentence-transformers to use SentenceTransformerEncoder")
+        self.model_name_or_path = model_name_or_path
+        self.model = SentenceTransformer(model_name_or_path, device="cpu")
+
+    def fit(self, texts):
+        return self
+
+    def encode(self, texts):
+        embeddings = self.model.encode(list(texts), batch_size=64, normalize_embeddings=True)
+        return np.asarray(embeddings, dtype=np.float32)
+
+    def __getstate__(self):
+        # Persist only the model location; the weights stay where they are
+        return {"model_name_or_path": self.model_name_or_path}
+
+    def __setstate__(self, state):
+        self.__init__(state["model_name_or_path"])
+
+
+def _kmeans(vectors, n_clusters, n_iter=10, seed=0):
+    """Spherical k-means on unit vectors; returns unit-norm centroids"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        for cluster in range(n_clusters):
+            members = vectors[assignment == cluster]
+            if len(members):
+                centroids[cluster] = members.sum(axis=0)
+            else:
+                centroids[cluster] = vectors[rng.integers(len(vectors))]
+        centroids = normalize(centroids).astype(np.float32)
+    return centroids
+
+
+class IvfIndex:
+    """Inverted-file approximate nearest neighbour index over unit embeddings.
+
+    Embeddings are clustered into lists around k-means centroids. A query
+    scores the centroids, then only the members of the n_probe closest lists.
+    """
+
+    def __init__(self, embeddings, centroids, list_offsets, list_ids):
+        self.embeddings = embeddings
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.list_ids = list_ids
+
+    @classmethod
+    def build(cls, embeddings, n_lists=None, n_iter=10, seed=0):
+        n_docs = len(embeddings)
+        n_lists = n_lists or max(1, int(np.sqrt(n_docs)))
+        n_lists = min(n_lists, n_docs)
+
+        # Train on a sample; k-means quality saturates well before the full set
+        rng = np.random.default_rng(seed)
+        sample_size = min(n_docs, 256 * n_lists)
+        sample = embeddings[rng.choice(n_docs, sample_size, replace=False)]
+        centroids = _kmeans(np.asarray(sample, dtype=np.float32), n_lists, n_iter, seed)
+
+        assignment = np.concatenate([
+            np.argmax(embeddings[start:start + 65536] @ centroids.T, axis=1)
+            for start in range(0, n_docs, 65536)
+        ])
+        list_ids = np.argsort(assignment, kind="stable")
+        list_offsets = np.searchsorted(assignment[list_ids], np.arange(n_lists + 1))
+        return cls(embeddings, centroids, list_offsets, list_ids)
+
+    def search(self, query, k, n_probe=8, mask=None):
+        """Return (doc_ids, scores) of the approximate k nearest neighbours"""
+        n_lists = len(self.centroids)
+        centroid_scores = self.centroids @ query
+        ranked_lists = np.argsort(-centroid_scores)
+        n_probe = min(n_probe, n_lists)
+
+        while True:
+            probed = ranked_lists[:n_probe]
+            candidates = np.concatenate([
+                self.list_ids[self.list_offsets[lst]:self.list_offsets[lst + 1]] for lst in probed
+            ])
+            if mask is not None:
+                candidates = candidates[mask[candidates]]
+            # Widen the probe when filters leave too few candidates
+            if len(candidates) >= k or n_probe == n_lists:
+                break
+            n_probe = min(2 * n_probe, n_lists)
+
+        scores = self.embeddings[np.sort(candidates)] @ query
+        return rank_top_k(np.sort(candidates), scores, k)
+
+
+class ExactDenseIndex:
+    """Brute-force inner product over every embedding, the reference for recall"""
+
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+
+    def search(self, query, k, n_probe=None, mask=None):
+        doc_ids = np.arange(len(self.embeddings))
+        scores = self.embeddings @ query
+        if mask is not None:
+            doc_ids, scores = doc_ids[mask], scores[mask]
+        return rank_top_k(doc_ids, scores, k)
+
+
+class SemanticEngine:
+    """Dense-embedding retrieval, with optional fusion with the TF-IDF engine"""
+
+    def __init__(self, encoder, index, n_probe=8):
+        self.encoder = encoder
+        self.index = index
+        self.n_probe = n_probe
+
+    def top_k(self, search_text, k, mask=None):
+        """Return (doc_ids, scores) of the k nearest resources to the text, best first"""
+        query = self.encoder.encode([search_text])[0]
+        return self.index.search(query, k, self.n_probe, mask)
+
+    def hybrid_top_k(self, search_text, query_vector, lexical_engine, k, mask=None, alpha=0.5):
+        """Fuse semantic and TF-IDF cosine scores as alpha * semantic + (1 - alpha) * lexical.
+
+        Candidates are the union of both engines' top results; each candidate
+        gets its exact score from both sides before the fused ranking.
+        """
+        query = self.encoder.encode([search_text])[0]
+        depth = max(4 * k, 50)
+        semantic_ids, _ = self.index.search(query, depth, self.n_probe, mask)
+
+        lexical_ids, lexical_scores = lexical_engine.score(query_vector)
+        if mask is not None:
+            allowed = mask[lexical_ids]
+            lexical_ids, lexical_scores = lexical_ids[allowed], lexical_scores[allowed]
+        lexical_ids, lexical_scores = rank_top_k(lexical_ids, lexical_scores, depth)
+
+        candidates = np.union1d(semantic_ids, lexical_ids)
+        lexical = np.zeros(len(candidates))
+        lexical[np.searchsorted(candidates, lexical_ids)] = lexical_scores
+        semantic = self.index.embeddings[candidates] @ query
+
+        return rank_top_k(candidates, alpha * semantic + (1 - alpha) * lexical, k)
+
+
+def build_semantic_index(df, catalog_path, out_dir=SEMANTIC_DIR, encoder=None, n_lists=None):
+    """Encode the catalog, build the IVF index and persist both for memory-mapped loading"""
+    encoder = encoder or LsaEncoder()
+    corpus = list(build_corpus(df))
+    encoder.fit(corpus)
+    embeddings = np.concatenate([
+        encoder.encode(corpus[start:start + 4096]) for start in range(0, len(corpus), 4096)
+    ])
+    index = IvfIndex.build(embeddings, n_lists=n_lists)
+
+    os.makedirs(out_dir, exist_ok=True)
+    joblib.dump(encoder, os.path.join(out_dir, "encoder.joblib"))
+    for name in ("embeddings", "centroids", "list_offsets", "list_ids"):
+        np.save(os.path.join(out_dir, name + ".npy"), getattr(index, name))
+
+    # The manifest is written last so a half-written index is never picked up
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump({
+            "format_version": SEMANTIC_FORMAT_VERSION,
+            "encoder": type(encoder).__name__,
+            "dimensions": int(embeddings.shape[1]),
+            "n_lists": int(len(index.centroids)),
+            "catalog": catalog_fingerprint(catalog_path),
+        }, f)
+    return SemanticEngine(encoder, index)
+
+
+def load_semantic_engine(index_dir=SEMANTIC_DIR, catalog_path=CATALOG_PATH):
+    """Load the persisted semantic index memory-mapped, or None if it is missing or stale"""
+    manifest_path = os.path.join(index_dir, "manifest.json")
+    if not os.path.exists(manifest_path) or not os.path.exists(catalog_path):
+        return None
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != SEMANTIC_FORMAT_VERSION:
+        return None
+    if manifest.get("catalog") != catalog_fingerprint(catalog_path):
+        return None
+
+    encoder = joblib.load(os.path.join(index_dir, "encoder.joblib"))
+    arrays = {
+        name: np.load(os.path.join(index_dir, name + ".npy"), mmap_mode="r")
+        for name in ("embeddings", "centroids", "list_offsets", "list_ids")
+    }
+    return SemanticEngine(encoder, IvfIndex(**arrays))
@@ -0,0 +1,359 @@
+"""Headless HTTP service for the resource recommender.
+
+    python service.py --port 8600 --workers 4
+
+The catalog and indexes are loaded once per worker process (memory-mapped,
+so the pages are shared) and all scoring runs on the worker pool, never on
+the event loop. Concurrent /search requests with the same options are
+micro-batched into a single sparse matrix product.
+
+Endpoints:
+    POST /search          {"job_description", "k", "sources", "duration", "mode", "where"}
+    POST /search/batch    {"job_descriptions", "k", "sources", "duration", "mode", "where"}
+    POST /skills          {"job_description"}
+    POST /learning-path   {"skills", "budget_hours"}
+    POST /facets/counts   {"sources", "duration", "where"}
+    GET  /facets, /featured?n=4, /stats, /health
+"""
+import argparse
+import asyncio
+import os
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from aiohttp import web
+
+from facet_index import check_expression
+from filters import ALL_DURATIONS, FACETS
+from recommender import Recommender, extract_skill_matches
+from result_cache import ResultCache
+
+# Set in every worker process by _init_worker
+_recommender = None
+
+
+def _init_worker():
+    global _recommender
+    _recommender = Recommender.load(cache=ResultCache())
+
+
+def records(results):
+    """DataFrame rows as JSON-safe dicts, with missing values as None"""
+    return [
+        {key: (None if pd.isna(value) else value.item() if isinstance(value, np.generic) else value)
+         for key, value in row.items()}
+        for row in results.to_dict(orient="records")
+    ]
+
+
+def _search_batch(job_descriptions, k, sources, duration, mode, where=None):
+    return [
+        {"skills": extracted_skills, "results": records(results)}
+        for results, extracted_skills in _recommender.search_batch(job_descriptions, k, sources, duration, mode, where)
+    ]
+
+
+def _skills(job_description):
+    return [{"skill": match.skill, "offsets": match.offsets} for match in extract_skill_matches(job_description)]
+
+
+def _learning_path(skills, budget_hours):
+    plan = _recommender.learning_path(skills, budget_hours)
+    return dict(plan._asdict(), steps=[step._asdict() for step in plan.steps])
+
+
+def _facets():
+    return _recommender.facets()
+
+
+def _facet_counts(sources, duration, where):
+    return _recommender.facet_counts(sources, duration, where)
+
+
+def _featured(n):
+    return records(_recommender.featured(n))
+
+
+class LatencyTracker:
+    """Rolling request latencies per endpoint, reported as percentiles"""
+
+    def __init__(self, window=10000):
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._counts = defaultdict(int)
+
+    def record(self, endpoint, seconds):
+        self._samples[endpoint].append(seconds)
+        self._counts[endpoint] += 1
+
+    def report(self):
+        report = {}
+        for endpoint, samples in self._samples.items():
+            p50, p99 = np.percentile(np.fromiter(samples, dtype=np.float64), [50, 99]) * 1000
+            report[endpoint] = {"count": self._counts[endpoint], "p50_ms": round(p50, 3), "p99_ms": round(p99, 3)}
+        return report
+
+
+class SearchBatcher:
+    """Collects concurrent single searches and scores them as one batch.
+
+    Requests are grouped by their options, since one matrix product can only
+    apply one k, filter set and mode. A batch is sent when it is full or when
+    the oldest request has waited max_wait seconds.
+    """
+
+    def __init__(self, pool, max_batch_size=64, max_wait=0.002):
+        self.pool = pool
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = asyncio.Queue()
+        self._task = None
+        # Dispatches in flight, kept so they are not collected mid-run and can be cancelled at stop
+        self._dispatches = set()
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        tasks = list(self._dispatches) + ([self._task] if self._task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def submit(self, job_description, options):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((job_description, options, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            groups = defaultdict(list)
+            for job_description, options, future in batch:
+                groups[options].append((job_description, future))
+            for options, items in groups.items():
+                task = asyncio.create_task(self._dispatch(options, items))
+                self._dispatches.add(task)
+                task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, options, items):
+        k, sources, duration, mode, where = options
+        job_descriptions = [job_description for job_description, _ in items]
+        try:
+            outputs = await asyncio.get_running_loop().run_in_executor(
+                self.pool, _search_batch, job_descriptions, k, list(sources) if sources else None, duration, mode, where
+            )
+        except asyncio.CancelledError:
+            for _, future in items:
+                future.cancel()
+            raise
+        except Exception as error:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, future), output in zip(items, outputs):
+            if not future.done():
+                future.set_result(output)
+
+
+def _freeze(expression):
+    """Filter expression from JSON as nested tuples, so it can be part of a batching key"""
+    if isinstance(expression, list):
+        return tuple(_freeze(part) for part in expression)
+    return expression
+
+
+def _filter_options(payload, facets):
+    """(sources, duration, where) of a request, checked here so bad input never reaches a worker"""
+    sources = payload.get("sources")
+    if sources is not None and (not isinstance(sources, list)
+                                or not all(isinstance(source, str) for source in sources)):
+        raise web.HTTPBadRequest(text="sources must be a list of strings")
+    duration = payload.get("duration") or ALL_DURATIONS
+    if duration not in facets["durations"]:
+        raise web.HTTPBadRequest(text=f"duration must be one of {facets['durations']}")
+    where = payload.get("where") or None
+    if where is not None:
+        try:
+            check_expression(where, FACETS)
+        except ValueError as error:
+            raise web.HTTPBadRequest(text=f"Invalid where: {error}")
+    return tuple(sources) if sources else None, duration, _freeze(where)
+
+
+def _search_options(payload, facets):
+    k = payload.get("k", 10)
+    if isinstance(k, bool) or not isinstance(k, int) or k < 1:
+        raise web.HTTPBadRequest(text="k must be a positive integer")
+    mode = payload.get("mode") or "lexical"
+    if mode not in facets["modes"]:
+        raise web.HTTPBadRequest(text=f"mode must be one of {facets['modes']}")
+    sources, duration, where = _filter_options(payload, facets)
+    return k, sources, duration, mode, where
+
+
+def _learning_path_options(payload):
+    skills = payload.get("skills", [])
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        raise web.HTTPBadRequest(text="skills must be a list of strings")
+    budget_hours = payload.get("budget_hours")
+    if budget_hours is not None and (isinstance(budget_hours, bool) or not isinstance(budget_hours, (int, float))
+                                     or not 0 <= budget_hours < float("inf")):
+        raise web.HTTPBadRequest(text="budget_hours must be a non-negative number")
+    return skills, budget_hours
+
+
+def _featured_count(query):
+    try:
+        n = int(query.get("n", 4))
+    except ValueError:
+        n = 0
+    if n < 1:
+        raise web.HTTPBadRequest(text="n must be a positive integer")
+    return n
+
+
+async def _payload(request):
+    try:
+        payload = await request.json()
+    except ValueError:
+        payload = None
+    if not isinstance(payload, dict):
+        raise web.HTTPBadRequest(text="Request body must be a JSON object")
+    return payload
+
+
+@web.middleware
+async def track_latency(request, handler):
+    start = time.perf_counter()
+    try:
+        return await handler(request)
+    finally:
+        request.app["latency"].record(request.path, time.perf_counter() - start)
+
+
+async def _run(request, func, *args):
+    return await asyncio.get_running_loop().run_in_executor(request.app["pool"], func, *args)
+
+
+async def handle_search(request):
+    payload = await _payload(request)
+    if not payload.get("job_description") or not isinstance(payload["job_description"], str):
+        raise web.HTTPBadRequest(text="job_description is required")
+    options = _search_options(payload, request.app["facets"])
+    output = await request.app["batcher"].submit(payload["job_description"], options)
+    return web.json_response(output)
+
+
+async def handle_search_batch(request):
+    payload = await _payload(request)
+    job_descriptions = payload.get("job_descriptions", [])
+    if not isinstance(job_descriptions, list) or not all(isinstance(text, str) for text in job_descriptions):
+        raise web.HTTPBadRequest(text="job_descriptions must be a list of strings")
+    k, sources, duration, mode, where = _search_options(payload, request.app["facets"])
+    items = await _run(request, _search_batch, job_descriptions, k,
+                       list(sources) if sources else None, duration, mode, where)
+    return web.json_response({"items": items})
+
+
+async def handle_skills(request):
+    payload = await _payload(request)
+    job_description = payload.get("job_description", "")
+    if not isinstance(job_description, str):
+        raise web.HTTPBadRequest(text="job_description must be a string")
+    return web.json_response({"matches": await _run(request, _skills, job_description)})
+
+
+async def handle_learning_path(request):
+    skills, budget_hours = _learning_path_options(await _payload(request))
+    plan = await _run(request, _learning_path, skills, budget_hours)
+    return web.json_response(plan)
+
+
+async def handle_facets(request):
+    return web.json_response(await _run(request, _facets))
+
+
+async def handle_facet_counts(request):
+    sources, duration, where = _filter_options(await _payload(request), request.app["facets"])
+    counts = await _run(request, _facet_counts, list(sources) if sources else None, duration, where)
+    return web.json_response(counts)
+
+
+async def handle_featured(request):
+    return web.json_response({"results": await _run(request, _featured, _featured_count(request.query))})
+
+
+async def handle_stats(request):
+    return web.json_response(request.app["latency"].report())
+
+
+async def handle_health(request):
+    return web.json_response({"status": "ok"})
+
+
+def create_app(workers=None, max_batch_size=64, max_wait=0.002):
+    """Build the aiohttp application; workers=0 scores on a thread in this process"""
+    app = web.Application(middlewares=[track_latency])
+    app["latency"] = LatencyTracker()
+
+    async def on_startup(app):
+        if workers == 0:
+            _init_worker()
+            app["pool"] = ThreadPoolExecutor(max_workers=1)
+        else:
+            app["pool"] = ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker)
+        # Durations and search modes fixed at load, for checking requests before they reach a worker
+        app["facets"] = await asyncio.get_running_loop().run_in_executor(app["pool"], _facets)
+        app["batcher"] = SearchBatcher(app["pool"], max_batch_size, max_wait)
+        app["batcher"].start()
+
+    async def on_cleanup(app):
+        await app["batcher"].stop()
+        app["pool"].shutdown(wait=False, cancel_futures=True)
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.add_routes([
+        web.post("/search", handle_search),
+        web.post("/search/batch", handle_search_batch),
+        web.post("/skills", handle_skills),
+        web.post("/learning-path", handle_learning_path),
+        web.get("/facets", handle_facets),
+        web.post("/facets/counts", handle_facet_counts),
+        web.get("/featured", handle_featured),
+        web.get("/stats", handle_stats),
+        web.get("/health", handle_health),
+    ])
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resource recommender HTTP service")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--workers", type=int, default=None, help="Scoring processes (0 scores in-process)")
+    parser.add_argument("--max-batch-size", type=int, default=64, help="Most searches scored together")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="Longest a search waits for a batch")
+    args = parser.parse_args()
+
+    app = create_app(args.workers, args.max_batch_size, args.max_wait_ms / 1000)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import os
+
+import pandas as pd
+import requests
+
+from skill_graph import LearningPlan, PlanStep
+
+# Base URL of a running service.py; when set the Streamlit page is a thin client
+SERVICE_URL = os.environ.get("JOBWISE_SERVICE_URL")
+
+
+class ServiceClient:
+    """Talks to service.py with the same methods the page uses on a local Recommender"""
+
+    def __init__(self, base_url=SERVICE_URL, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _get(self, path, **params):
+        response = self.session.get(self.base_url + path, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _post(self, path, payload):
+        response = self.session.post(self.base_url + path, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def facets(self):
+        return self._get("/facets")
+
+    def featured(self, n=4):
+        return pd.DataFrame(self._get("/featured", n=n)["results"])
+
+    def facet_counts(self, sources=None, duration=None, where=None):
+        return self._post("/facets/counts", {"sources": sources, "duration": duration, "where": where})
+
+    def search(self, job_description, k=10, sources=None, duration=None, mode="lexical", where=None):
+        output = self._post("/search", {
+            "job_description": job_description,
+            "k": k,
+            "sources": sources,
+            "duration": duration,
+            "mode": mode,
+            "where": where,
+        })
+        return pd.DataFrame(output["results"]), output["skills"]
+
+    def live_search(self):
+        """Searches while typing go to the service one by one, so the client serves them itself"""
+        return self
+
+    def learning_path(self, extracted_skills, budget_hours=None):
+        plan = self._post("/learning-path", {"skills": extracted_skills, "budget_hours": budget_hours})
+        return LearningPlan(**dict(plan, steps=[PlanStep(**step) for step in plan["steps"]]))
@@ -0,0 +1,190 @@
+import multiprocessing
+import os
+import queue
+import sys
+import weakref
+from multiprocessing import resource_tracker
+from multiprocessing.connection import wait
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from scipy.sparse import csc_matrix, csr_matrix
+
+from retrieval import InvertedIndexEngine, pad_with_zero_scores, rank_top_k
+
+# Number of index shards, each scored by its own worker process; 0 or 1 keeps a single engine
+SHARDS = int(os.environ.get("JOBWISE_SHARDS", "0"))
+
+# Queries that can be in flight at once, each on its own pipe to every shard
+SHARD_CHANNELS = int(os.environ.get("JOBWISE_SHARD_CHANNELS", "8"))
+
+
+def _share(array):
+    """Copy an array into a new shared memory block; returns (block, descriptor)"""
+    array = np.ascontiguousarray(array)
+    block = SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def _attach(descriptor):
+    """View of a block created by the coordinator, without taking ownership of it"""
+    name, shape, dtype = descriptor
+    if sys.version_info >= (3, 13):
+        block = SharedMemory(name=name, track=False)
+    else:
+        # Before 3.13 attaching registers the block, and the tracker would unlink it when this worker exits
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args: None
+        try:
+            block = SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _serve_shard(connections, descriptors, n_docs, n_terms, offset):
+    """Worker loop: score queries from every channel against one shard's postings held in shared memory"""
+    blocks, arrays = zip(*(_attach(descriptor) for descriptor in descriptors))
+    postings_indptr, postings_doc_ids, postings_weights, *doc_scales = arrays
+    engine = InvertedIndexEngine.from_postings(postings_indptr, postings_doc_ids, postings_weights, n_docs=n_docs,
+                                               doc_scales=doc_scales[0] if doc_scales else None)
+    open_connections = list(connections)
+    while open_connections:
+        for connection in wait(open_connections):
+            try:
+                request = connection.recv()
+            except EOFError:
+                request = None
+            if request is None:
+                open_connections.remove(connection)
+                continue
+            op, terms, weights, k, packed_mask = request
+            # Queries arrive already prepared by the coordinator's engine, e.g. BM25F-scaled
+            query_vector = csr_matrix((weights, terms, [0, len(terms)]), shape=(1, n_terms))
+            doc_ids, scores = engine.score_prepared(query_vector)
+            if packed_mask is not None:
+                allowed = np.unpackbits(packed_mask, count=n_docs).view(bool)[doc_ids]
+                doc_ids, scores = doc_ids[allowed], scores[allowed]
+            if op == "top_k":
+                doc_ids, scores = rank_top_k(doc_ids, scores, k)
+            connection.send((doc_ids + offset, scores))
+    del engine, arrays, postings_indptr, postings_doc_ids, postings_weights, doc_scales
+    for block in blocks:
+        block.close()
+
+
+def _shutdown(channels, processes, blocks):
+    for connections in channels:
+        for connection in connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+class ShardedEngine:
+    """Any InvertedIndexEngine split by resource into shards, each scored by its own process.
+
+    The engine's postings, in whatever ranking (TF-IDF or BM25F) and storage
+    (float64, float32 or quantized) they were built with, are cut into
+    resource ranges that live in shared memory, so workers map them instead
+    of receiving copies. The coordinator prepares a query with the engine
+    and sends it to all shards at once; each returns its own top k and the
+    coordinator merges them. Scores and tie-breaking match the engine
+    exactly. Up to `channels` queries run concurrently, each on its own set
+    of pipes, so callers on different threads never wait on each other's
+    round trips.
+    """
+
+    def __init__(self, engine, n_shards, channels=SHARD_CHANNELS):
+        # Kept for preparing queries, and for batch scoring over the full postings
+        self.engine = engine
+        self.n_docs = engine.n_docs
+        self.n_terms = len(engine.postings_indptr) - 1
+        postings = csc_matrix(
+            (engine.postings_weights, engine.postings_doc_ids, engine.postings_indptr),
+            shape=(self.n_docs, self.n_terms),
+        ).tocsr()
+        bounds = np.linspace(0, self.n_docs, min(n_shards, self.n_docs) + 1).astype(int)
+
+        context = multiprocessing.get_context("spawn")
+        self._blocks, self._processes = [], []
+        self._channels = [[] for _ in range(max(channels, 1))]
+        self._offsets = bounds[:-1]
+        self._free_channels = queue.Queue()
+        for channel in range(len(self._channels)):
+            self._free_channels.put(channel)
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            shard = postings[start:end].tocsc()
+            shard.sort_indices()
+            arrays = [shard.indptr, shard.indices, shard.data]
+            if engine.doc_scales is not None:
+                arrays.append(engine.doc_scales[start:end])
+            descriptors = []
+            for array in arrays:
+                block, descriptor = _share(array)
+                self._blocks.append(block)
+                descriptors.append(descriptor)
+
+            pipes = [context.Pipe() for _ in self._channels]
+            process = context.Process(
+                target=_serve_shard,
+                args=([child for _, child in pipes], descriptors, int(end - start), self.n_terms, int(start)),
+                name=f"index-shard-{len(self._processes)}",
+                daemon=True,
+            )
+            process.start()
+            for connections, (parent, child) in zip(self._channels, pipes):
+                child.close()
+                connections.append(parent)
+            self._processes.append(process)
+
+        self._finalizer = weakref.finalize(self, _shutdown, self._channels, self._processes, self._blocks)
+
+    @property
+    def n_shards(self):
+        return len(self._processes)
+
+    def close(self):
+        """Stop the shard workers and free the shared memory"""
+        self._finalizer()
+
+    def _fan_out(self, op, query_vector, k, mask):
+        query_vector = self.engine.prepare_queries(query_vector)
+        terms = query_vector.indices[query_vector.indptr[0]:query_vector.indptr[1]]
+        weights = query_vector.data[query_vector.indptr[0]:query_vector.indptr[1]]
+        bounds = list(self._offsets) + [self.n_docs]
+        packed_masks = [None if mask is None else np.packbits(mask[start:end])
+                        for start, end in zip(bounds[:-1], bounds[1:])]
+
+        # A channel's pipes carry one query at a time, so its replies are always this query's
+        channel = self._free_channels.get()
+        connections = self._channels[channel]
+        # Send to every shard before waiting on any, so they score in parallel
+        for connection, packed_mask in zip(connections, packed_masks):
+            connection.send((op, terms, weights, k, packed_mask))
+        parts = [connection.recv() for connection in connections]
+        # Only returned after a complete exchange: a failed one may leave replies behind in its pipes
+        self._free_channels.put(channel)
+        doc_ids = np.concatenate([doc_ids for doc_ids, _ in parts]).astype(np.intp)
+        scores = np.concatenate([scores for _, scores in parts])
+        return doc_ids, scores
+
+    def score(self, query_vector):
+        """Return (doc_ids, scores) for every resource sharing a term with the query"""
+        return self._fan_out("score", query_vector, None, None)
+
+    def top_k(self, query_vector, k, mask=None):
+        """Return (doc_ids, scores) of the k most similar resources allowed by mask, best first"""
+        k = min(k, self.n_docs)
+        doc_ids, scores = self._fan_out("top_k", query_vector, k, mask)
+        doc_ids, scores = rank_top_k(doc_ids, scores, k)
+        return pad_with_zero_scores(doc_ids, scores, k, self.n_docs, mask)
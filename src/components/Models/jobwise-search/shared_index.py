@@ -0,0 +1,295 @@
+"""Publish the catalog and index into POSIX shared memory for every app process on the host.
+
+    python shared_index.py publish                  # load or fit the index once and publish it
+    python shared_index.py publish --watch 60       # republish whenever the catalog changes
+    python shared_index.py unpublish
+
+Set JOBWISE_SHARED_INDEX to the same name for the publisher and the app
+processes. Each published version is one segment holding the catalog as an
+Arrow IPC file and every index array; a small control segment names the
+current version. Publishing writes a whole new segment and then swaps the
+control header, so readers attach to one complete version or the other,
+never a mix. App processes map the catalog and the term matrix and engine
+arrays in place, so N workers cost one copy of those. Everything else is
+still built per process: the facet filters, the vocabulary of a plain
+TF-IDF index, the skill graph and semantic index read from disk, and, with
+a change log, the live index, which holds its own copy of the catalog.
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from catalog_store import (
+    CATALOG_PATH, INDEX_DIR, INDEX_STORAGE, RANKING, build_bm25f_engine, engine_from_arrays, fit_index,
+    index_arrays, index_from_arrays, load_index, load_resource_frame, read_catalog_version
+)
+
+# Name of the shared-memory index to attach to; unset keeps a private index per process
+SHARED_INDEX = os.environ.get("JOBWISE_SHARED_INDEX", "")
+
+# Control header: magic, sequence counter (odd while a swap is in progress), version, data segment name
+CONTROL_FORMAT = struct.Struct("<8sQQ64s")
+CONTROL_MAGIC = b"JWINDEX1"
+
+# Alignment of every array in the data segment
+ALIGNMENT = 64
+
+# Attached control segments, one per prefix for the life of the process
+_controls = {}
+
+
+class _Segment(SharedMemory):
+    """Shared memory whose mapping stays valid for as long as any array views it"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The mapping does not need the descriptor, so do not hold one open per attached version
+        if getattr(self, "_fd", -1) >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __del__(self):
+        # Arrays handed out by SharedIndex may outlive it; the mapping then goes away with the last of them
+        try:
+            self.close()
+        except BufferError:
+            pass
+
+
+def _open(name, create=False, size=0):
+    """Open a segment without letting this process's resource tracker unlink it on exit"""
+    if sys.version_info >= (3, 13):
+        return _Segment(name=name, create=create, size=size, track=False)
+    # Before 3.13 every open registers the segment, and the tracker would unlink it when this process exits
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args: None
+    try:
+        return _Segment(name=name, create=create, size=size)
+    finally:
+        resource_tracker.register = register
+
+
+def _unlink(name):
+    try:
+        block = _open(name)
+    except FileNotFoundError:
+        return
+    block.close()
+    if sys.version_info >= (3, 13):
+        block.unlink()
+        return
+    # Before 3.13 unlink also unregisters the segment, which the tracker never saw
+    unregister = resource_tracker.unregister
+    resource_tracker.unregister = lambda *args: None
+    try:
+        block.unlink()
+    finally:
+        resource_tracker.unregister = unregister
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _read_control(control):
+    """(version, data segment name) from the control header, retried while a swap is in progress"""
+    while True:
+        magic, sequence, version, name = CONTROL_FORMAT.unpack_from(control.buf)
+        if magic != CONTROL_MAGIC:
+            return 0, None
+        if sequence % 2 == 0 and struct.unpack_from("<Q", control.buf, 8)[0] == sequence:
+            return version, name.rstrip(b"\0").decode()
+        time.sleep(0)
+
+
+def _control(prefix):
+    control = _controls.get(prefix)
+    if control is None:
+        control = _controls[prefix] = _open(prefix)
+    return control
+
+
+def shared_index_version(prefix=SHARED_INDEX):
+    """Version currently published under the prefix, or None if nothing is published"""
+    try:
+        version, _ = _read_control(_control(prefix))
+    except FileNotFoundError:
+        return None
+    return version or None
+
+
+def publish(prefix=SHARED_INDEX, catalog_path=CATALOG_PATH, index_dir=INDEX_DIR, ranking=RANKING,
+            storage=INDEX_STORAGE):
+    """Write the catalog and index as a new version and make it current; returns the version"""
+    df = load_resource_frame(catalog_path)
+    index = load_index(index_dir, catalog_path)
+    tfidf, tfidf_matrix = fit_index(df) if index is None else index
+    bm25f = build_bm25f_engine(df, tfidf) if ranking == "bm25f" else None
+    arrays, fields, vocabulary = index_arrays(tfidf, tfidf_matrix, bm25f, storage)
+
+    sink = pa.BufferOutputStream()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    blobs = {"catalog": sink.getvalue()}
+    if vocabulary is not None:
+        blobs["vocabulary"] = pa.py_buffer(json.dumps(vocabulary).encode())
+
+    # Lay out the arrays and blobs after a length-prefixed JSON manifest
+    layout = {"arrays": {}, "blobs": {}}
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    offset = 0
+    for name, array in arrays.items():
+        layout["arrays"][name] = [offset, list(array.shape), array.dtype.str]
+        offset = _align(offset + array.nbytes)
+    for name, blob in blobs.items():
+        layout["blobs"][name] = [offset, blob.size]
+        offset = _align(offset + blob.size)
+    manifest = json.dumps(dict(fields, catalog_version=read_catalog_version(catalog_path), **layout)).encode()
+    data_start = _align(8 + len(manifest))
+
+    try:
+        control = _control(prefix)
+    except FileNotFoundError:
+        control = _controls[prefix] = _open(prefix, create=True, size=CONTROL_FORMAT.size)
+    version, previous = _read_control(control)
+    version += 1
+
+    # A segment left over by a publisher that died before its swap was never current
+    name = f"{prefix}-v{version}"
+    _unlink(name)
+    block = _open(name, create=True, size=data_start + max(offset, 1))
+    struct.pack_into("<Q", block.buf, 0, len(manifest))
+    block.buf[8:8 + len(manifest)] = manifest
+    for array_name, (start, shape, dtype) in layout["arrays"].items():
+        np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=data_start + start)[...] = arrays[array_name]
+    for blob_name, (start, size) in layout["blobs"].items():
+        block.buf[data_start + start:data_start + start + size] = memoryview(blobs[blob_name]).cast("B")
+    block.close()
+
+    # Seqlock swap: readers that see an odd or changed counter read the header again
+    sequence = CONTROL_FORMAT.unpack_from(control.buf)[1]
+    struct.pack_into("<Q", control.buf, 8, sequence + 1)
+    CONTROL_FORMAT.pack_into(control.buf, 0, CONTROL_MAGIC, sequence + 1, version, name.encode())
+    struct.pack_into("<Q", control.buf, 8, sequence + 2)
+
+    # Processes still attached to the old version keep their mapping until they drop it
+    if previous:
+        _unlink(previous)
+    return version
+
+
+def unpublish(prefix=SHARED_INDEX):
+    """Remove the current version and the control segment"""
+    try:
+        control = _control(prefix)
+    except FileNotFoundError:
+        return
+    _, name = _read_control(control)
+    sequence = CONTROL_FORMAT.unpack_from(control.buf)[1]
+    CONTROL_FORMAT.pack_into(control.buf, 0, CONTROL_MAGIC, sequence + 2, 0, b"")
+    if name:
+        _unlink(name)
+    del _controls[prefix]
+    control.close()
+    _unlink(prefix)
+
+
+class SharedIndex:
+    """One published version of the catalog and index, mapped zero-copy into this process.
+
+    The DataFrame columns, TF-IDF matrix and postings are read-only views of
+    the shared segment. Only the vocabulary dict of a plain TfidfVectorizer
+    index is decoded per process.
+    """
+
+    def __init__(self, block, version):
+        self.version = version
+        self._block = block
+
+        manifest_size = struct.unpack_from("<Q", block.buf, 0)[0]
+        self.manifest = json.loads(bytes(block.buf[8:8 + manifest_size]))
+        self._data_start = _align(8 + manifest_size)
+        self.catalog_version = self.manifest["catalog_version"]
+
+        table = pa.ipc.open_file(pa.py_buffer(self._blob("catalog"))).read_all()
+        self.df = table.to_pandas(types_mapper=pd.ArrowDtype)
+        vocabulary = None
+        if "vocabulary" in self.manifest["blobs"]:
+            vocabulary = json.loads(bytes(self._blob("vocabulary")))
+        self.tfidf, self.tfidf_matrix = index_from_arrays(self.manifest, self.array, vocabulary)
+
+    @classmethod
+    def attach(cls, prefix=SHARED_INDEX):
+        """Attach to the current version, or return None if nothing is published"""
+        while True:
+            try:
+                version, name = _read_control(_control(prefix))
+                if not version:
+                    return None
+                return cls(_open(name), version)
+            except FileNotFoundError:
+                # A newer version was swapped in and this one unlinked between the two reads
+                if shared_index_version(prefix) is None:
+                    return None
+
+    def _blob(self, name):
+        start, size = self.manifest["blobs"][name]
+        return self._block.buf[self._data_start + start:self._data_start + start + size]
+
+    def array(self, name):
+        start, shape, dtype = self.manifest["arrays"][name]
+        array = np.ndarray(shape, dtype=dtype, buffer=self._block.buf, offset=self._data_start + start)
+        array.flags.writeable = False
+        return array
+
+    def engine(self, ranking=RANKING):
+        """Engine for the ranking over the shared postings, falling back to TF-IDF if it was not published"""
+        engine = engine_from_arrays(self.manifest, self.array, ranking)
+        return engine if engine is not None else engine_from_arrays(self.manifest, self.array, "tfidf")
+
+    @property
+    def nbytes(self):
+        return self._block.size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish the catalog and index into shared memory")
+    parser.add_argument("command", choices=["publish", "unpublish"])
+    parser.add_argument("--name", default=SHARED_INDEX or "jobwise-index",
+                        help="Shared memory name, as in JOBWISE_SHARED_INDEX")
+    parser.add_argument("--catalog", default=CATALOG_PATH, help="Parquet or Arrow catalog file")
+    parser.add_argument("--index-dir", default=INDEX_DIR, help="Directory of the built index, fitted if missing")
+    parser.add_argument("--watch", type=float, default=0,
+                        help="Keep running and republish when the catalog changes, checking every N seconds")
+    args = parser.parse_args()
+
+    if args.command == "unpublish":
+        unpublish(args.name)
+        print(f"Removed shared index {args.name}")
+        return
+
+    published = None
+    while True:
+        catalog_version = read_catalog_version(args.catalog)
+        if catalog_version != published:
+            start = time.perf_counter()
+            version = publish(args.name, args.catalog, args.index_dir)
+            published = catalog_version
+            print(f"Published {args.name} version {version} in {time.perf_counter() - start:.2f}s")
+        if not args.watch:
+            break
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    main()
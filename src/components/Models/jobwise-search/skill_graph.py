@@ -0,0 +1,229 @@
+import json
+import os
+from collections import Counter, defaultdict, namedtuple
+
+import pandas as pd
+
+from catalog_store import CATALOG_PATH, DATA_DIR, read_catalog_version
+
+SKILL_GRAPH_PATH = os.environ.get("JOBWISE_SKILL_GRAPH", os.path.join(DATA_DIR, "skill_graph.json"))
+
+# Hours assumed for resources whose duration is unknown (e.g. "Various")
+DEFAULT_HOURS = 5.0
+
+# Resources kept per skill, shortest and broadest first
+RESOURCES_PER_SKILL = 20
+
+# Extracted skill names that are spelled differently in the catalog's skill tags
+SKILL_ALIASES = {
+    "node": "nodejs",
+    "vue": "vuejs",
+    "d3": "d3js",
+    "rest api": "api",
+}
+
+# Hand-checked prerequisites, merged with the edges mined from the catalog
+CURATED_PREREQUISITES = {
+    "javascript": ["html", "css"],
+    "react": ["javascript"],
+    "angular": ["typescript"],
+    "typescript": ["javascript"],
+    "vuejs": ["javascript"],
+    "nodejs": ["javascript"],
+    "django": ["python"],
+    "pandas": ["python"],
+    "numpy": ["python"],
+    "data analysis": ["python"],
+    "machine learning": ["python", "data analysis"],
+    "deep learning": ["machine learning"],
+    "docker": ["linux"],
+    "kubernetes": ["docker"],
+    "flutter": ["dart"],
+}
+
+PlanStep = namedtuple("PlanStep", ["title", "url", "source", "hours", "estimated", "skills"])
+LearningPlan = namedtuple("LearningPlan", ["steps", "skills", "skipped", "total_hours"])
+
+
+def split_skills(skills):
+    """Skill tags of a resource, lowercased and stripped"""
+    return [skill.strip().lower() for skill in str(skills).split(",") if skill.strip()]
+
+
+class SkillGraph:
+    """Skills with prerequisite edges, and the catalog resources that teach each skill.
+
+    Built offline from the catalog. Prerequisite closures are memoised per
+    skill, so planning only walks the skills involved in a query.
+    """
+
+    def __init__(self, prerequisites, resources, skill_resources):
+        self.prerequisites = prerequisites        # skill -> skills to learn first
+        self.resources = resources                # [{title, url, source, hours, estimated, skills}]
+        self.skill_resources = skill_resources    # skill -> resource ids, best candidates first
+        self._closures = {}
+
+        # A global topological rank orders any subset of skills in one sort
+        self.rank = {}
+        indegree = Counter()
+        dependents = defaultdict(list)
+        for skill, required in prerequisites.items():
+            for prerequisite in required:
+                indegree[skill] += 1
+                dependents[prerequisite].append(skill)
+        ready = sorted(skill for skill in self.skill_resources if not indegree[skill])
+        ready += sorted(skill for skill in prerequisites if skill not in self.skill_resources and not indegree[skill])
+        while ready:
+            skill = ready.pop(0)
+            self.rank[skill] = len(self.rank)
+            for dependent in dependents[skill]:
+                indegree[dependent] -= 1
+                if not indegree[dependent]:
+                    ready.append(dependent)
+
+    @classmethod
+    def build(cls, df, min_support=2, min_confidence=0.6, min_asymmetry=0.3):
+        """Mine the graph from the catalog's skill tags and durations.
+
+        A prerequisite edge general -> specific is added when resources that
+        teach the specific skill mostly also teach the general one, but not
+        the other way around. Edges are added strongest first and any edge
+        that would close a cycle is skipped.
+        """
+        resources = []
+        skill_counts = Counter()
+        pair_counts = Counter()
+        for row in df[['title', 'url', 'source', 'skills', 'duration_hours']].itertuples(index=False):
+            skills = list(dict.fromkeys(split_skills(row.skills)))
+            hours = None if pd.isna(row.duration_hours) else float(row.duration_hours)
+            resources.append({
+                "title": row.title,
+                "url": row.url,
+                "source": row.source,
+                "hours": DEFAULT_HOURS if hours is None else hours,
+                "estimated": hours is None,
+                "skills": skills,
+            })
+            skill_counts.update(skills)
+            for first in skills:
+                for second in skills:
+                    if first != second:
+                        pair_counts[first, second] += 1
+
+        candidates = []
+        for (general, specific), together in pair_counts.items():
+            if together < min_support:
+                continue
+            confidence = together / skill_counts[specific]
+            reverse = together / skill_counts[general]
+            if confidence >= min_confidence and confidence - reverse >= min_asymmetry:
+                candidates.append((confidence - reverse, together, general, specific))
+        candidates.sort(reverse=True)
+
+        prerequisites = defaultdict(list)
+        edges = [(prerequisite, skill) for skill, required in CURATED_PREREQUISITES.items() for prerequisite in required]
+        edges += [(general, specific) for _, _, general, specific in candidates]
+        for prerequisite, skill in edges:
+            if prerequisite not in prerequisites[skill] and not _reaches(prerequisites, prerequisite, skill):
+                prerequisites[skill].append(prerequisite)
+
+        skill_resources = defaultdict(list)
+        for resource_id, resource in enumerate(resources):
+            for skill in resource["skills"]:
+                skill_resources[skill].append(resource_id)
+        for skill, resource_ids in skill_resources.items():
+            resource_ids.sort(key=lambda resource_id: (resources[resource_id]["hours"], -len(resources[resource_id]["skills"])))
+            del resource_ids[RESOURCES_PER_SKILL:]
+
+        return cls(dict(prerequisites), resources, dict(skill_resources))
+
+    def resolve(self, skill):
+        """Graph node for an extracted skill name, or None if the catalog never teaches it"""
+        skill = SKILL_ALIASES.get(skill, skill)
+        return skill if skill in self.skill_resources or skill in self.prerequisites else None
+
+    def closure(self, skill):
+        """The skill and all of its prerequisites, memoised per skill"""
+        closure = self._closures.get(skill)
+        if closure is None:
+            closure = frozenset([skill]).union(*(self.closure(required) for required in self.prerequisites.get(skill, ())))
+            self._closures[skill] = closure
+        return closure
+
+    def plan(self, target_skills, budget_hours=None, known_skills=()):
+        """Ordered list of resources that covers the targets and their prerequisites.
+
+        Skills are visited in prerequisite order, so the budget goes to
+        foundations first. Each uncovered skill gets the resource that covers
+        the most still-uncovered plan skills per hour and still fits the
+        budget; skills no resource can fit are skipped. The chosen resources
+        are then ordered by the most advanced skill each one covers.
+        """
+        known = {self.resolve(skill) or skill for skill in known_skills}
+        targets = [node for node in (self.resolve(skill) for skill in target_skills) if node is not None]
+        needed = set().union(*(self.closure(target) for target in targets)) - known if targets else set()
+        ordered = sorted(needed, key=lambda skill: self.rank.get(skill, len(self.rank)))
+
+        uncovered = set(ordered)
+        steps = []
+        skipped = []
+        total_hours = 0.0
+        for skill in ordered:
+            if skill not in uncovered:
+                continue
+            best = None
+            for resource_id in self.skill_resources.get(skill, ()):
+                resource = self.resources[resource_id]
+                if budget_hours is not None and total_hours + resource["hours"] > budget_hours:
+                    continue
+                covers = [covered for covered in resource["skills"] if covered in uncovered]
+                value = (len(covers) / max(resource["hours"], 0.5), -resource["hours"])
+                if best is None or value > best[0]:
+                    best = (value, resource, covers)
+            if best is None:
+                skipped.append(skill)
+                uncovered.discard(skill)
+                continue
+            _, resource, covers = best
+            total_hours += resource["hours"]
+            uncovered.difference_update(covers)
+            steps.append(PlanStep(resource["title"], resource["url"], resource["source"],
+                                  resource["hours"], resource["estimated"], covers))
+
+        position = {skill: i for i, skill in enumerate(ordered)}
+        steps.sort(key=lambda step: max(position[skill] for skill in step.skills))
+        return LearningPlan(steps, ordered, skipped, total_hours)
+
+    def save(self, path, catalog_version):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({
+                "catalog_version": catalog_version,
+                "prerequisites": self.prerequisites,
+                "resources": self.resources,
+                "skill_resources": self.skill_resources,
+            }, f)
+
+
+def _reaches(prerequisites, start, goal):
+    """True if goal is already a prerequisite of start, directly or transitively"""
+    stack, seen = [start], set()
+    while stack:
+        skill = stack.pop()
+        if skill == goal:
+            return True
+        if skill not in seen:
+            seen.add(skill)
+            stack.extend(prerequisites.get(skill, ()))
+    return False
+
+
+def load_skill_graph(path=SKILL_GRAPH_PATH, catalog_path=CATALOG_PATH):
+    """Load the precomputed graph, or None if it is missing or was built from another catalog"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("catalog_version") != read_catalog_version(catalog_path):
+        return None
+    return SkillGraph(data["prerequisites"], data["resources"], data["skill_resources"])
@@ -0,0 +1,122 @@
+from collections import namedtuple
+from functools import lru_cache
+
+# Skills recognised in job descriptions, in the order they are reported
+COMMON_SKILLS = [
+    "python", "javascript", "java", "c++", "ruby", "php", "html", "css",
+    "react", "angular", "vue", "node", "express", "django", "flask",
+    "aws", "azure", "gcp", "docker", "kubernetes", "terraform",
+    "sql", "mysql", "postgresql", "mongodb", "nosql", "database",
+    "machine learning", "ai", "data science", "nlp", "computer vision",
+    "git", "devops", "ci/cd", "jenkins", "github actions", "gitlab",
+    "agile", "scrum", "kanban", "project management", "jira",
+    "rest api", "graphql", "microservices", "serverless",
+    "linux", "unix", "bash", "shell scripting",
+    "frontend", "backend", "fullstack", "web development",
+    "mobile development", "ios", "android", "flutter", "react native",
+    "testing", "qa", "selenium", "cypress", "junit", "pytest",
+    "security", "cybersecurity", "penetration testing",
+    "data analysis", "data visualization", "tableau", "power bi",
+    "blockchain", "ethereum", "smart contracts",
+    "ux", "ui", "design", "figma", "adobe xd", "sketch",
+    "typescript", "golang", "kotlin", "swift", "dart", "rust",
+    "pandas", "numpy", "matplotlib", "seaborn", "scikit-learn",
+    "tensorflow", "pytorch", "keras", "opencv"
+]
+
+# A matched skill with the (start, end) offsets of every occurrence
+SkillMatch = namedtuple("SkillMatch", ["skill", "offsets"])
+
+
+def _is_word_char(char):
+    """Mirror the re module's definition of a \\w character"""
+    return char.isalnum() or char == "_"
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton that finds every skill in a single pass over the text.
+
+    A match only counts when it sits on word boundaries, exactly like
+    re.search(r'\\b' + re.escape(skill) + r'\\b', text) did for each skill.
+    """
+
+    def __init__(self, skills):
+        self.skills = list(skills)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+
+        # Build the trie; each terminal state remembers which skills end there
+        for skill_index, skill in enumerate(self.skills):
+            state = 0
+            for char in skill:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            self._output[state] = self._output[state] + (skill_index,)
+
+        # Breadth-first pass to wire failure links and merge suffix outputs
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+                queue.append(next_state)
+
+        self._lengths = [len(skill) for skill in self.skills]
+
+    def finditer(self, text):
+        """Yield (skill_index, start, end) for every word-bounded occurrence in text"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        lengths = self._lengths
+        text_length = len(text)
+        state = 0
+
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+
+            end = position + 1
+            after_is_word = end < text_length and _is_word_char(text[end])
+            end_is_word = _is_word_char(char)
+            if after_is_word == end_is_word:
+                continue
+
+            for skill_index in output[state]:
+                start = end - lengths[skill_index]
+                before_is_word = start > 0 and _is_word_char(text[start - 1])
+                if before_is_word != _is_word_char(text[start]):
+                    yield skill_index, start, end
+
+    def match(self, text):
+        """Return a SkillMatch per skill found, in skill-list order.
+
+        Offsets index into text.lower(), which is the string that is scanned.
+        """
+        offsets = {}
+        for skill_index, start, end in self.finditer(text.lower()):
+            offsets.setdefault(skill_index, []).append((start, end))
+
+        return [
+            SkillMatch(self.skills[skill_index], offsets[skill_index])
+            for skill_index in sorted(offsets)
+        ]
+
+
+@lru_cache(maxsize=None)
+def get_skill_matcher(skills=tuple(COMMON_SKILLS)):
+    """Build the matcher for a skill list once per process"""
+    return SkillMatcher(skills)
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+COMPONENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, COMPONENT_DIR)
+sys.path.insert(0, os.path.join(COMPONENT_DIR, "benchmarks"))
+
+from bench_scalability import synthetic_catalog, synthetic_job_descriptions
+
+
+@pytest.fixture(scope="session")
+def catalog():
+    return synthetic_catalog(3000)
+
+
+@pytest.fixture(scope="session")
+def job_descriptions():
+    return synthetic_job_descriptions(20)
+
+
+@pytest.fixture(scope="session")
+def recommender(catalog):
+    """Recommender over the synthetic catalog, built in memory without touching the data directory"""
+    from catalog_store import build_engine, fit_index
+    from filters import ResourceFilters
+    from recommender import Recommender
+
+    tfidf, tfidf_matrix = fit_index(catalog)
+    return Recommender(catalog, tfidf, tfidf_matrix, build_engine(catalog, tfidf, tfidf_matrix),
+                       ResourceFilters(catalog), catalog_version="synthetic")
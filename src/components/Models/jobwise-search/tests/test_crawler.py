@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from catalog_store import load_resource_frame
+from crawler import Crawler, write_catalog
+
+PAGE = """<html><head><title>{title}</title>
+<meta name="description" content="Learn {title} from scratch">
+<meta name="keywords" content="python, sql">
+</head><body>{body}</body></html>"""
+
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+def fixture_app(requests):
+    """Course pages that log every request as (path, time, headers) into requests"""
+    failures = {"/flaky": 2}
+
+    async def handle(request):
+        requests.append((request.path, time.monotonic(), dict(request.headers)))
+        if failures.get(request.path):
+            failures[request.path] -= 1
+            return web.Response(status=503)
+        if request.path == "/etag" and request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        if request.path == "/last-modified" and request.headers.get("If-Modified-Since") == LAST_MODIFIED:
+            return web.Response(status=304)
+
+        headers = {"ETag": '"v1"'} if request.path == "/etag" else {"Last-Modified": LAST_MODIFIED}
+        title = request.path.strip("/").replace("-", " ")
+        return web.Response(text=PAGE.format(title=title, body="x" * 1000), content_type="text/html", headers=headers)
+
+    app = web.Application()
+    app.router.add_get("/{name}", handle)
+    return app
+
+
+def crawl(paths, rounds=1, rate=1000.0):
+    """(records, crawler) of every round, each crawl reusing the state of the one before, and the requests"""
+    requests = []
+
+    async def main():
+        results = []
+        state = {}
+        async with TestServer(fixture_app(requests)) as server:
+            for _ in range(rounds):
+                crawler = Crawler(state, rate=rate, backoff=0.01)
+                records = await crawler.crawl([{"url": str(server.make_url(path))} for path in paths])
+                results.append((records, crawler))
+                state = crawler.state
+        return results
+
+    return asyncio.run(main()), requests
+
+
+def test_recrawl_reuses_records_on_304():
+    [(first, crawler), (second, recrawler)], requests = crawl(["/etag", "/last-modified"], rounds=2)
+    assert crawler.stats["fetched"] == 2
+    assert recrawler.stats["not_modified"] == 2
+    assert recrawler.stats["fetched"] == 0
+    assert second == first
+
+    # The recrawl sent the validators stored from the first crawl
+    headers = {path: request_headers for path, _, request_headers in requests[2:]}
+    assert headers["/etag"]["If-None-Match"] == '"v1"'
+    assert headers["/last-modified"]["If-Modified-Since"] == LAST_MODIFIED
+
+
+def test_5xx_is_retried_until_the_page_loads():
+    [(records, crawler)], requests = crawl(["/flaky"])
+    assert [path for path, _, _ in requests] == ["/flaky"] * 3
+    assert crawler.stats["retries"] == 2
+    assert [record["title"] for record in records] == ["flaky"]
+
+
+def test_requests_to_one_host_are_spaced_by_the_rate():
+    paths = [f"/page-{n}" for n in range(5)]
+    [(records, _)], requests = crawl(paths, rate=20.0)
+    assert len(records) == 5
+    times = sorted(request_time for _, request_time, _ in requests)
+    # 20 requests per second: at least 50 ms between consecutive requests, allowing for timer jitter
+    assert min(later - earlier for earlier, later in zip(times, times[1:])) >= 0.045
+
+
+def test_write_catalog_of_no_records_writes_an_empty_catalog(tmp_path):
+    path = str(tmp_path / "catalog.arrow")
+    write_catalog([], path)
+    df = load_resource_frame(path)
+    assert len(df) == 0
+    assert {"title", "url", "description", "skills", "source", "duration", "duration_hours"} <= set(df.columns)
@@ -0,0 +1,85 @@
+import random
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from live_index import LiveIndex
+
+WORDS = "python java sql docker kubernetes react css html machine learning data science cloud aws linux".split()
+
+QUERIES = ["python docker", "machine learning data", "react css html", "aws cloud linux sql"]
+
+
+def resource(rng, n):
+    return {
+        "url": f"https://example.org/{n}",
+        "title": " ".join(rng.choices(WORDS, k=3)),
+        "description": " ".join(rng.choices(WORDS, k=8)),
+        "skills": ", ".join(rng.choices(WORDS, k=2)),
+        "source": "Example",
+        "duration": "2 hours",
+    }
+
+
+def scores_by_id(index, text):
+    records, scores = index.search(text, len(index))
+    return dict(zip(records["url"], scores)) if len(records) else {}
+
+
+def assert_same_results(index, resources):
+    fresh = LiveIndex.from_frame(pd.DataFrame(list(resources.values())))
+    assert len(index) == len(fresh)
+    for text in QUERIES:
+        expected, actual = scores_by_id(fresh, text), scores_by_id(index, text)
+        assert actual.keys() == expected.keys()
+        np.testing.assert_allclose([actual[url] for url in expected], list(expected.values()))
+
+
+@pytest.mark.parametrize("compact_threshold", [50, 10 ** 9])
+def test_adds_and_deletes_give_the_results_of_a_fresh_index(compact_threshold):
+    rng = random.Random(0)
+    resources = {record["url"]: record for record in (resource(rng, n) for n in range(200))}
+    index = LiveIndex.from_frame(pd.DataFrame(list(resources.values())), compact_threshold=compact_threshold)
+
+    # Compactions run alongside the writes, as they do when a write crosses the threshold
+    stop = threading.Event()
+
+    def compact_until_stopped():
+        while not stop.wait(0.001):
+            index.compact()
+
+    compactor = threading.Thread(target=compact_until_stopped)
+    compactor.start()
+    try:
+        for _ in range(1000):
+            record = resource(rng, rng.randrange(300))
+            if rng.random() < 0.7:
+                index.upsert(record["url"], record)
+                resources[record["url"]] = record
+            else:
+                index.delete(record["url"])
+                resources.pop(record["url"], None)
+    finally:
+        stop.set()
+        compactor.join()
+
+    # Current IDF and norms before compaction, and the same after it
+    assert_same_results(index, resources)
+    index.compact()
+    assert_same_results(index, resources)
+    assert len(index._slots.records) == len(resources)
+
+
+def test_upsert_of_an_indexed_id_replaces_it():
+    rng = random.Random(1)
+    first = resource(rng, 1)
+    duplicate = dict(first, title="Kubernetes")
+    index = LiveIndex.from_frame(pd.DataFrame([first, resource(rng, 2), duplicate]))
+    assert len(index) == 2
+
+    index.upsert(first["url"], dict(first, title="Docker"))
+    assert len(index) == 2
+    assert index.delete(first["url"])
+    assert first["url"] not in set(scores_by_id(index, "docker kubernetes python"))
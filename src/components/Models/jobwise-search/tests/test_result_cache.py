@@ -0,0 +1,29 @@
+import copy
+
+import pandas as pd
+
+from recommender import search_resources
+from result_cache import ResultCache
+
+QUERY = "Senior  PYTHON Engineer:\n Django, SQL and AWS;  Docker  experience"
+
+
+def test_cached_and_uncached_searches_agree_for_mixed_case_text(recommender):
+    uncached = copy.copy(recommender)
+    uncached.cache = None
+    cached = copy.copy(recommender)
+    cached.cache = ResultCache()
+
+    expected_results, expected_skills = uncached.search(QUERY, k=10)
+    for _ in range(2):  # a miss, then a hit
+        results, skills = cached.search(QUERY, k=10)
+        pd.testing.assert_frame_equal(results, expected_results)
+        assert skills == expected_skills
+    assert (cached.cache.misses, cached.cache.hits) == (1, 1)
+
+    # Normalising the text changes nothing: scoring the raw text gives the same results
+    raw_results, raw_skills = search_resources(QUERY, recommender.tfidf, recommender.tfidf_matrix, recommender.df,
+                                               k=10, engine=recommender.engine)
+    pd.testing.assert_frame_equal(raw_results, expected_results)
+    assert raw_skills == expected_skills
+    assert {"python", "django", "sql", "aws", "docker"} <= set(expected_skills)
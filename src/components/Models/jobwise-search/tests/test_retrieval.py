@@ -0,0 +1,23 @@
+import numpy as np
+
+from retrieval import pad_with_zero_scores, rank_top_k
+
+
+def test_padding_takes_the_first_untouched_allowed_resources():
+    doc_ids, scores = np.array([3, 0], dtype=np.intp), np.array([0.9, 0.5])
+    padded_ids, padded_scores = pad_with_zero_scores(doc_ids, scores, 5, 10)
+    assert padded_ids.tolist() == [3, 0, 1, 2, 4]
+    assert padded_scores.tolist() == [0.9, 0.5, 0.0, 0.0, 0.0]
+
+    mask = np.zeros(10, dtype=bool)
+    mask[[0, 3, 6, 9]] = True
+    padded_ids, _ = pad_with_zero_scores(doc_ids, scores, 5, 10, mask)
+    assert padded_ids.tolist() == [3, 0, 6, 9]
+
+
+def test_ties_at_the_cutoff_go_to_the_lowest_ids():
+    scores = np.array([0.5, 0.9, 0.5, 0.5, 0.1, 0.5])
+    for order in (np.arange(6), np.arange(6)[::-1]):
+        doc_ids, top_scores = rank_top_k(order, scores[order], 3)
+        assert doc_ids.tolist() == [1, 0, 2]
+        assert top_scores.tolist() == [0.9, 0.5, 0.5]
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+import service
+
+
+def run_client(recommender, monkeypatch, requests):
+    """Run requests(client) against the service scoring in this process with the given recommender"""
+    monkeypatch.setattr(service, "_init_worker", lambda: setattr(service, "_recommender", recommender))
+
+    async def main():
+        async with TestClient(TestServer(service.create_app(workers=0))) as client:
+            return await requests(client)
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("post", "/skills", {"job_description": 42}),
+    ("post", "/skills", ["python"]),
+    ("post", "/learning-path", {"skills": "python"}),
+    ("post", "/learning-path", {"skills": ["python", 3]}),
+    ("post", "/learning-path", {"skills": ["python"], "budget_hours": "ten"}),
+    ("post", "/learning-path", {"skills": ["python"], "budget_hours": -1}),
+    ("post", "/learning-path", {"skills": ["python"], "budget_hours": True}),
+    ("get", "/featured?n=abc", None),
+    ("get", "/featured?n=0", None),
+    ("post", "/search", {"job_description": "python", "k": "10"}),
+])
+def test_bad_input_is_rejected_with_400(recommender, monkeypatch, method, path, body):
+    async def requests(client):
+        response = await getattr(client, method)(path, json=body)
+        return response.status
+
+    assert run_client(recommender, monkeypatch, requests) == 400
+
+
+def test_valid_requests_succeed(recommender, monkeypatch):
+    async def requests(client):
+        responses = [
+            await client.post("/skills", json={"job_description": "Python and SQL developer"}),
+            await client.post("/learning-path", json={"skills": ["python", "sql"], "budget_hours": 20}),
+            await client.post("/learning-path", json={"skills": ["python"]}),
+            await client.get("/featured?n=3"),
+        ]
+        return [(response.status, await response.json()) for response in responses]
+
+    (skills_status, skills), (plan_status, _), (default_status, _), (featured_status, featured) = run_client(
+        recommender, monkeypatch, requests)
+    assert (skills_status, plan_status, default_status, featured_status) == (200, 200, 200, 200)
+    assert {match["skill"] for match in skills["matches"]} >= {"python", "sql"}
+    assert len(featured["results"]) == 3
+
+
+def test_concurrent_searches_are_batched_and_stop_cancels_dispatches(recommender, monkeypatch):
+    async def requests(client):
+        responses = await asyncio.gather(*[
+            client.post("/search", json={"job_description": text, "k": 5}) for text in ["python", "sql", "react"]
+        ])
+        batcher = client.server.app["batcher"]
+        await batcher.stop()
+        return [response.status for response in responses], batcher
+
+    statuses, batcher = run_client(recommender, monkeypatch, requests)
+    assert statuses == [200, 200, 200]
+    assert not batcher._dispatches
+    assert batcher._task.cancelled()
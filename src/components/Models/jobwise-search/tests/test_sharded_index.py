@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from catalog_store import build_engine, fit_index, save_catalog
+from recommender import build_search_text, extract_skills
+from sharded_index import ShardedEngine
+
+from conftest import COMPONENT_DIR
+
+
+def query_vectors(tfidf, job_descriptions):
+    return [tfidf.transform([build_search_text(text, extract_skills(text))]) for text in job_descriptions]
+
+
+@pytest.mark.parametrize("ranking, storage", [("tfidf", "float64"), ("bm25f", "float64"), ("tfidf", "int8")])
+def test_sharded_top_k_matches_unsharded_engine(catalog, job_descriptions, ranking, storage):
+    tfidf, tfidf_matrix = fit_index(catalog)
+    engine = build_engine(catalog, tfidf, tfidf_matrix, ranking=ranking, storage=storage)
+    sharded = ShardedEngine(engine, 2)
+    mask = np.arange(len(catalog)) % 3 != 0
+    try:
+        for query_vector in query_vectors(tfidf, job_descriptions):
+            for query_mask in (None, mask):
+                expected_ids, expected_scores = engine.top_k(query_vector, 10, query_mask)
+                doc_ids, scores = sharded.top_k(query_vector, 10, query_mask)
+                assert doc_ids.tolist() == expected_ids.tolist()
+                np.testing.assert_allclose(scores, expected_scores)
+    finally:
+        sharded.close()
+
+
+def test_concurrent_queries_get_their_own_results(catalog, job_descriptions):
+    tfidf, tfidf_matrix = fit_index(catalog)
+    engine = build_engine(catalog, tfidf, tfidf_matrix, ranking="tfidf", storage="float64")
+    sharded = ShardedEngine(engine, 2, channels=4)
+    vectors = query_vectors(tfidf, job_descriptions) * 5
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda query_vector: sharded.top_k(query_vector, 10)[0].tolist(), vectors))
+        assert results == [engine.top_k(query_vector, 10)[0].tolist() for query_vector in vectors]
+    finally:
+        sharded.close()
+
+
+SEARCH_SCRIPT = """
+import json, sys
+from recommender import Recommender
+recommender = Recommender.load(follow_changes=False)
+print(json.dumps([list(recommender.search(text, k=10)[0]["url"]) for text in json.loads(sys.argv[1])]))
+"""
+
+
+def test_shards_keep_bm25f_ranking_of_recommender(catalog, job_descriptions, tmp_path):
+    catalog_path = str(tmp_path / "catalog.arrow")
+    save_catalog(catalog, catalog_path)
+
+    def search(shards):
+        env = dict(os.environ, JOBWISE_CATALOG=catalog_path, JOBWISE_INDEX_DIR=str(tmp_path / "index"),
+                   JOBWISE_RANKING="bm25f", JOBWISE_SHARDS=str(shards), JOBWISE_CHANGE_LOG="",
+                   JOBWISE_SEMANTIC_DIR=str(tmp_path / "semantic"),
+                   JOBWISE_SKILL_GRAPH=str(tmp_path / "skill_graph"))
+        output = subprocess.check_output([sys.executable, "-c", SEARCH_SCRIPT, json.dumps(job_descriptions)],
+                                         cwd=COMPONENT_DIR, env=env)
+        return json.loads(output)
+
+    assert search(2) == search(0)
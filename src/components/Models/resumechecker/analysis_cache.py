@@ -0,0 +1,225 @@
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+
+import spacy
+from spacy.tokens import DocBin
+
+# Directory of the on-disk analysis cache. Entries hold resume contents, so caching is off unless it is set
+CACHE_DIR = os.environ.get("RESUMECHECKER_CACHE_DIR", "")
+
+# Size bound of the cache; least recently used entries are evicted past it
+CACHE_MAX_BYTES = int(os.environ.get("RESUMECHECKER_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Share of the bound that eviction brings the cache back down to, so it does not run on every write
+EVICT_TO = 0.8
+
+# Share of the bound the estimated size may exceed it by before the directory is swept
+EVICT_MARGIN = 0.1
+
+# Staging files older than this were left behind by a writer that died, and are removed by a sweep
+STALE_STAGING_SECONDS = 3600
+
+# File in the cache directory holding the size measured by the last sweep of any process
+SIZE_FILE = "size.json"
+
+def content_hash(*parts):
+    """SHA-256 of the parts, each str or bytes"""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part.encode("utf-8") if isinstance(part, str) else part
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+def pipeline_fingerprint(nlp):
+    """Identity of a spaCy pipeline: parsed documents are only reused by the pipeline that made them"""
+    meta = nlp.meta
+    return f"{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}:{'+'.join(nlp.pipe_names)}:spacy-{spacy.__version__}"
+
+class AnalysisCache:
+    """Content-addressed cache of every expensive stage of an analysis, stored on disk.
+
+    Extracted text is keyed by the hash of the uploaded file, parsed
+    documents (as DocBin bytes) by the hash of the text and the pipeline,
+    and analysis results by the hashes of the resume and job description
+    texts. A changed job description therefore reuses the resume's text and
+    parse. Entries are files whose modification time is bumped on every hit.
+
+    The size of the cache is estimated without listing it: the size the last
+    sweep measured, kept in SIZE_FILE, plus what this process wrote since.
+    Only when the estimate passes max_bytes by EVICT_MARGIN is the directory
+    walked and the least recently used entries deleted. Several processes
+    can share one directory; each counts only its own writes between sweeps,
+    so the cache can exceed the margin by what the others wrote meanwhile.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size_path = os.path.join(directory, SIZE_FILE)
+        self._written = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._swept = self._read_size()
+        if self._swept is None:
+            # A directory no sweep has measured yet, e.g. new or filled by older code
+            self._sweep()
+
+    def _path(self, stage, key):
+        return os.path.join(self.directory, stage, key[:2], key)
+
+    def _read_size(self):
+        """(bytes, sweep time) recorded by the last sweep, or None if there was none"""
+        try:
+            with open(self._size_path) as f:
+                recorded = json.load(f)
+            return recorded["bytes"], recorded["swept_at"]
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            return None
+
+    def get(self, stage, key):
+        """Stored bytes, or None on a miss"""
+        path = self._path(stage, key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            # Never stored, or evicted by this or another process
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, stage, key, data):
+        path = self._path(stage, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written under a private name and renamed, so readers never see a partial entry
+        staging_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(staging_path, "wb") as f:
+            f.write(data)
+        os.replace(staging_path, path)
+        with self._lock:
+            self._written += len(data)
+            if self._estimated_size() > self.max_bytes * (1 + EVICT_MARGIN):
+                # Another process may have swept since, which already counted what this one wrote before it
+                swept = self._read_size()
+                if swept != self._swept:
+                    self._swept, self._written = swept, 0
+                if self._estimated_size() > self.max_bytes * (1 + EVICT_MARGIN):
+                    self._sweep()
+
+    def _estimated_size(self):
+        return (self._swept[0] if self._swept else 0) + self._written
+
+    def _sweep(self):
+        """Measure the directory, delete least recently used entries once over the bound and record the size"""
+        entries = []
+        stale_before = time.time_ns() - STALE_STAGING_SECONDS * 10 ** 9
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                if path == self._size_path:
+                    continue
+                try:
+                    stat = os.stat(path)
+                    # Another writer's entry in flight, unless it was abandoned long ago
+                    if name.endswith(".tmp"):
+                        if stat.st_mtime_ns < stale_before:
+                            os.remove(path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        entries.sort()
+        size = sum(entry_size for _, entry_size, _ in entries)
+        if size > self.max_bytes:
+            for _, entry_size, path in entries:
+                if size <= self.max_bytes * EVICT_TO:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                size -= entry_size
+                self.evictions += 1
+
+        self._swept = (size, time.time_ns())
+        self._written = 0
+        os.makedirs(self.directory, exist_ok=True)
+        staging_path = f"{self._size_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(staging_path, "w") as f:
+            json.dump({"bytes": size, "swept_at": self._swept[1]}, f)
+        os.replace(staging_path, self._size_path)
+
+    def text_key(self, data):
+        return content_hash("text", data)
+
+    def doc_key(self, nlp, text):
+        return content_hash("doc", pipeline_fingerprint(nlp), text)
+
+    def analysis_key(self, nlp, resume_text, job_description, version):
+        return content_hash("analysis", str(version), pipeline_fingerprint(nlp),
+                            content_hash(resume_text), content_hash(job_description))
+
+    def get_doc(self, key, vocab):
+        data = self.get("doc", key)
+        if data is None:
+            return None
+        return next(DocBin().from_bytes(data).get_docs(vocab))
+
+    def put_doc(self, key, doc):
+        doc_bin = DocBin(store_user_data=False)
+        doc_bin.add(doc)
+        self.put("doc", key, doc_bin.to_bytes())
+
+    def get_json(self, stage, key):
+        data = self.get(stage, key)
+        return None if data is None else json.loads(data)
+
+    def put_json(self, stage, key, value):
+        self.put(stage, key, json.dumps(value).encode("utf-8"))
+
+    def text(self, data, extract):
+        """Text of a file's bytes, calling extract() only if this content was never extracted"""
+        key = self.text_key(data)
+        cached = self.get("text", key)
+        if cached is not None:
+            return cached.decode("utf-8")
+        text = extract()
+        if text is not None:
+            self.put("text", key, text.encode("utf-8"))
+        return text
+
+    def docs(self, nlp, texts):
+        """Parsed documents for the texts, running the pipeline once over those not cached"""
+        keys = [self.doc_key(nlp, text) for text in texts]
+        docs = [self.get_doc(key, nlp.vocab) for key in keys]
+        missing = [index for index, doc in enumerate(docs) if doc is None]
+        for index, doc in zip(missing, nlp.pipe([texts[index] for index in missing])):
+            self.put_doc(keys[index], doc)
+            docs[index] = doc
+        return docs
+
+    def analysis(self, nlp, resume_text, job_description, analyze, version):
+        """analyze(resume_doc, job_doc) for the texts, reusing the stored result or parsed documents"""
+        key = self.analysis_key(nlp, resume_text, job_description, version)
+        result = self.get_json("analysis", key)
+        if result is None:
+            result = analyze(*self.docs(nlp, [resume_text, job_description]))
+            self.put_json("analysis", key, result)
+        return result
+
+@functools.lru_cache(maxsize=None)
+def get_cache():
+    """Shared cache of this process, or None unless a cache directory is configured"""
+    if not CACHE_DIR or CACHE_MAX_BYTES <= 0:
+        return None
+    return AnalysisCache(CACHE_DIR, CACHE_MAX_BYTES)
@@ -1,20 +1,15 @@
 import streamlit as st
-import PyPDF2
-import pytesseract
-from PIL import Image
 import io
-import spacy
 import plotly.graph_objects as go
 import plotly.express as px
-import re
 import numpy as np
 from collections import Counter
 import pandas as pd
 from sklearn.feature_extraction.text import CountVectorizer
 import random
-
-# Load spaCy model
-nlp = spacy.load("en_core_web_sm")
+from analysis_cache import get_cache
+from resume_analysis import analyze_resume
+from resume_text import extract_text_from_image, extract_text_from_pdf
 
 # Updated color scheme for darker, aesthetic muted lilac and charcoal black
 COLORS = {
@@ -113,20 +108,6 @@ st.markdown(f"""
 </style>
 """, unsafe_allow_html=True)
 
-def extract_text_from_pdf(pdf_file):
-    """Extract text from uploaded PDF file"""
-    pdf_reader = PyPDF2.PdfReader(pdf_file)
-    text = ""
-    for page in pdf_reader.pages:
-        text += page.extract_text()
-    return text
-
-def extract_text_from_image(image_file):
-    """Extract text from uploaded image file"""
-    image = Image.open(image_file)
-    text = pytesseract.image_to_string(image)
-    return text
-
 def extract_resume_text(uploaded_file):
     """Extract text from resume file based on file type"""
     if uploaded_file is None:
@@ -134,236 +115,29 @@ def extract_resume_text(uploaded_file):
     
     file_type = uploaded_file.type
     if 'pdf' in file_type:
-        return extract_text_from_pdf(uploaded_file)
+        extract = extract_text_from_pdf
     elif 'image' in file_type:
-        return extract_text_from_image(uploaded_file)
+        extract = extract_text_from_image
     else:
         st.error("Unsupported file format. Please upload PDF, JPG, or PNG.")
         return None
-
-def analyze_resume(resume_text, job_description):
-    """Analyze resume against job description"""
-    if not resume_text or not job_description:
-        return None
-
-    # Process text with spaCy
-    resume_doc = nlp(resume_text)
-    job_doc = nlp(job_description)
-
-    # Extract key skills from job description
-    job_skills = extract_skills(job_doc)
-    resume_skills = extract_skills(resume_doc)
-
-    # Calculate metrics
-    metrics = calculate_metrics(resume_doc, job_doc, resume_skills, job_skills)
-
-    # Generate improvement suggestions
-    suggestions = generate_suggestions(metrics, resume_doc, job_doc)
-
-    # Resume structure
-    resume_structure = analyze_resume_structure(resume_text)
-
-    return {
-        "metrics": metrics,
-        "suggestions": suggestions,
-        "resume_structure": resume_structure,
-        "overall_rating": calculate_overall_rating(metrics)
-    }
-
-def extract_skills(doc):
-    """Extract potential skills from text"""
-    # This is a simple implementation - could be enhanced with a skills database
-    skills = []
-    for token in doc:
-        if token.pos_ in ["NOUN", "PROPN"] and len(token.text) > 2:
-            skills.append(token.text.lower())
-    return list(set(skills))
-
-def calculate_metrics(resume_doc, job_doc, resume_skills, job_skills):
-    """Calculate various metrics for resume analysis"""
-    # Keyword matching
-    keyword_match = calculate_keyword_match(resume_skills, job_skills)
-    
-    # ATS compatibility metrics
-    ats_metrics = analyze_ats_compatibility(resume_doc.text)
-    
-    # Content metrics
-    content_metrics = analyze_content(resume_doc)
     
-    # Combine all metrics
-    metrics = {
-        "keyword_match": keyword_match,
-        "ats_compatibility": ats_metrics,
-        "content_metrics": content_metrics
-    }
-    
-    return metrics
-
-def calculate_keyword_match(resume_skills, job_skills):
-    """Calculate keyword match percentage between resume and job description"""
-    if not job_skills:
-        return 0
-    
-    matched_skills = [skill for skill in resume_skills if skill in job_skills]
-    match_percentage = (len(matched_skills) / len(job_skills)) * 100
-    
-    return {
-        "percentage": min(match_percentage, 100),
-        "matched_skills": matched_skills,
-        "missing_skills": [skill for skill in job_skills if skill not in resume_skills]
-    }
-
-def analyze_ats_compatibility(resume_text):
-    """Analyze ATS compatibility of the resume"""
-    # Check for common ATS issues
-    has_tables = "table" in resume_text.lower()
-    has_images = len(re.findall(r'image|img|figure|pic', resume_text.lower())) > 0
-    has_headers_footers = len(re.findall(r'header|footer', resume_text.lower())) > 0
-    
-    # Check formatting
-    formatting_score = 85  # Base score, would be more sophisticated in a full implementation
-    if has_tables:
-        formatting_score -= 15
-    if has_images:
-        formatting_score -= 10
-    if has_headers_footers:
-        formatting_score -= 10
-    
-    return {
-        "formatting_score": max(formatting_score, 0),
-        "issues": {
-            "has_tables": has_tables,
-            "has_images": has_images,
-            "has_headers_footers": has_headers_footers
-        }
-    }
-
-def analyze_content(doc):
-    """Analyze content quality of the resume"""
-    # Count action verbs (simplified implementation)
-    action_verbs = ["achieved", "improved", "led", "managed", "developed", 
-                    "created", "implemented", "increased", "reduced", "resolved"]
-    action_verb_count = sum(1 for token in doc if token.text.lower() in action_verbs)
-    
-    # Calculate sentence length and complexity
-    sentences = list(doc.sents)
-    avg_sentence_length = sum(len(sent) for sent in sentences) / max(len(sentences), 1)
-    
-    # Section completeness (simplified)
-    key_sections = ["experience", "education", "skills"]
-    sections_present = sum(1 for section in key_sections if section in doc.text.lower())
-    section_completeness = (sections_present / len(key_sections)) * 100
-    
-    return {
-        "action_verb_count": action_verb_count,
-        "avg_sentence_length": avg_sentence_length,
-        "section_completeness": section_completeness
-    }
-
-def analyze_resume_structure(resume_text):
-    """Analyze resume structure for hierarchy chart"""
-    # Simplified implementation - in a real app, you'd use more sophisticated parsing
-    structure = {
-        "name": "Resume",
-        "children": []
-    }
-    
-    # Look for common resume sections
-    sections = {
-        "Contact Information": len(re.findall(r'email|phone|address', resume_text.lower())),
-        "Summary": len(re.findall(r'summary|objective|profile', resume_text.lower())),
-        "Experience": len(re.findall(r'experience|work|employment', resume_text.lower())),
-        "Education": len(re.findall(r'education|degree|university|college', resume_text.lower())),
-        "Skills": len(re.findall(r'skills|abilities|competencies', resume_text.lower())),
-        "Projects": len(re.findall(r'project', resume_text.lower())),
-        "Certifications": len(re.findall(r'certification|certificate', resume_text.lower())),
-    }
-    
-    # Add sections with mentions to the structure
-    for section, count in sections.items():
-        if count > 0:
-            structure["children"].append({
-                "name": section,
-                "value": count * 10  # Scale for better visualization
-            })
-    
-    return structure
-
-def calculate_overall_rating(metrics):
-    """Calculate overall ATS compatibility rating"""
-    # Weight different factors
-    keyword_weight = 0.4
-    ats_weight = 0.4
-    content_weight = 0.2
-    
-    # Calculate weighted scores
-    keyword_score = metrics["keyword_match"]["percentage"] * keyword_weight
-    ats_score = metrics["ats_compatibility"]["formatting_score"] * ats_weight
-    content_score = metrics["content_metrics"]["section_completeness"] * content_weight
-    
-    # Overall rating
-    overall = keyword_score + ats_score + content_score
-    
-    # Rating category
-    if overall >= 85:
-        category = "Excellent"
-    elif overall >= 70:
-        category = "Good"
-    elif overall >= 50:
-        category = "Needs Improvement"
-    else:
-        category = "Poor"
-    
-    return {
-        "score": overall,
-        "category": category
-    }
-
-def generate_suggestions(metrics, resume_doc, job_doc):
-    """Generate improvement suggestions based on analysis"""
-    suggestions = []
-    # Keyword suggestions
-    if metrics["keyword_match"]["percentage"] < 70:
-        missing = metrics["keyword_match"]["missing_skills"]
-        if missing:
-            suggestions.append({
-                "type": "keywords",
-                "title": "Add Missing Keywords",
-                "description": f"Include these keywords from the job description: {', '.join(missing[:5])}",
-                "impact": "high"
-            })
-    # ATS suggestions
-    ats_issues = metrics["ats_compatibility"]["issues"]
-    if ats_issues["has_tables"]:
-        suggestions.append({
-            "type": "ats",
-            "title": "Replace Tables with Bullet Points",
-            "description": "ATS systems often struggle to parse tables. Convert tabular data to bullet points for better compatibility.",
-            "impact": "high"
-        })
-    if ats_issues["has_images"]:
-        suggestions.append({
-            "type": "ats",
-            "title": "Minimize Use of Images",
-            "description": "ATS systems cannot read images. Ensure all important information is in text format.",
-            "impact": "medium"
-        })
-    # Content suggestions
-    if metrics["content_metrics"]["action_verb_count"] < 5:
-        suggestions.append({
-            "type": "content",
-            "title": "Use More Action Verbs",
-            "description": "Start bullet points with impactful action verbs like 'achieved', 'implemented', 'developed', 'increased', 'reduced'.",
-            "impact": "medium"
-        })
-    if metrics["content_metrics"]["section_completeness"] < 100:
-        suggestions.append({
-            "type": "structure",
-            "title": "Include All Key Sections",
-            "description": "Ensure your resume has all essential sections: Experience, Education, and Skills.",
-            "impact": "high"
-        })
-    return suggestions
+    # Skip PDF parsing and OCR for a file whose content was extracted before
+    cache = get_cache()
+    if cache is None:
+        return extract_text_in_memory(uploaded_file.getvalue(), extract.__name__, extract)
+    return cache.text(uploaded_file.getvalue(), lambda: extract(uploaded_file))
+
+# Without a configured disk cache, uploads are only remembered in this server's memory, for a bounded time
+@st.cache_data(max_entries=32, ttl=3600, show_spinner=False)
+def extract_text_in_memory(data, extractor, _extract):
+    """Text of an uploaded file's bytes, kept in memory only; extractor names _extract for the cache key"""
+    return _extract(io.BytesIO(data))
+
+@st.cache_data(max_entries=32, ttl=3600, show_spinner=False)
+def analyze_resume_in_memory(resume_text, job_description):
+    """analyze_resume, kept in memory only"""
+    return analyze_resume(resume_text, job_description)
 
 def create_radar_chart(metrics, overall_rating):
     """Create radar chart for resume metrics with dark background and neat style"""
@@ -476,7 +250,10 @@ def main():
         with st.spinner("Analyzing your resume and job description..."):
             resume_text = extract_resume_text(resume_file) if resume_file else ""
             if resume_text or job_description:
-                analysis_results = analyze_resume(resume_text, job_description)
+                if get_cache() is None:
+                    analysis_results = analyze_resume_in_memory(resume_text, job_description)
+                else:
+                    analysis_results = analyze_resume(resume_text, job_description)
                 st.markdown('<div class="section-card">', unsafe_allow_html=True)
                 st.header("🎯 Resume & Job Description Analysis")
 
@@ -0,0 +1,80 @@
+"""Speed of JobProfile keyword matching against the original list scans, and a check that percentages are identical.
+
+Skill lists are synthetic, so no spaCy model is needed. Run from the
+resumechecker directory:
+    python benchmarks/bench_keyword_match.py
+    python benchmarks/bench_keyword_match.py --resumes 5000 --job-skills 50 500 2000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_profile import JobProfile
+
+
+def list_keyword_match(resume_skills, job_skills):
+    """calculate_keyword_match as it was before JobProfile: list membership inside comprehensions"""
+    if not job_skills:
+        return 0
+    matched_skills = [skill for skill in resume_skills if skill in job_skills]
+    match_percentage = (len(matched_skills) / len(job_skills)) * 100
+    return {
+        "percentage": min(match_percentage, 100),
+        "matched_skills": matched_skills,
+        "missing_skills": [skill for skill in job_skills if skill not in resume_skills]
+    }
+
+
+def synthetic_skills(rng, vocabulary, count):
+    # Unique, like extract_skills output
+    return list(dict.fromkeys(rng.choices(vocabulary, k=count)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JobProfile versus list-based keyword matching")
+    parser.add_argument("--resumes", type=int, default=2000)
+    parser.add_argument("--resume-skills", type=int, default=300, help="Skill mentions drawn per resume")
+    parser.add_argument("--job-skills", type=int, nargs="+", default=[50, 500, 2000])
+    parser.add_argument("--vocabulary", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = [f"skill{index}" for index in range(args.vocabulary)]
+    resumes = [synthetic_skills(rng, vocabulary, args.resume_skills) for _ in range(args.resumes)]
+
+    print(f"{'job skills':>10} {'lists ms':>9} {'profile ms':>11} {'batch ms':>9} {'speedup':>8} {'identical':>10}")
+    for job_size in args.job_skills:
+        job_skills = synthetic_skills(rng, vocabulary, job_size)
+
+        start = time.perf_counter()
+        reference = [list_keyword_match(skills, job_skills) for skills in resumes]
+        list_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        profile = JobProfile.from_skills(job_skills)
+        matches = [profile.match(skills) for skills in resumes]
+        profile_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        percentages, _ = JobProfile.from_skills(job_skills).match_many(resumes)
+        batch_seconds = time.perf_counter() - start
+
+        identical = all(
+            expected["percentage"] == match["percentage"] == percentage
+            and set(expected["matched_skills"]) == set(match["matched_skills"])
+            and set(expected["missing_skills"]) == set(match["missing_skills"])
+            for expected, match, percentage in zip(reference, matches, percentages.tolist())
+        )
+        print(f"{len(job_skills):>10} {list_seconds * 1000:>9.1f} {profile_seconds * 1000:>11.1f} "
+              f"{batch_seconds * 1000:>9.1f} {list_seconds / profile_seconds:>7.1f}x {str(identical):>10}")
+        if not identical:
+            sys.exit("Percentages or skill lists differ from the list-based match")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Per-document speed of the lean analysis pipeline and a check that its metrics match the full one.
+
+The full pipeline is timed the way analyze_resume used to run it, one nlp
+call per text; the lean pipeline runs both texts through one nlp.pipe
+call. Run from the resumechecker directory, with RESUMECHECKER_SPACY_MODEL
+set if en_core_web_sm is not installed:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --pairs 500 --output pipeline.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_analysis import analyze_docs, load_nlp
+
+SKILLS = ["Python", "SQL", "pandas", "TensorFlow", "Docker", "Kubernetes", "AWS", "React", "Java", "Spark",
+          "Tableau", "Excel", "Git", "Linux", "statistics", "forecasting", "APIs", "microservices"]
+VERBS = ["Achieved", "Improved", "Led", "Managed", "Developed", "Created", "Implemented", "Increased", "Reduced",
+         "Resolved", "Built", "Designed", "Owned", "Supported"]
+OBJECTS = ["the data platform", "reporting pipelines", "a team of five engineers", "customer onboarding",
+           "the billing service", "model training jobs", "dashboards for finance", "release automation"]
+SECTIONS = ["Summary", "Experience", "Education", "Skills", "Projects", "Certifications"]
+
+
+def synthetic_resume(rng):
+    """Resume text in the shape PDF extraction returns: headings and bullet lines, some without full stops"""
+    lines = ["Jordan Example", "email: jordan@example.com | phone: 555 0100"]
+    for section in rng.sample(SECTIONS, rng.randint(3, len(SECTIONS))):
+        lines.append(section)
+        for _ in range(rng.randint(2, 6)):
+            bullet = (f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)} and "
+                      f"{rng.choice(SKILLS)}, saving {rng.randint(5, 60)}% of time")
+            lines.append("• " + bullet + rng.choice([".", ".", ""]))
+    return "\n".join(lines)
+
+
+def synthetic_job_description(rng):
+    skills = ", ".join(rng.sample(SKILLS, 6))
+    return (f"We are hiring an engineer to work on {rng.choice(OBJECTS)}. Experience with {skills} is required. "
+            f"You will collaborate with product and design teams. A degree in computer science is a plus.")
+
+
+def rating_metrics(result):
+    """Every metric analyze_docs reports, and the rating and suggestions built from them"""
+    metrics = result["metrics"]
+    return {
+        "keyword_match": metrics["keyword_match"],
+        "ats_compatibility": metrics["ats_compatibility"],
+        "action_verb_count": metrics["content_metrics"]["action_verb_count"],
+        "avg_sentence_length": metrics["content_metrics"]["avg_sentence_length"],
+        "section_completeness": metrics["content_metrics"]["section_completeness"],
+        "overall_rating": result["overall_rating"],
+        "suggestions": result["suggestions"],
+        "resume_structure": result["resume_structure"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lean versus full spaCy pipeline for resume analysis")
+    parser.add_argument("--pairs", type=int, default=200, help="Resume and job description pairs to analyze")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pairs = [(synthetic_resume(rng), synthetic_job_description(rng)) for _ in range(args.pairs)]
+    full, lean = load_nlp("full"), load_nlp("lean")
+
+    # Warm up both pipelines so model initialisation is not timed
+    for nlp in (full, lean):
+        list(nlp.pipe(pairs[0]))
+
+    full_seconds, lean_seconds, unchanged = [], [], 0
+    for resume_text, job_description in pairs:
+        start = time.perf_counter()
+        full_docs = (full(resume_text), full(job_description))
+        full_seconds.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        lean_docs = tuple(lean.pipe([resume_text, job_description]))
+        lean_seconds.append(time.perf_counter() - start)
+
+        full_result, lean_result = analyze_docs(*full_docs), analyze_docs(*lean_docs)
+        unchanged += rating_metrics(full_result) == rating_metrics(lean_result)
+
+    # Two documents per pair
+    full_ms = float(np.median(full_seconds)) * 1000 / 2
+    lean_ms = float(np.median(lean_seconds)) * 1000 / 2
+    report = {
+        "pairs": args.pairs,
+        "full_pipeline": full.pipe_names,
+        "lean_pipeline": lean.pipe_names,
+        "full_ms_per_doc": round(full_ms, 3),
+        "lean_ms_per_doc": round(lean_ms, 3),
+        "speedup": round(full_ms / lean_ms, 2),
+        "metrics_unchanged": unchanged,
+    }
+
+    print(f"full  {' > '.join(full.pipe_names)}: {full_ms:.2f} ms/doc")
+    print(f"lean  {' > '.join(lean.pipe_names)}: {lean_ms:.2f} ms/doc ({report['speedup']:.2f}x faster)")
+    print(f"metrics unchanged for {unchanged}/{args.pairs} pairs")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
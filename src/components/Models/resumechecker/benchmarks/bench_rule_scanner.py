@@ -0,0 +1,88 @@
+"""Speed of the one-pass keyword rule scan against the separate lower() and re.findall passes it replaced.
+
+Also checks that the ATS, structure and section completeness results are
+identical. Texts are synthetic, so no spaCy model is needed. Run from the
+resumechecker directory:
+    python benchmarks/bench_rule_scanner.py
+    python benchmarks/bench_rule_scanner.py --texts 500 --words 200 2000 20000 --keyword-share 0.1
+"""
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_analysis import KEY_SECTIONS, RESUME_RULES, analyze_ats_compatibility
+
+
+def separate_pass_checks(resume_text):
+    """The keyword checks as they were before RuleScanner: a lower() and a pass over the text per check"""
+    has_tables = "table" in resume_text.lower()
+    has_images = len(re.findall(r'image|img|figure|pic', resume_text.lower())) > 0
+    has_headers_footers = len(re.findall(r'header|footer', resume_text.lower())) > 0
+    sections = {
+        "Contact Information": len(re.findall(r'email|phone|address', resume_text.lower())),
+        "Summary": len(re.findall(r'summary|objective|profile', resume_text.lower())),
+        "Experience": len(re.findall(r'experience|work|employment', resume_text.lower())),
+        "Education": len(re.findall(r'education|degree|university|college', resume_text.lower())),
+        "Skills": len(re.findall(r'skills|abilities|competencies', resume_text.lower())),
+        "Projects": len(re.findall(r'project', resume_text.lower())),
+        "Certifications": len(re.findall(r'certification|certificate', resume_text.lower())),
+    }
+    sections_present = sum(1 for section in ["experience", "education", "skills"] if section in resume_text.lower())
+    # The structure chart only shows sections that are mentioned
+    sections = {name: count for name, count in sections.items() if count > 0}
+    return has_tables, has_images, has_headers_footers, sections, sections_present
+
+
+def scanned_checks(resume_text):
+    """The same results from one RESUME_RULES scan"""
+    rule_counts = RESUME_RULES.scan(resume_text)
+    ats = analyze_ats_compatibility(resume_text, rule_counts)["issues"]
+    sections = {name: count for (group, name), count in rule_counts.items() if group == "section" and count > 0}
+    sections_present = sum(1 for section in KEY_SECTIONS if rule_counts[("key_section", section)])
+    return ats["has_tables"], ats["has_images"], ats["has_headers_footers"], sections, sections_present
+
+
+def synthetic_text(rng, keywords, filler, words, keyword_share):
+    chosen = [rng.choice(keywords) if rng.random() < keyword_share else rng.choice(filler) for _ in range(words)]
+    return " ".join(word.capitalize() if rng.random() < 0.2 else word for word in chosen)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="One-pass rule scan versus separate regex passes")
+    parser.add_argument("--texts", type=int, default=200)
+    parser.add_argument("--words", type=int, nargs="+", default=[300, 3000, 30000], help="Words per text")
+    parser.add_argument("--keyword-share", type=float, default=0.03, help="Share of words that are rule keywords")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keywords = [keyword for rule in RESUME_RULES.rules.values() for keyword in rule]
+    filler = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(2000)]
+
+    print(f"{'words':>7} {'passes ms':>10} {'scanner ms':>11} {'speedup':>8} {'identical':>10}")
+    for words in args.words:
+        texts = [synthetic_text(rng, keywords, filler, words, args.keyword_share) for _ in range(args.texts)]
+
+        start = time.perf_counter()
+        reference = [separate_pass_checks(text) for text in texts]
+        passes_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scanned = [scanned_checks(text) for text in texts]
+        scanner_seconds = time.perf_counter() - start
+
+        identical = reference == scanned
+        print(f"{words:>7} {passes_seconds * 1000:>10.1f} {scanner_seconds * 1000:>11.1f} "
+              f"{passes_seconds / scanner_seconds:>7.1f}x {str(identical):>10}")
+        if not identical:
+            sys.exit("Rule results differ from the separate regex passes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+from collections import Counter
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+def skill_tokens(doc):
+    """Lowercased nouns and proper nouns longer than two characters, in text order with repeats"""
+    return [token.text.lower() for token in doc if token.pos_ in ("NOUN", "PROPN") and len(token.text) > 2]
+
+class JobProfile:
+    """Skills of one job description, compiled once for matching any number of resumes against it.
+
+    Holds the skill -> column table, each skill's frequency in the job
+    description and the totals the scores are normalized by, so matching a
+    resume is one set lookup per resume skill. Skills are ordered by
+    frequency, then by first appearance, which is the order missing skills
+    are suggested in.
+    """
+
+    def __init__(self, skill_counts):
+        ordered = sorted(skill_counts.items(), key=lambda item: -item[1])
+        self.skills = [skill for skill, _ in ordered]
+        self.columns = {skill: column for column, skill in enumerate(self.skills)}
+        self.frequencies = np.array([count for _, count in ordered], dtype=np.float64)
+        self.total_frequency = self.frequencies.sum()
+
+    @classmethod
+    def from_doc(cls, doc):
+        return cls(Counter(skill_tokens(doc)))
+
+    @classmethod
+    def from_skills(cls, skills):
+        """Profile of an already extracted skill list, every skill counted once"""
+        return cls(dict.fromkeys(skills, 1))
+
+    def __len__(self):
+        return len(self.skills)
+
+    def _percentage(self, matched_count):
+        # Same operations as the original list-based match, so percentages are bit-for-bit identical
+        return min((matched_count / len(self.skills)) * 100, 100)
+
+    def match(self, resume_skills):
+        """Keyword match of one resume's skills, in O(len(resume_skills))"""
+        matched_columns = sorted({self.columns[skill] for skill in resume_skills if skill in self.columns})
+        matched = set(matched_columns)
+        return {
+            "percentage": self._percentage(len(matched_columns)) if self.skills else 0,
+            "weighted_percentage": (float(self.frequencies[matched_columns].sum() / self.total_frequency * 100)
+                                    if self.skills else 0),
+            "matched_skills": [self.skills[column] for column in matched_columns],
+            "missing_skills": [skill for column, skill in enumerate(self.skills) if column not in matched],
+        }
+
+    def indicator_matrix(self, skill_lists):
+        """Sparse resumes x profile skills matrix with a 1 where the resume has the skill"""
+        indptr, indices = [0], []
+        for skills in skill_lists:
+            indices.extend({self.columns[skill] for skill in skills if skill in self.columns})
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.float64)
+        return csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, len(self.skills)))
+
+    def match_many(self, skill_lists):
+        """(percentages, weighted_percentages) of many resumes at once, as two sparse products"""
+        if not self.skills:
+            return np.zeros(len(skill_lists)), np.zeros(len(skill_lists))
+        indicator = self.indicator_matrix(skill_lists)
+        matched_counts = indicator @ np.ones(len(self.skills))
+        percentages = np.minimum(matched_counts / len(self.skills) * 100, 100)
+        weighted_percentages = indicator @ self.frequencies / self.total_frequency * 100
+        return percentages, weighted_percentages
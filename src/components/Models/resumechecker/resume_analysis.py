@@ -0,0 +1,276 @@
+import functools
+import os
+
+import spacy
+
+from analysis_cache import get_cache
+from job_profile import JobProfile, skill_tokens
+from rule_scanner import RuleScanner
+
+# spaCy model used for analysis, a package name or a path to a saved pipeline
+SPACY_MODEL = os.environ.get("RESUMECHECKER_SPACY_MODEL", "en_core_web_sm")
+
+# "full" runs every component of the model; "lean" runs only what the metrics read: POS tags for
+# extract_skills and the parser's sentence boundaries for analyze_content, so every metric is the same
+ANALYSIS_MODE = os.environ.get("RESUMECHECKER_ANALYSIS_MODE", "full")
+ANALYSIS_MODES = ["full", "lean"]
+
+# Bump when a metric changes, so results cached by earlier code are not reused
+ANALYSIS_VERSION = 2
+
+# Sections whose presence makes up section completeness
+KEY_SECTIONS = ["experience", "education", "skills"]
+
+# Keyword rules behind the ATS, structure and section checks, all counted in one pass over the resume
+RESUME_RULES = RuleScanner({
+    ("ats", "tables"): ["table"],
+    ("ats", "images"): ["image", "img", "figure", "pic"],
+    ("ats", "headers_footers"): ["header", "footer"],
+    ("section", "Contact Information"): ["email", "phone", "address"],
+    ("section", "Summary"): ["summary", "objective", "profile"],
+    ("section", "Experience"): ["experience", "work", "employment"],
+    ("section", "Education"): ["education", "degree", "university", "college"],
+    ("section", "Skills"): ["skills", "abilities", "competencies"],
+    ("section", "Projects"): ["project"],
+    ("section", "Certifications"): ["certification", "certificate"],
+    **{("key_section", section): [section] for section in KEY_SECTIONS},
+})
+
+# Components of the model that no metric reads; the parser stays, since avg_sentence_length reads its sentences
+LEAN_EXCLUDE = ["ner", "lemmatizer"]
+
+def load_nlp(mode=ANALYSIS_MODE, model=SPACY_MODEL):
+    """Load the spaCy pipeline for an analysis mode"""
+    if mode == "lean":
+        return spacy.load(model, exclude=LEAN_EXCLUDE)
+    return spacy.load(model)
+
+@functools.lru_cache(maxsize=None)
+def get_nlp(mode=ANALYSIS_MODE):
+    """Shared spaCy pipeline for an analysis mode, loaded on first use"""
+    return load_nlp(mode)
+
+def analyze_resume(resume_text, job_description):
+    """Analyze resume against job description"""
+    if not resume_text or not job_description:
+        return None
+
+    # Reuse the stored result, or the stored parse of either text, when the same content was analyzed before
+    nlp = get_nlp()
+    cache = get_cache()
+    if cache is not None:
+        return cache.analysis(nlp, resume_text, job_description, analyze_docs, ANALYSIS_VERSION)
+
+    # Process both texts with spaCy in one batch
+    resume_doc, job_doc = nlp.pipe([resume_text, job_description])
+    return analyze_docs(resume_doc, job_doc)
+
+def analyze_docs(resume_doc, job_doc, job_profile=None):
+    """Analyze a parsed resume against a parsed job description"""
+    # Compile the job's skills, unless the caller matches many resumes against one profile
+    if job_profile is None:
+        job_profile = JobProfile.from_doc(job_doc)
+    resume_skills = extract_skills(resume_doc)
+
+    # Count every keyword rule in a single scan of the resume text
+    rule_counts = RESUME_RULES.scan(resume_doc.text)
+
+    # Calculate metrics
+    metrics = calculate_metrics(resume_doc, job_doc, resume_skills, job_profile, rule_counts)
+
+    # Generate improvement suggestions
+    suggestions = generate_suggestions(metrics, resume_doc, job_doc)
+
+    # Resume structure
+    resume_structure = analyze_resume_structure(resume_doc.text, rule_counts)
+
+    return {
+        "metrics": metrics,
+        "suggestions": suggestions,
+        "resume_structure": resume_structure,
+        "overall_rating": calculate_overall_rating(metrics)
+    }
+
+def extract_skills(doc):
+    """Extract potential skills from text"""
+    # This is a simple implementation - could be enhanced with a skills database
+    # Unique skills in order of first appearance
+    return list(dict.fromkeys(skill_tokens(doc)))
+
+def calculate_metrics(resume_doc, job_doc, resume_skills, job_profile, rule_counts=None):
+    """Calculate various metrics for resume analysis"""
+    if rule_counts is None:
+        rule_counts = RESUME_RULES.scan(resume_doc.text)
+    
+    # Keyword matching
+    keyword_match = job_profile.match(resume_skills)
+    
+    # ATS compatibility metrics
+    ats_metrics = analyze_ats_compatibility(resume_doc.text, rule_counts)
+    
+    # Content metrics
+    content_metrics = analyze_content(resume_doc, rule_counts)
+    
+    # Combine all metrics
+    metrics = {
+        "keyword_match": keyword_match,
+        "ats_compatibility": ats_metrics,
+        "content_metrics": content_metrics
+    }
+    
+    return metrics
+
+def calculate_keyword_match(resume_skills, job_skills):
+    """Calculate keyword match percentage between resume and job description"""
+    return JobProfile.from_skills(job_skills).match(resume_skills)
+
+def analyze_ats_compatibility(resume_text, rule_counts=None):
+    """Analyze ATS compatibility of the resume"""
+    if rule_counts is None:
+        rule_counts = RESUME_RULES.scan(resume_text)
+    
+    # Check for common ATS issues
+    has_tables = rule_counts[("ats", "tables")] > 0
+    has_images = rule_counts[("ats", "images")] > 0
+    has_headers_footers = rule_counts[("ats", "headers_footers")] > 0
+    
+    # Check formatting
+    formatting_score = 85  # Base score, would be more sophisticated in a full implementation
+    if has_tables:
+        formatting_score -= 15
+    if has_images:
+        formatting_score -= 10
+    if has_headers_footers:
+        formatting_score -= 10
+    
+    return {
+        "formatting_score": max(formatting_score, 0),
+        "issues": {
+            "has_tables": has_tables,
+            "has_images": has_images,
+            "has_headers_footers": has_headers_footers
+        }
+    }
+
+def analyze_content(doc, rule_counts=None):
+    """Analyze content quality of the resume"""
+    if rule_counts is None:
+        rule_counts = RESUME_RULES.scan(doc.text)
+    
+    # Count action verbs (simplified implementation)
+    action_verbs = ["achieved", "improved", "led", "managed", "developed", 
+                    "created", "implemented", "increased", "reduced", "resolved"]
+    action_verb_count = sum(1 for token in doc if token.text.lower() in action_verbs)
+    
+    # Calculate sentence length and complexity
+    sentences = list(doc.sents)
+    avg_sentence_length = sum(len(sent) for sent in sentences) / max(len(sentences), 1)
+    
+    # Section completeness (simplified)
+    sections_present = sum(1 for section in KEY_SECTIONS if rule_counts[("key_section", section)])
+    section_completeness = (sections_present / len(KEY_SECTIONS)) * 100
+    
+    return {
+        "action_verb_count": action_verb_count,
+        "avg_sentence_length": avg_sentence_length,
+        "section_completeness": section_completeness
+    }
+
+def analyze_resume_structure(resume_text, rule_counts=None):
+    """Analyze resume structure for hierarchy chart"""
+    # Simplified implementation - in a real app, you'd use more sophisticated parsing
+    structure = {
+        "name": "Resume",
+        "children": []
+    }
+    
+    # Look for common resume sections
+    if rule_counts is None:
+        rule_counts = RESUME_RULES.scan(resume_text)
+    sections = {name: count for (group, name), count in rule_counts.items() if group == "section"}
+    
+    # Add sections with mentions to the structure
+    for section, count in sections.items():
+        if count > 0:
+            structure["children"].append({
+                "name": section,
+                "value": count * 10  # Scale for better visualization
+            })
+    
+    return structure
+
+def calculate_overall_rating(metrics):
+    """Calculate overall ATS compatibility rating"""
+    # Weight different factors
+    keyword_weight = 0.4
+    ats_weight = 0.4
+    content_weight = 0.2
+    
+    # Calculate weighted scores
+    keyword_score = metrics["keyword_match"]["percentage"] * keyword_weight
+    ats_score = metrics["ats_compatibility"]["formatting_score"] * ats_weight
+    content_score = metrics["content_metrics"]["section_completeness"] * content_weight
+    
+    # Overall rating
+    overall = keyword_score + ats_score + content_score
+    
+    # Rating category
+    if overall >= 85:
+        category = "Excellent"
+    elif overall >= 70:
+        category = "Good"
+    elif overall >= 50:
+        category = "Needs Improvement"
+    else:
+        category = "Poor"
+    
+    return {
+        "score": overall,
+        "category": category
+    }
+
+def generate_suggestions(metrics, resume_doc, job_doc):
+    """Generate improvement suggestions based on analysis"""
+    suggestions = []
+    # Keyword suggestions
+    if metrics["keyword_match"]["percentage"] < 70:
+        missing = metrics["keyword_match"]["missing_skills"]
+        if missing:
+            suggestions.append({
+                "type": "keywords",
+                "title": "Add Missing Keywords",
+                "description": f"Include these keywords from the job description: {', '.join(missing[:5])}",
+                "impact": "high"
+            })
+    # ATS suggestions
+    ats_issues = metrics["ats_compatibility"]["issues"]
+    if ats_issues["has_tables"]:
+        suggestions.append({
+            "type": "ats",
+            "title": "Replace Tables with Bullet Points",
+            "description": "ATS systems often struggle to parse tables. Convert tabular data to bullet points for better compatibility.",
+            "impact": "high"
+        })
+    if ats_issues["has_images"]:
+        suggestions.append({
+            "type": "ats",
+            "title": "Minimize Use of Images",
+            "description": "ATS systems cannot read images. Ensure all important information is in text format.",
+            "impact": "medium"
+        })
+    # Content suggestions
+    if metrics["content_metrics"]["action_verb_count"] < 5:
+        suggestions.append({
+            "type": "content",
+            "title": "Use More Action Verbs",
+            "description": "Start bullet points with impactful action verbs like 'achieved', 'implemented', 'developed', 'increased', 'reduced'.",
+            "impact": "medium"
+        })
+    if metrics["content_metrics"]["section_completeness"] < 100:
+        suggestions.append({
+            "type": "structure",
+            "title": "Include All Key Sections",
+            "description": "Ensure your resume has all essential sections: Experience, Education, and Skills.",
+            "impact": "high"
+        })
+    return suggestions
@@ -0,0 +1,34 @@
+import os
+
+import PyPDF2
+import pytesseract
+from PIL import Image
+
+# Resume file types by extension, for reading files from disk
+PDF_EXTENSIONS = [".pdf"]
+IMAGE_EXTENSIONS = [".png", ".jpg", ".jpeg"]
+RESUME_EXTENSIONS = PDF_EXTENSIONS + IMAGE_EXTENSIONS
+
+def extract_text_from_pdf(pdf_file):
+    """Extract text from uploaded PDF file"""
+    pdf_reader = PyPDF2.PdfReader(pdf_file)
+    text = ""
+    for page in pdf_reader.pages:
+        text += page.extract_text()
+    return text
+
+def extract_text_from_image(image_file):
+    """Extract text from uploaded image file"""
+    image = Image.open(image_file)
+    text = pytesseract.image_to_string(image)
+    return text
+
+def extract_text_from_path(path):
+    """Extract text from a resume file on disk based on its extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in PDF_EXTENSIONS:
+        with open(path, "rb") as f:
+            return extract_text_from_pdf(f)
+    if extension in IMAGE_EXTENSIONS:
+        return extract_text_from_image(path)
+    raise ValueError(f"Unsupported file format: {extension or path}")
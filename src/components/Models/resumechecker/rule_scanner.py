@@ -0,0 +1,57 @@
+import re
+
+class RuleScanner:
+    """Counts many keyword rules over a text with one regex pass.
+
+    Each rule is a list of keywords and counts like
+    len(re.findall("|".join(keywords), text.lower())): non-overlapping
+    matches, with earlier keywords preferred where several start at the same
+    place. All keywords of all rules are compiled into one alternation, so
+    adding a rule adds no pass over the text. After a match the search
+    resumes at the first position inside it where another keyword could
+    start, so overlapping matches of different rules are still all seen.
+    """
+
+    def __init__(self, rules):
+        self.rules = {name: list(keywords) for name, keywords in rules.items()}
+        keywords = sorted({keyword for rule in self.rules.values() for keyword in rule}, key=lambda k: (-len(k), k))
+
+        # Longest first, so the keyword found at a position is the longest one starting there
+        self._pattern = re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+        # keyword found -> (rule, length of the rule's keyword) for every rule with a keyword starting there;
+        # those keywords are the prefixes of the one found, and each rule takes its most preferred
+        self._hits = {}
+        for found in keywords:
+            hits = {}
+            for name, rule in self.rules.items():
+                for keyword in rule:
+                    if found.startswith(keyword):
+                        hits[name] = len(keyword)
+                        break
+            self._hits[found] = list(hits.items())
+
+        # keyword found -> offset of the first position inside it where any keyword could also start
+        self._resume_at = {
+            found: next((offset for offset in range(1, len(found))
+                         if any(other.startswith(found[offset:]) or found[offset:].startswith(other)
+                                for other in keywords)), len(found))
+            for found in keywords
+        }
+
+    def scan(self, text):
+        """Match count of every rule in the text, lowercased once"""
+        text = text.lower()
+        counts = dict.fromkeys(self.rules, 0)
+        ends = dict.fromkeys(self.rules, 0)
+        search = self._pattern.search
+        match = search(text)
+        while match is not None:
+            start, found = match.start(), match.group()
+            for name, length in self._hits[found]:
+                # Skipped where the rule's previous match still covers this position
+                if start >= ends[name]:
+                    counts[name] += 1
+                    ends[name] = start + length
+            match = search(text, start + self._resume_at[found])
+        return counts
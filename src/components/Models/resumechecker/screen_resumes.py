@@ -0,0 +1,276 @@
+"""Score a folder of resumes against one job description, without the Streamlit page.
+
+    python screen_resumes.py resumes/ --job-description job.txt                  # writes screening.csv
+    python screen_resumes.py resumes/ --job-description job.txt --output screening.parquet \\
+        --workers 8 --nlp-processes 4 --mode lean
+
+Text is extracted across --workers processes and parsed by spaCy with
+nlp.pipe(n_process=--nlp-processes). The job description is parsed once.
+One row of metrics per resume is written as results come in, every
+--batch-size resumes. Rerunning the same command after a crash or Ctrl-C
+skips resumes already in the output. Files that cannot be read get a row
+with the error instead of stopping the run. With RESUMECHECKER_CACHE_DIR
+set, extracted text, parses and results are kept in the analysis cache,
+so screening the same folder against a revised job description only
+reruns the metrics.
+"""
+import argparse
+import csv
+import glob
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from analysis_cache import get_cache
+from job_profile import JobProfile
+from resume_analysis import ANALYSIS_MODE, ANALYSIS_MODES, ANALYSIS_VERSION, analyze_docs, extract_skills, load_nlp
+from resume_text import RESUME_EXTENSIONS, extract_text_from_path
+
+# Columns of the screening output, one row per resume
+SCHEMA = pa.schema([
+    ("file", pa.string()),
+    ("overall_score", pa.float64()),
+    ("category", pa.string()),
+    ("keyword_match", pa.float64()),
+    ("formatting_score", pa.float64()),
+    ("section_completeness", pa.float64()),
+    ("action_verb_count", pa.int64()),
+    ("avg_sentence_length", pa.float64()),
+    ("matched_skills", pa.string()),
+    ("missing_skills", pa.string()),
+    ("error", pa.string()),
+])
+
+
+def find_resumes(folder):
+    """Resume files under the folder, as sorted paths relative to it"""
+    paths = glob.glob(os.path.join(folder, "**", "*"), recursive=True)
+    return sorted(os.path.relpath(path, folder) for path in paths
+                  if os.path.splitext(path)[1].lower() in RESUME_EXTENSIONS and os.path.isfile(path))
+
+
+def extract_file(folder, name):
+    """(name, text, error) for one resume; runs in the extraction pool"""
+    path = os.path.join(folder, name)
+    try:
+        cache = get_cache()
+        if cache is None:
+            return name, extract_text_from_path(path), None
+        with open(path, "rb") as f:
+            return name, cache.text(f.read(), lambda: extract_text_from_path(path)), None
+    except Exception as error:
+        return name, "", f"{type(error).__name__}: {error}"
+
+
+def result_row(name, result):
+    metrics = result["metrics"]
+    keyword_match = metrics["keyword_match"]
+    return {
+        "file": name,
+        "overall_score": result["overall_rating"]["score"],
+        "category": result["overall_rating"]["category"],
+        "keyword_match": keyword_match["percentage"],
+        "formatting_score": metrics["ats_compatibility"]["formatting_score"],
+        "section_completeness": metrics["content_metrics"]["section_completeness"],
+        "action_verb_count": metrics["content_metrics"]["action_verb_count"],
+        "avg_sentence_length": metrics["content_metrics"]["avg_sentence_length"],
+        "matched_skills": ", ".join(sorted(keyword_match["matched_skills"])),
+        "missing_skills": ", ".join(sorted(keyword_match["missing_skills"])),
+        "error": None,
+    }
+
+
+def error_row(name, error):
+    return dict({column: None for column in SCHEMA.names}, file=name, error=error)
+
+
+class CsvResultWriter:
+    """Appends rows to a CSV file, synced to disk after every batch"""
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        if os.path.exists(path):
+            self._drop_partial_line()
+            with open(path, newline="") as f:
+                self.done = {row["file"] for row in csv.DictReader(f)}
+        self._file = open(path, "a", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=SCHEMA.names)
+        if not self._file.tell():
+            self._writer.writeheader()
+
+    def _drop_partial_line(self):
+        # A crash mid-write can leave a last row without its newline
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+        with open(self.path, newline="") as f:
+            return list(csv.DictReader(f))
+
+
+class ParquetResultWriter:
+    """Writes each batch as its own part file, combined into the output when the run completes.
+
+    A Parquet file is unreadable until its footer is written, so rows are
+    checkpointed as complete part files in <output>.parts instead.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.parts_dir = path + ".parts"
+        os.makedirs(self.parts_dir, exist_ok=True)
+        self.done = set()
+        for table in self._tables():
+            self.done.update(table.column("file").to_pylist())
+        self._next_part = len(glob.glob(os.path.join(self.parts_dir, "part-*.parquet")))
+
+    def _tables(self):
+        paths = sorted(glob.glob(os.path.join(self.parts_dir, "part-*.parquet")))
+        if os.path.exists(self.path):
+            paths.insert(0, self.path)
+        return [pq.read_table(path, schema=SCHEMA) for path in paths]
+
+    def write(self, rows):
+        if not rows:
+            return
+        part_path = os.path.join(self.parts_dir, f"part-{self._next_part:06d}.parquet")
+        pq.write_table(pa.Table.from_pylist(rows, schema=SCHEMA), part_path + ".tmp")
+        os.replace(part_path + ".tmp", part_path)
+        self._next_part += 1
+
+    def close(self):
+        tables = self._tables()
+        table = pa.concat_tables(tables) if tables else SCHEMA.empty_table()
+        pq.write_table(table, self.path + ".tmp")
+        os.replace(self.path + ".tmp", self.path)
+        shutil.rmtree(self.parts_dir)
+        return table.to_pylist()
+
+
+def open_writer(path):
+    if path.endswith(".parquet"):
+        return ParquetResultWriter(path)
+    return CsvResultWriter(path)
+
+
+def screen(folder, names, job_doc, nlp, writer, workers=1, nlp_processes=1, batch_size=64, progress=None):
+    """Analyze the resumes against the parsed job description, writing rows to the writer as they finish.
+
+    Resumes analyzed against the same job description before are answered
+    from the cache, and resumes parsed before skip spaCy; only the rest go
+    through nlp.pipe. progress(written) is called after every write.
+    """
+    cache = get_cache()
+    job_profile = JobProfile.from_doc(job_doc)
+    pending = []
+    written = 0
+
+    def flush(force=False):
+        nonlocal pending, written
+        if pending and (force or len(pending) >= batch_size):
+            writer.write(pending)
+            written += len(pending)
+            pending = []
+            if progress is not None:
+                progress(written)
+
+    def analyze(name, doc, analysis_key):
+        result = analyze_docs(doc, job_doc, job_profile)
+        if cache is not None:
+            cache.put_json("analysis", analysis_key, result)
+        pending.append(result_row(name, result))
+        flush()
+
+    def texts(extracted):
+        # Only resumes without a cached result or parse reach spaCy
+        for name, text, error in extracted:
+            if not text or not text.strip():
+                pending.append(error_row(name, error or "No text could be extracted"))
+                flush()
+                continue
+            if cache is None:
+                yield text, (name, None, None)
+                continue
+            analysis_key = cache.analysis_key(nlp, text, job_doc.text, ANALYSIS_VERSION)
+            result = cache.get_json("analysis", analysis_key)
+            if result is not None:
+                pending.append(result_row(name, result))
+                flush()
+                continue
+            doc_key = cache.doc_key(nlp, text)
+            doc = cache.get_doc(doc_key, nlp.vocab)
+            if doc is not None:
+                analyze(name, doc, analysis_key)
+                continue
+            yield text, (name, analysis_key, doc_key)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        extracted = pool.map(extract_file, [folder] * len(names), names, chunksize=max(1, batch_size // workers))
+        for doc, (name, analysis_key, doc_key) in nlp.pipe(texts(extracted), as_tuples=True,
+                                                           n_process=nlp_processes, batch_size=batch_size):
+            if cache is not None:
+                cache.put_doc(doc_key, doc)
+            analyze(name, doc, analysis_key)
+    flush(force=True)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a folder of resumes against one job description")
+    parser.add_argument("folder", help="Folder of PDF, PNG and JPG resumes, searched recursively")
+    parser.add_argument("--job-description", required=True, help="Text file with the job description")
+    parser.add_argument("--output", default="screening.csv", help="CSV or Parquet file of per-resume metrics")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Processes extracting text")
+    parser.add_argument("--nlp-processes", type=int, default=1, help="Processes running the spaCy pipeline")
+    parser.add_argument("--batch-size", type=int, default=64, help="Resumes per spaCy batch and per output write")
+    parser.add_argument("--mode", choices=ANALYSIS_MODES, default=ANALYSIS_MODE, help="spaCy pipeline to run")
+    parser.add_argument("--top", type=int, default=10, help="Print the best scoring resumes when done")
+    args = parser.parse_args()
+
+    with open(args.job_description) as f:
+        job_description = f.read()
+    nlp = load_nlp(args.mode)
+    job_doc = nlp(job_description)
+    if not extract_skills(job_doc):
+        sys.exit(f"No skills found in {args.job_description}")
+
+    writer = open_writer(args.output)
+    names = [name for name in find_resumes(args.folder) if name not in writer.done]
+    print(f"{len(writer.done)} resumes already screened, {len(names)} to go")
+
+    start = time.perf_counter()
+
+    def progress(written):
+        elapsed = time.perf_counter() - start
+        print(f"{written}/{len(names)} resumes, {written / max(elapsed, 1e-9):.1f} resumes/s", file=sys.stderr)
+
+    written = screen(args.folder, names, job_doc, nlp, writer, args.workers, args.nlp_processes, args.batch_size,
+                     progress)
+    rows = writer.close()
+
+    elapsed = time.perf_counter() - start
+    errors = sum(1 for row in rows if row["error"])
+    print(f"Screened {written} resumes in {elapsed:.1f}s ({written / max(elapsed, 1e-9):.1f} resumes/s), "
+          f"{errors} unreadable; {len(rows)} rows in {args.output}")
+
+    scored = sorted((row for row in rows if not row["error"]), key=lambda row: -float(row["overall_score"]))
+    for row in scored[:args.top]:
+        print(f"{float(row['overall_score']):6.1f}  {row['category']:<17} {row['file']}")
+
+
+if __name__ == "__main__":
+    main()
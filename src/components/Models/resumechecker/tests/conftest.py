@@ -0,0 +1,6 @@
+import os
+import sys
+
+COMPONENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, COMPONENT_DIR)
+sys.path.insert(0, os.path.join(COMPONENT_DIR, "benchmarks"))
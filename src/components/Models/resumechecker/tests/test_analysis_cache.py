@@ -0,0 +1,67 @@
+import os
+import time
+
+import analysis_cache
+from analysis_cache import EVICT_MARGIN, SIZE_FILE, AnalysisCache
+
+
+def count_walks(monkeypatch):
+    walks = []
+    walk = os.walk
+
+    def counting_walk(*args, **kwargs):
+        walks.append(args)
+        return walk(*args, **kwargs)
+
+    monkeypatch.setattr(analysis_cache.os, "walk", counting_walk)
+    return walks
+
+
+def stored_bytes(directory):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, files in os.walk(directory) for name in files if name != SIZE_FILE)
+
+
+def test_sweeps_only_past_the_margin_and_keeps_recently_used_entries(tmp_path, monkeypatch):
+    cache = AnalysisCache(str(tmp_path), max_bytes=10_000)
+    walks = count_walks(monkeypatch)
+
+    # Up to the bound plus its margin, writes never list the directory
+    for n in range(int(10 * (1 + EVICT_MARGIN))):
+        cache.put("text", f"{n:04d}", b"x" * 1000)
+        # Written an hour apart, oldest first, so the recency order does not depend on timer resolution
+        written = time.time() - 3600 * (100 - n)
+        os.utime(cache._path("text", f"{n:04d}"), (written, written))
+    assert walks == []
+
+    cache.get("text", "0000")
+    cache.put("text", "overflow", b"x" * 1000)
+    assert len(walks) == 1
+    assert stored_bytes(tmp_path) <= 10_000 * analysis_cache.EVICT_TO
+    assert cache.get("text", "0000") is not None
+    assert cache.get("text", "0001") is None
+
+
+def test_construction_reads_the_recorded_size_instead_of_walking(tmp_path, monkeypatch):
+    AnalysisCache(str(tmp_path), max_bytes=10_000).put("text", "key", b"x" * 100)
+    walks = count_walks(monkeypatch)
+    AnalysisCache(str(tmp_path), max_bytes=10_000)
+    assert walks == []
+
+
+def test_sweep_leaves_staging_files_of_other_writers(tmp_path):
+    cache = AnalysisCache(str(tmp_path), max_bytes=1_000)
+    staging_dir = tmp_path / "text" / "ab"
+    staging_dir.mkdir(parents=True)
+    in_flight = staging_dir / "abcd.123.456.tmp"
+    in_flight.write_bytes(b"x" * 5_000)
+    abandoned = staging_dir / "abce.123.456.tmp"
+    abandoned.write_bytes(b"x" * 10)
+    old = time.time() - analysis_cache.STALE_STAGING_SECONDS - 60
+    os.utime(abandoned, (old, old))
+
+    for n in range(5):
+        cache.put("text", f"{n:04d}", b"x" * 400)
+    assert cache.evictions > 0
+    assert in_flight.exists()
+    assert not abandoned.exists()
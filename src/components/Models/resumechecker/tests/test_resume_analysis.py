@@ -0,0 +1,31 @@
+import random
+
+import pytest
+
+from bench_pipeline import synthetic_job_description, synthetic_resume
+from resume_analysis import SPACY_MODEL, analyze_docs, load_nlp
+
+
+@pytest.fixture(scope="module")
+def pipelines():
+    try:
+        return load_nlp("full"), load_nlp("lean")
+    except OSError:
+        pytest.skip(f"spaCy model {SPACY_MODEL} is not installed, set RESUMECHECKER_SPACY_MODEL")
+
+
+def test_lean_pipeline_keeps_the_parser_for_sentences(pipelines):
+    full, lean = pipelines
+    assert "parser" in lean.pipe_names
+    assert "ner" not in lean.pipe_names
+
+
+def test_lean_analysis_matches_full_analysis(pipelines):
+    full, lean = pipelines
+    rng = random.Random(0)
+    for _ in range(20):
+        resume_text, job_description = synthetic_resume(rng), synthetic_job_description(rng)
+        full_result = analyze_docs(full(resume_text), full(job_description))
+        lean_result = analyze_docs(*lean.pipe([resume_text, job_description]))
+        # avg_sentence_length included: it counts the parser's sentences in both modes
+        assert lean_result == full_result